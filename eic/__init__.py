@@ -33,4 +33,6 @@ from .core import *
 # Submodules
 from . import stores
 from . import access
-from . import identities
\ No newline at end of file
+from . import identities
+from . import erasure
+from . import bundles
\ No newline at end of file
@@ -0,0 +1,290 @@
+'''
+LICENSING
+-------------------------------------------------
+
+pyEIC: A python library for EIC manipulation.
+    Copyright (C) 2014-2015 Nicholas Badger
+    badg@nickbadger.com
+    nickbadger.com
+
+    This library is free software; you can redistribute it and/or
+    modify it under the terms of the GNU Lesser General Public
+    License as published by the Free Software Foundation; either
+    version 2.1 of the License, or (at your option) any later version.
+
+    This library is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+    Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public
+    License along with this library; if not, write to the Free Software
+    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301
+    USA
+
+------------------------------------------------------
+
+Single-file bundles, for moving many EIC objects between stores at once.
+
+A bundle is written (and read) strictly sequentially, so it can be piped:
+    magic           8 bytes     b'EICBNDL1'
+    records         one per object: '>Q' length, then the object. Static
+                    objects come first, then the frames of each dynamic
+                    reference, oldest first.
+    terminator      '>Q' zero
+    object index    one '>64sQQ' (euid, offset, length) row per object
+    frame index     per dynamic reference: '>64sI' (dynamic ref, count),
+                    then count euids, oldest first
+    footer          '>QQQQ8s' (object index offset, object count, frame
+                    index offset, reference count, magic)
+
+Importing only needs the records; the index (see read_bundle_index) is for
+finding things in a bundle without reading all of it.
+'''
+
+# Import the base package
+from .core import EICa
+from .core import EICs
+from .core import EICd
+from .core import VERIFIED_BLOB_CACHE
+from . import erasure
+
+# Global dependencies that aren't here because I'm being lazy
+import struct
+import shutil
+import tempfile
+import concurrent.futures
+
+
+magic = b'EICBNDL1'
+
+_length = struct.Struct('>Q')
+_object_row = struct.Struct('>64sQQ')
+_reference_row = struct.Struct('>64sI')
+_footer = struct.Struct('>QQQQ8s')
+
+
+def export_bundle(store, fileobj, batch_size=256):
+    ''' Writes everything in the store (which must support iter_euids()
+    and iter_references()) to fileobj as a bundle. Only one batch of
+    objects is held in memory at a time; the index is spooled to a
+    temporary file until the records are done. Returns a dict with the
+    number of 'objects' and 'references' written, and a list of the
+    dynamic references that 'failed' (because frames went missing while
+    exporting).
+    '''
+    result = {'objects': 0, 'references': 0, 'failed': []}
+    offset = 0
+
+    def write_record(euid, bites):
+        nonlocal offset
+        fileobj.write(_length.pack(len(bites)))
+        fileobj.write(bites)
+        objects.write(_object_row.pack(euid, offset + _length.size,
+                                       len(bites)))
+        offset += _length.size + len(bites)
+        result['objects'] += 1
+
+    with tempfile.TemporaryFile() as objects, \
+            tempfile.TemporaryFile() as references:
+        fileobj.write(magic)
+        offset += len(magic)
+
+        # Static objects first, so that importing the frames can find the
+        # identities they were signed with.
+        euids = store.iter_euids()
+        while True:
+            batch = [euid for __, euid in zip(range(batch_size), euids)]
+            if not batch:
+                break
+            for euid, bites in zip(batch, _download_statics(store, batch)):
+                if bites:
+                    write_record(euid, bites)
+
+        for dynamic_ref in store.iter_references():
+            try:
+                frames = list(reversed(store.list_frames(dynamic_ref)))
+            except RuntimeError:
+                continue
+            found = store.download_many(frames)
+            if not all(found.get(euid) for euid in frames):
+                result['failed'].append(dynamic_ref)
+                continue
+            for euid in frames:
+                write_record(euid, found[euid])
+            references.write(_reference_row.pack(dynamic_ref, len(frames)))
+            references.write(b''.join(frames))
+            result['references'] += 1
+
+        fileobj.write(_length.pack(0))
+        offset += _length.size
+
+        object_index = offset
+        objects.seek(0)
+        shutil.copyfileobj(objects, fileobj)
+        reference_index = object_index + objects.tell()
+        references.seek(0)
+        shutil.copyfileobj(references, fileobj)
+
+    fileobj.write(_footer.pack(object_index, result['objects'],
+                               reference_index, result['references'], magic))
+    return result
+
+
+def _download_statics(store, euids):
+    ''' Returns the static objects for euids, in order, with None for EICd
+    frames (which are exported by reference) and anything missing.
+    '''
+    magic_bits = EICd.header_bits['magic']
+    peeks = store.download_ranges(
+        [(euid, magic_bits.start, magic_bits.stop - magic_bits.start)
+         for euid in euids])
+    wanted = [euid for euid, peek in zip(euids, peeks)
+              if peek is not None and bytes(peek) != EICd.magic]
+    found = store.download_many(wanted)
+    return [found.get(euid) for euid in euids]
+
+
+def import_bundle(fileobj, store, batch_size=256, workers=None):
+    ''' Reads a bundle from fileobj (sequentially, so it needn't be
+    seekable) and uploads everything in it to the store, a batch at a
+    time. Each batch has its public parts verified in parallel on a pool
+    of (at most) workers threads before being uploaded, so that anything
+    corrupt is weeded out (and the rest sorted into runs) without 
+    involving the store. The verified buffers are recorded in 
+    VERIFIED_BLOB_CACHE until their batch is uploaded, so that local 
+    stores don't verify them all over again (shards aren't cached, so 
+    those still get rehashed). EICd frames are replayed in chain
+    order through upload_frames, so a store that doesn't know a dynamic
+    reference yet adopts the bundle's buffer for it; only import bundles
+    from sources you trust to be recent.
+
+    Returns a dict with the number of objects 'imported', and a list of
+    the euids of any that 'failed' verification or upload. Raises
+    RuntimeError if the bundle itself is malformed.
+    '''
+    if fileobj.read(len(magic)) != magic:
+        raise RuntimeError('Not an EIC bundle.')
+
+    result = {'imported': 0, 'failed': []}
+    done = False
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) \
+            as executor:
+        while not done:
+            batch = []
+            while len(batch) < batch_size:
+                bites = _read_record(fileobj)
+                if bites is None:
+                    done = True
+                    break
+                batch.append(bites)
+            verified = list(executor.map(_verify_record, batch))
+            try:
+                _upload_batch(store, batch, verified, result)
+            finally:
+                # Don't crowd everything else out of the cache.
+                for euid, __ in verified:
+                    if euid is not None:
+                        VERIFIED_BLOB_CACHE.invalidate(euid)
+    return result
+
+
+def _read_record(fileobj):
+    ''' Reads the next record, returning None at the terminator.
+    '''
+    header = fileobj.read(_length.size)
+    if len(header) != _length.size:
+        raise RuntimeError('Truncated EIC bundle.')
+    length = _length.unpack(header)[0]
+    if not length:
+        return None
+    bites = fileobj.read(length)
+    if len(bites) != length:
+        raise RuntimeError('Truncated EIC bundle.')
+    return bites
+
+
+def _verify_record(bites):
+    ''' Verifies the public parts of a bundled object. Returns a tuple of
+    (euid, dynamic ref), with None for the dynamic ref of static objects
+    and None for the euid of anything that failed. Goes through the 
+    verified blob cache, so that the store can skip verifying this very
+    buffer again when it's uploaded.
+    '''
+    try:
+        if bites[EICa.header_bits['magic']] == EICa.magic:
+            return VERIFIED_BLOB_CACHE.verify(EICa, bites)['euid'], None
+        elif bites[EICs.header_bits['magic']] == EICs.magic:
+            return VERIFIED_BLOB_CACHE.verify(EICs, bites)['euid'], None
+        elif bites[EICd.header_bits['magic']] == EICd.magic:
+            partial = VERIFIED_BLOB_CACHE.verify(EICd, bites)
+            return partial['euid'], partial['header_hash']
+        elif bites[erasure.header_bits['magic']] == erasure.magic:
+            return erasure.unpack_shard(bites)['address'], None
+    except Exception:
+        pass
+    return None, None
+
+
+def _upload_batch(store, batch, verified, result):
+    ''' Uploads a verified batch in its original order: runs of static
+    objects through upload_many, and runs of frames from the same dynamic
+    reference through upload_frames.
+    '''
+    runs = []
+    for bites, (euid, dynamic_ref) in zip(batch, verified):
+        if euid is None:
+            result['failed'].append(
+                bytes(bites[EICs.header_bits['file_hash']]))
+            continue
+        if runs and runs[-1][0] == dynamic_ref:
+            runs[-1][1].append((euid, bites))
+        else:
+            runs.append((dynamic_ref, [(euid, bites)]))
+
+    for dynamic_ref, run in runs:
+        blobs = [bites for __, bites in run]
+        if dynamic_ref is None:
+            statuses = store.upload_many(blobs)
+            for (euid, __), status in zip(run, statuses):
+                if status == euid:
+                    result['imported'] += 1
+                else:
+                    result['failed'].append(euid)
+        else:
+            try:
+                store.upload_frames(blobs)
+            except Exception:
+                result['failed'].extend(euid for euid, __ in run)
+            else:
+                result['imported'] += len(run)
+
+
+def read_bundle_index(fileobj):
+    ''' Reads the index of a (seekable) bundle without reading the objects.
+    Returns a tuple of (dict of euid: (offset, length), dict of dynamic
+    ref: list of frame euids, oldest first). Offsets point at the objects
+    themselves, past their length prefix.
+    '''
+    fileobj.seek(-_footer.size, 2)
+    object_index, object_count, reference_index, reference_count, \
+        footer_magic = _footer.unpack(fileobj.read(_footer.size))
+    if footer_magic != magic:
+        raise RuntimeError('Not an EIC bundle, or truncated.')
+
+    fileobj.seek(object_index)
+    objects = {}
+    for __ in range(object_count):
+        euid, offset, length = _object_row.unpack(
+            fileobj.read(_object_row.size))
+        objects[euid] = (offset, length)
+
+    fileobj.seek(reference_index)
+    references = {}
+    for __ in range(reference_count):
+        dynamic_ref, count = _reference_row.unpack(
+            fileobj.read(_reference_row.size))
+        frames = fileobj.read(64 * count)
+        references[dynamic_ref] = [frames[ii:ii + 64]
+                                   for ii in range(0, len(frames), 64)]
+    return objects, references
@@ -49,6 +49,13 @@ import abc
 import json
 import base64
 import os
+import time
+import math
+import threading
+import concurrent.futures
+import asyncio
+import functools
+import weakref
 from warnings import warn
 import hashlib
 import zbg
@@ -61,6 +68,8 @@ import cryptography
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.hmac import HMAC
+from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.hazmat.backends import default_backend
 from Crypto.Hash import SHA512
@@ -660,6 +669,518 @@ class SplitHashMap(collections.MutableMapping):
         return found
 
 
+class _LazyContents(collections.MutableMapping):
+    ''' The hash: content mapping of a lazily-fetched EICs. Each blob is
+    only decrypted (and checked against its hash) the first time it's 
+    accessed, and then kept.
+
+    Note that this necessarily holds on to the symmetric key until every 
+    blob has been loaded.
+    '''
+    def __init__(self, eic_class, payload, sym_key, toc, offset):
+        ''' payload is the locked payload, toc the hash: slice mapping of
+        the contents, and offset the position of the contents within the
+        unlocked payload.
+        '''
+        self._eic_class = eic_class
+        self._payload = payload
+        self._sym_key = sym_key
+        # Only ever holds what hasn't been loaded (or replaced) yet
+        self._toc = dict(toc)
+        self._offset = offset
+        self._loaded = {}
+
+    def __getitem__(self, address):
+        try:
+            return self._loaded[address]
+        except KeyError:
+            pass
+        # Raises KeyError, as it should, if we don't have it at all.
+        partition = self._toc[address]
+        blob = self._eic_class._unlock_range(
+            self._payload, self._sym_key, self._offset + partition.start, 
+            self._offset + partition.stop)
+        if self._eic_class._hash(blob) != address:
+            raise ValueError('Blob hash doesn\'t match the ToC hash. '
+                             'Check data integrity.')
+        self._loaded[address] = blob
+        del self._toc[address]
+        self._forget_if_done()
+        return blob
+
+    def __setitem__(self, address, blob):
+        self._loaded[address] = blob
+        self._toc.pop(address, None)
+        self._forget_if_done()
+
+    def __delitem__(self, address):
+        found = self._loaded.pop(address, None) is not None
+        found |= self._toc.pop(address, None) is not None
+        self._forget_if_done()
+        if not found:
+            raise KeyError(address)
+
+    def __contains__(self, address):
+        return address in self._loaded or address in self._toc
+
+    def __iter__(self):
+        yield from self._loaded
+        yield from self._toc
+
+    def __len__(self):
+        return len(self._loaded) + len(self._toc)
+
+    def copy(self):
+        ''' Shallow copy, sharing the locked payload (but not the loaded 
+        blobs).
+        '''
+        duplicate = self.__class__(self._eic_class, self._payload, 
+                                   self._sym_key, self._toc, self._offset)
+        duplicate._loaded = self._loaded.copy()
+        return duplicate
+
+    def _forget_if_done(self):
+        ''' Drops the key and locked payload once everything is loaded.
+        '''
+        if self._payload is not None and not self._toc:
+            self._payload = None
+            self._sym_key = None
+
+
+class AuthorKeyCache():
+    ''' A bounded, thread-safe, least-recently-used cache of loaded author
+    public keys, keyed by the author's euid.
+    
+    Author euids address static identity EICs, so a given euid always 
+    resolves to the same public key, regardless of which storage providers
+    it was resolved through. That means a single process-wide cache can be
+    shared between every signature verification path.
+    '''
+    def __init__(self, maxsize=256):
+        ''' Creates an empty cache holding at most maxsize keys.
+        '''
+        if maxsize < 1:
+            raise ValueError('Cache must be able to hold at least one key.')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._keys = collections.OrderedDict()
+        self._lock = threading.Lock()
+        # An optional VerificationLedger, told about every key we load
+        self.ledger = None
+        
+    def get(self, author, storage_providers):
+        ''' Returns the loaded public key for author, fetching and 
+        verifying the author's identity EICs from the storage providers 
+        on a miss.
+        '''
+        pubkey = self.lookup(author)
+        if pubkey is None:
+            # Note that we deliberately resolve outside of the lock, since
+            # fetching the identity may itself need to verify a signature.
+            pubkey = self._load(author, storage_providers)
+            self.put(author, pubkey)
+        return pubkey
+        
+    async def get_async(self, author, storage_providers):
+        ''' Coroutine equivalent of get(), resolving misses through 
+        AsyncStorageProviders.
+        '''
+        pubkey = self.lookup(author)
+        if pubkey is None:
+            pubkey = await self._load_async(author, storage_providers)
+            self.put(author, pubkey)
+        return pubkey
+        
+    def lookup(self, author):
+        ''' Returns the cached public key for author, or None if it isn't
+        cached. Updates the hit/miss counters.
+        '''
+        with self._lock:
+            try:
+                pubkey = self._keys[author]
+            except KeyError:
+                self.misses += 1
+                return None
+            # Refresh its position in the LRU order
+            self._keys.move_to_end(author)
+            self.hits += 1
+            return pubkey
+        
+    def put(self, author, pubkey):
+        ''' Adds (or refreshes) a loaded public key for author, evicting 
+        the least recently used key if the cache is full.
+        '''
+        with self._lock:
+            self._keys[author] = pubkey
+            self._keys.move_to_end(author)
+            while len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
+        # Outside the lock, since the ledger may need to write to disk.
+        ledger = self.ledger
+        if ledger is not None:
+            ledger.observe_key(author, pubkey)
+        
+    def invalidate(self, author=None):
+        ''' Removes author from the cache. If author is None, clears the 
+        entire cache. Does NOT reset the hit/miss counters.
+        '''
+        with self._lock:
+            if author is None:
+                self._keys.clear()
+            else:
+                self._keys.pop(author, None)
+                
+    def stats(self):
+        ''' Returns a dictionary of the current cache statistics.
+        '''
+        with self._lock:
+            return {'size': len(self._keys),
+                    'maxsize': self.maxsize,
+                    'hits': self.hits,
+                    'misses': self.misses}
+        
+    @staticmethod
+    def _load(author, storage_providers):
+        ''' Resolves the author's public key from the storage providers.
+        '''
+        # Catch any time we're an identity and need to bootstrap.
+        if author == AUTHOR_BOOTSTRAP:
+            return _AUTHOR_BOOTSTRAP_PUBKEY
+        # Not an identity; proceed as usual.
+        pubkey = EICs.fetch(author, AUTHOR_BOOTSTRAP_SYMKEY, 
+                            storage_providers)[b'pubkey']
+        return serialization.load_pem_public_key(pubkey, 
+                                                 backend=default_backend())
+        
+    @staticmethod
+    async def _load_async(author, storage_providers):
+        ''' Resolves the author's public key from AsyncStorageProviders.
+        '''
+        if author == AUTHOR_BOOTSTRAP:
+            return _AUTHOR_BOOTSTRAP_PUBKEY
+        identity = await EICs.fetch_async(author, AUTHOR_BOOTSTRAP_SYMKEY, 
+                                          storage_providers)
+        return serialization.load_pem_public_key(identity[b'pubkey'], 
+                                                 backend=default_backend())
+
+
+# Process-wide cache of author public keys, shared by all of the signature
+# verification paths.
+AUTHOR_KEY_CACHE = AuthorKeyCache()
+
+
+class VerifiedBlobCache():
+    ''' A bounded, thread-safe, least-recently-used record of which blobs
+    have already passed verify_public, keyed by euid.
+
+    Each entry only counts as a hit for the exact buffer that was verified.
+    A different buffer claiming the same euid (or the same buffer, later 
+    mutated) can't hit, so it always gets verified from scratch. Mutable 
+    buffers are never recorded.
+
+    Read-only memoryviews are only weakly referenced, so that the cache 
+    never keeps (say) a FileStore's mmap open: once the caller lets go of
+    the view, its entry can no longer hit. Bytes objects can't be weakly 
+    referenced, so they're held on to, up to maxbytes in total.
+    '''
+    def __init__(self, maxsize=1024, maxbytes=32 * 2 ** 20):
+        ''' Creates an empty cache holding at most maxsize entries, and at
+        most maxbytes of bytes objects.
+        '''
+        if maxsize < 1:
+            raise ValueError('Cache must be able to hold at least one entry.')
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.hits = 0
+        self.misses = 0
+        # euid: (eic class, bites or weakref to the view, bytes held, 
+        #        unloaded public values sans payload)
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def verify(self, eic_class, bites, euid=None):
+        ''' Returns eic_class.verify_public(bites, euid=euid), skipping the
+        actual verification if this exact buffer has already passed it.
+        '''
+        try:
+            cached_euid = bytes(bites[eic_class.header_bits['file_hash']])
+        except (TypeError, ValueError):
+            cached_euid = None
+        unloaded = self.lookup(eic_class, bites, cached_euid)
+
+        if unloaded is None:
+            unloaded = eic_class.verify_public(bites, euid=euid)
+            self.put(eic_class, bites, unloaded)
+            return unloaded
+
+        if euid and euid != unloaded['euid']:
+            raise RuntimeError('EUID doesn\'t match contents, check EIC '
+                               'integrity.')
+        # Slicing the payload back out is much cheaper than storing it.
+        unloaded['payload'] = bites[eic_class.header_bits['payload']]
+        return unloaded
+
+    def lookup(self, eic_class, bites, euid):
+        ''' Returns a copy of the unloaded public values (without the 
+        payload) for euid, if bites is the very buffer that was verified 
+        as an eic_class. Otherwise, returns None. Updates the hit/miss 
+        counters.
+        '''
+        with self._lock:
+            entry = self._entries.get(euid)
+            if entry is None or entry[0] is not eic_class or \
+                    self._held(entry) is not bites:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(euid)
+            self.hits += 1
+            return dict(entry[3])
+
+    @staticmethod
+    def _held(entry):
+        ''' Returns the buffer an entry was recorded for, or None if it's 
+        since been garbage collected.
+        '''
+        if isinstance(entry[1], weakref.ref):
+            return entry[1]()
+        return entry[1]
+
+    def put(self, eic_class, bites, unloaded):
+        ''' Records that bites passed eic_class.verify_public, producing 
+        unloaded. Does nothing for mutable buffers.
+        '''
+        if isinstance(bites, memoryview) and bites.readonly:
+            held = weakref.ref(bites)
+            size = 0
+        elif isinstance(bites, bytes) and len(bites) <= self.maxbytes:
+            held = bites
+            size = len(bites)
+        else:
+            return
+        unloaded = {key: value for key, value in unloaded.items() 
+                    if key != 'payload'}
+        with self._lock:
+            self._pop(unloaded['euid'])
+            self._entries[unloaded['euid']] = (eic_class, held, size, 
+                                               unloaded)
+            self._bytes += size
+            while len(self._entries) > self.maxsize or \
+                    self._bytes > self.maxbytes:
+                self._bytes -= self._entries.popitem(last=False)[1][2]
+
+    def _pop(self, euid):
+        ''' Removes euid's entry, if any. Must be called with the lock held.
+        '''
+        entry = self._entries.pop(euid, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def invalidate(self, euid=None):
+        ''' Removes euid from the cache. If euid is None, clears the 
+        entire cache. Does NOT reset the hit/miss counters.
+        '''
+        with self._lock:
+            if euid is None:
+                self._entries.clear()
+                self._bytes = 0
+            else:
+                self._pop(euid)
+
+    def stats(self):
+        ''' Returns a dictionary of the current cache statistics.
+        '''
+        with self._lock:
+            return {'size': len(self._entries),
+                    'maxsize': self.maxsize,
+                    'bytes': self._bytes,
+                    'maxbytes': self.maxbytes,
+                    'hits': self.hits,
+                    'misses': self.misses}
+
+
+# Process-wide record of blobs that have passed verify_public, shared by the
+# fetch paths and the local storage providers.
+VERIFIED_BLOB_CACHE = VerifiedBlobCache()
+
+
+class VerificationLedger():
+    ''' A persistent, locally-authenticated record of successful signature
+    verifications, so that they survive restarts.
+
+    Every record is HMAC'd with a local key (as per Fernet), and any record
+    that fails its HMAC is ignored. The ledger holds two kinds of record, 
+    appended to a single file:
+
+    1. b'k': author, fingerprint of the author's public key
+    2. b'v': euid, author, key fingerprint, SHA-512(signed bytes + 
+       signature)
+
+    A verification record only counts while its key fingerprint matches 
+    the author's current key record. Whenever AUTHOR_KEY_CACHE loads a 
+    different key for an author, a new key record is written, revoking all
+    of the author's old verification records.
+
+    To use it, set AUTHOR_KEY_CACHE.ledger = VerificationLedger(path, key).
+    '''
+    _key_record = struct.Struct('>c64s64s')
+    _verification_record = struct.Struct('>c64s64s64s64s')
+    _mac_length = 32
+
+    def __init__(self, path, key, backend=None):
+        ''' Opens (or creates) the ledger at path, using key (as from 
+        VerificationLedger.generate_key()) to authenticate its records.
+        '''
+        if backend is None:
+            backend = default_backend()
+
+        key = base64.urlsafe_b64decode(key)
+        if len(key) != 32:
+            raise ValueError('Ledger key must be 32 url-safe base64-encoded '
+                             'bytes.')
+
+        self.path = path
+        self._signing_key = key
+        self._backend = backend
+        # author: key fingerprint
+        self._authors = {}
+        # euid: (author, key fingerprint, digest)
+        self._verified = {}
+        self._lock = threading.Lock()
+        self._load()
+        self._file = open(path, 'ab')
+
+    @classmethod
+    def generate_key(cls):
+        return base64.urlsafe_b64encode(os.urandom(32))
+
+    def check(self, euid, author, signed, signature):
+        ''' Returns True if the ledger records a successful verification 
+        of signature over signed, for euid, by author's current key. 
+        Otherwise, returns False.
+        '''
+        with self._lock:
+            record = self._verified.get(euid)
+            current = self._authors.get(author)
+        if record is None or current is None:
+            return False
+        return (record[0] == author and record[1] == current and 
+                record[2] == self._digest(signed, signature))
+
+    def record(self, euid, author, pubkey, signed, signature):
+        ''' Records that signature over signed successfully verified 
+        against pubkey, for euid, by author.
+        '''
+        fingerprint = self.observe_key(author, pubkey)
+        record = self._verification_record.pack(
+            b'v', euid, author, fingerprint, 
+            self._digest(signed, signature))
+        with self._lock:
+            # Don't bother writing it again if nothing changed.
+            entry = (author, fingerprint, record[-64:])
+            if self._verified.get(euid) != entry:
+                self._verified[euid] = entry
+                self._append(record)
+
+    def observe_key(self, author, pubkey):
+        ''' Notes author's current public key. If it differs from the one
+        on record, all of the author's verification records are revoked.
+        Returns the key's fingerprint.
+        '''
+        fingerprint = self._fingerprint(pubkey)
+        with self._lock:
+            if self._authors.get(author) != fingerprint:
+                self._authors[author] = fingerprint
+                self._verified = {euid: entry for euid, entry in 
+                                  self._verified.items() 
+                                  if entry[0] != author or 
+                                  entry[1] == fingerprint}
+                self._append(self._key_record.pack(b'k', author, 
+                                                   fingerprint))
+        return fingerprint
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    @staticmethod
+    def _fingerprint(pubkey):
+        return hashlib.sha512(pubkey.public_bytes(
+            encoding=serialization.Encoding.DER,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        )).digest()
+
+    @staticmethod
+    def _digest(signed, signature):
+        return hashlib.sha512(bytes(signed) + bytes(signature)).digest()
+
+    def _mac(self, record):
+        h = HMAC(self._signing_key, hashes.SHA256(), backend=self._backend)
+        h.update(record)
+        return h
+
+    def _append(self, record):
+        ''' Appends an authenticated record to the ledger. Call with the 
+        lock held.
+        '''
+        self._file.write(record + self._mac(record).finalize())
+        self._file.flush()
+
+    def _load(self):
+        ''' Reads in every authentic record from the ledger, truncating 
+        any torn or unrecognizable tail.
+        '''
+        try:
+            with open(self.path, 'rb') as infile:
+                data = infile.read()
+        except FileNotFoundError:
+            return
+
+        formats = {b'k': self._key_record, b'v': self._verification_record}
+        offset = 0
+        while offset < len(data):
+            record_format = formats.get(data[offset:offset + 1])
+            if record_format is None:
+                break
+            end = offset + record_format.size + self._mac_length
+            if end > len(data):
+                break
+            record = data[offset:end - self._mac_length]
+            offset = end
+
+            try:
+                self._mac(record).verify(data[end - self._mac_length:end])
+            except InvalidSignature:
+                # Tampered with or corrupted. Ignore it.
+                continue
+
+            fields = record_format.unpack(record)
+            if fields[0] == b'k':
+                # Newer key records supersede older ones.
+                self._authors[fields[1]] = fields[2]
+            else:
+                self._verified[fields[1]] = fields[2:]
+
+        # Forget verifications by keys that have since been replaced.
+        self._verified = {euid: entry for euid, entry in 
+                          self._verified.items() 
+                          if self._authors.get(entry[0]) == entry[1]}
+
+        if offset < len(data):
+            with open(self.path, 'r+b') as outfile:
+                outfile.truncate(offset)
+
+
+async def _run_in_executor(func, *args, **kwargs):
+    ''' Runs func in the event loop's default executor, so that CPU-heavy
+    crypto doesn't block the loop. Returns its result.
+    '''
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, 
+                                      functools.partial(func, *args, **kwargs))
+
+
 def _pack_version(s):
     ''' Generates the appropriate 32-bit field for the version, given 
     the input string s. Input should be formatted as "1.2.3", as defined 
@@ -749,6 +1270,239 @@ class StorageProvider(metaclass=abc.ABCMeta):
         '''
         pass
 
+    def head(self, dynamic_ref):
+        ''' Returns the euid of the most recent frame associated with the 
+        dynamic reference, or None if the provider has no record of it.
+
+        The default implementation just takes the first entry from 
+        list_frames(); providers that can answer more cheaply should 
+        override it.
+        '''
+        frames = self.list_frames(dynamic_ref)
+        if not frames:
+            return None
+        return frames[0]
+
+    def list_frames_since(self, dynamic_ref, known_head):
+        ''' Returns a list of the euids of the frames associated with the 
+        dynamic reference that are more recent than known_head, from most 
+        recent [0] to oldest [n]. Returns an empty list if known_head is 
+        the most recent frame, the entire buffer if known_head isn't in it
+        (for example, because it's since been evicted), and None if the 
+        provider has no record of the dynamic reference.
+
+        The default implementation just filters list_frames(); providers 
+        that can answer more cheaply should override it.
+        '''
+        frames = self.list_frames(dynamic_ref)
+        if not frames:
+            return None
+        frames = list(frames)
+        try:
+            return frames[:frames.index(known_head)]
+        except ValueError:
+            return frames
+
+    def subscribe(self, dynamic_refs=None, callback=None):
+        ''' Subscribes to new frames for the dynamic references (or, if 
+        dynamic_refs is None, for every dynamic reference), returning a 
+        Subscription. If callback is supplied, it's called with 
+        (dynamic_ref, file_hash) for each event; otherwise, events are 
+        pulled from the Subscription (see there).
+
+        Providers that can't push changes don't need to implement this.
+        '''
+        raise NotImplementedError('This storage provider doesn\'t support '
+                                  'subscriptions.')
+
+    def iter_euids(self, prefix=b''):
+        ''' Yields the euid of every object the provider holds (including
+        EICd frames) that starts with prefix.
+
+        Providers that can't enumerate their contents don't need to
+        implement this.
+        '''
+        raise NotImplementedError('This storage provider can\'t enumerate '
+                                  'its objects.')
+
+    def iter_references(self, prefix=b''):
+        ''' Yields every dynamic reference the provider holds frames for 
+        that starts with prefix.
+
+        Providers that can't enumerate their contents don't need to
+        implement this.
+        '''
+        raise NotImplementedError('This storage provider can\'t enumerate '
+                                  'its dynamic references.')
+
+    def summarize(self, prefix=b''):
+        ''' Summarizes the euids held that start with prefix, for set 
+        reconciliation (see stores.sync). Returns a list of 256 
+        (count, digest) tuples, one for each possible value of the next 
+        byte, where the digest is the hash of the bucket's euids, in 
+        sorted order. Equal summaries therefore mean (barring a hash 
+        collision) equal sets.
+
+        Nothing keeps summaries up to date as objects come and go, so every
+        call rescans the euids under prefix: O(n) for each level a sync 
+        walks down. What summarizing saves is listing (and sending) the 
+        euids themselves, not scanning them.
+
+        The default implementation is built on iter_euids(); providers 
+        that can answer remotely should override it, so that the euids
+        themselves never need to be sent.
+        '''
+        return self._summary(((euid, euid) for euid 
+                              in self.iter_euids(prefix)), prefix)
+
+    def list_heads(self, prefix=b''):
+        ''' Returns a dict of dynamic reference: head (most recent frame) 
+        for every dynamic reference held that starts with prefix.
+
+        The default implementation is built on iter_references() and 
+        head().
+        '''
+        heads = {}
+        for dynamic_ref in self.iter_references(prefix):
+            head = self.head(dynamic_ref)
+            if head:
+                heads[dynamic_ref] = head
+        return heads
+
+    def summarize_heads(self, prefix=b''):
+        ''' Summarizes the (dynamic reference, head) pairs held whose 
+        references start with prefix, as per summarize(). The digest of 
+        each pair is the hash of the reference and the head, so replicas
+        that know the same references at different heads will differ.
+
+        The default implementation is built on list_heads().
+        '''
+        return self._summary(
+            ((dynamic_ref, EICBase._hash(dynamic_ref + head)) for 
+             dynamic_ref, head in self.list_heads(prefix).items()), prefix)
+
+    @staticmethod
+    def _summary(pairs, prefix):
+        ''' Buckets (key, digest) pairs by the byte of the key following 
+        prefix. Returns a list of 256 (count, digest) tuples, with each 
+        bucket's digests sorted and hashed together (or all zeroes, for an
+        empty bucket). Unlike XOR'ing them, hashing doesn't let different
+        sets be built to share a digest.
+        '''
+        depth = len(prefix)
+        buckets = [[] for __ in range(256)]
+        for key, digest in pairs:
+            if len(key) <= depth:
+                continue
+            buckets[key[depth]].append(bytes(digest))
+        return [(len(bucket), EICBase._hash(b''.join(sorted(bucket))) 
+                 if bucket else bytes(64)) for bucket in buckets]
+
+    def delete(self, address):
+        ''' Removes the object (for an euid), or the dynamic reference and
+        all of its frames (for a dynamic reference), if held. Deleting
+        something the provider doesn't hold is a no-op.
+
+        Providers that don't allow deletion don't need to implement this.
+        '''
+        raise NotImplementedError('This storage provider doesn\'t support '
+                                  'deletion.')
+
+    def ping_many(self, addresses):
+        ''' Queries the storage provider about many addresses at once. 
+        Returns a list of statuses (as per ping()), in the same order as 
+        addresses.
+
+        The default implementation just calls ping() for each address; 
+        providers that can answer a batch in a single round trip should 
+        override it.
+        '''
+        return [self.ping(address) for address in addresses]
+
+    def download_many(self, euids):
+        ''' Gets many eic files from the storage provider at once. Returns
+        a dictionary of euid: bites, with None for any objects the provider
+        does not have. If the provider was not successfully reached, throw 
+        an error.
+
+        The default implementation just calls download() for each euid; 
+        providers that can serve a batch in a single round trip should 
+        override it.
+        '''
+        return {euid: self.download(euid) for euid in euids}
+
+    def download_range(self, euid, offset, length):
+        ''' Gets (up to) length bytes of an eic file, starting at offset. 
+        Returns None if the provider does not have the object. If the 
+        provider was not successfully reached, throw an error.
+
+        Note that a partial object can't be checked against its euid, so 
+        the caller is responsible for authenticating whatever it reads.
+
+        The default implementation just downloads the whole file and 
+        slices it; providers that can read part of an object should 
+        override it.
+        '''
+        bites = self.download(euid)
+        if bites is None:
+            return None
+        return bites[offset:offset + length]
+
+    def download_ranges(self, ranges):
+        ''' Vectored counterpart to download_range(). Takes an iterable 
+        of (euid, offset, length) tuples, and returns a list of results 
+        (as per download_range()) in the same order.
+
+        The default implementation downloads each object once, and slices
+        all of its ranges out of that.
+        '''
+        ranges = list(ranges)
+        blobs = self.download_many(collections.OrderedDict.fromkeys(
+            euid for euid, __, __ in ranges))
+        results = []
+        for euid, offset, length in ranges:
+            bites = blobs.get(euid)
+            if bites is None:
+                results.append(None)
+            else:
+                results.append(bites[offset:offset + length])
+        return results
+
+    def upload_many(self, blobs):
+        ''' Pushes many eic files to the storage provider, in order (which
+        matters for EICd frames). Returns a list, in the same order as 
+        blobs, containing the euid for each successful upload, or the 
+        raised exception for each failed one.
+
+        The default implementation just calls upload() for each blob; 
+        providers that can accept a batch in a single round trip should 
+        override it.
+        '''
+        results = []
+        for bites in blobs:
+            try:
+                results.append(self.upload(bites))
+            except Exception as exc:
+                results.append(exc)
+        return results
+
+    def upload_frames(self, blobs):
+        ''' Pushes a run of EICd frames to the storage provider, oldest
+        first, for copying a dynamic reference from one provider to
+        another. Providers that keep their own frame bookkeeping should
+        accept a run that doesn't start at the zeroth frame (since it may
+        long since have been evicted), as long as they don't already know
+        the dynamic reference. Returns a list of the euids, or raises
+        RuntimeError if any frame was rejected.
+
+        The default implementation just calls upload_many().
+        '''
+        results = self.upload_many(blobs)
+        for status in results:
+            if isinstance(status, Exception):
+                raise RuntimeError('Unsuccessful frame upload.') from status
+        return results
+
     @staticmethod
     def ping_multi(euid, storage_providers):
         ''' Rather stupidly iterates through storage providers, pinging each
@@ -766,10 +1520,16 @@ class StorageProvider(metaclass=abc.ABCMeta):
         return False
 
     @staticmethod
-    def poll_euid(euid, storage_providers):
+    def poll_euid(euid, storage_providers, hedge=None):
         ''' Requests the euid from the storage providers and returns the bites
         received. If no storage provider has the file, raises an error.
+
+        If hedge (a HedgePolicy) is supplied, performs a hedged read 
+        instead: see StorageProvider._poll_hedged().
         '''
+        if hedge is not None:
+            return StorageProvider._poll_hedged(euid, storage_providers, hedge)
+
         # Dead simple first-come-first-serve at the moment
         # providers for an euid
         for storage_provider in storage_providers:
@@ -780,6 +1540,61 @@ class StorageProvider(metaclass=abc.ABCMeta):
         raise RuntimeError('Failed to find the given euid at any of the '
                            'given storage providers.')
 
+    @staticmethod
+    def _poll_hedged(euid, storage_providers, hedge):
+        ''' Hedged, first-valid-wins read of euid from the storage 
+        providers.
+
+        The first provider is queried immediately. Whenever hedge.delay 
+        passes without a valid response, a backup request is sent to the 
+        next provider in line; misses, errors and corrupt responses move 
+        on to the next provider straight away. Every response is checked
+        against the euid, and the first one that matches is returned. Any 
+        requests still in flight are ignored.
+        '''
+        remaining = iter(list(storage_providers))
+        # future: start time
+        pending = {}
+
+        def launch():
+            ''' Sends the next request, if there are any left. '''
+            try:
+                storage_provider = next(remaining)
+            except StopIteration:
+                return False
+            future = hedge.submit(storage_provider.download, euid)
+            pending[future] = time.monotonic()
+            return True
+
+        launch()
+        while pending:
+            done, __ = concurrent.futures.wait(
+                pending, timeout=hedge.delay, 
+                return_when=concurrent.futures.FIRST_COMPLETED)
+
+            # Nothing yet? Time to hedge.
+            if not done:
+                launch()
+                continue
+
+            for future in done:
+                started = pending.pop(future)
+                try:
+                    bites = future.result()
+                except Exception:
+                    bites = None
+
+                if bites and EICBase.matches_euid(bites, euid):
+                    hedge.record(time.monotonic() - started)
+                    # Stragglers can't be interrupted, but we don't have to
+                    # wait for them.
+                    return bites
+                # Miss or corrupt; don't wait around for the next one.
+                launch()
+
+        raise RuntimeError('Failed to find a valid copy of the given euid at '
+                           'any of the given storage providers.')
+
     @staticmethod
     def poll_frames(reference, storage_providers):
         ''' Requests the dynamic reference from the storage providers and 
@@ -796,12 +1611,148 @@ class StorageProvider(metaclass=abc.ABCMeta):
         raise RuntimeError('Failed to find the given dynamic reference at any '
                            'of the given storage providers.')
 
+    @staticmethod
+    def poll_head(reference, storage_providers):
+        ''' Requests just the most recent frame euid for the dynamic 
+        reference from the storage providers, and returns the first one 
+        received.
+        '''
+        for storage_provider in storage_providers:
+            head = storage_provider.head(reference)
+            if head:
+                return head
+
+        raise RuntimeError('Failed to find the given dynamic reference at any '
+                           'of the given storage providers.')
+
+    @staticmethod
+    def poll_frames_since(reference, known_head, storage_providers):
+        ''' Requests the frames of the dynamic reference that are newer 
+        than known_head from the storage providers, and returns the first 
+        answer received. See StorageProvider.list_frames_since().
+        '''
+        for storage_provider in storage_providers:
+            framelist = storage_provider.list_frames_since(reference, 
+                                                           known_head)
+            if framelist is not None:
+                return framelist
+
+        raise RuntimeError('Failed to find the given dynamic reference at any '
+                           'of the given storage providers.')
+
+    @staticmethod
+    def poll_euids(euids, storage_providers):
+        ''' Batch counterpart to poll_euid(). Requests all of the euids 
+        from the first storage provider in a single batch, then asks the 
+        next provider for whatever is still missing, and so on. Returns a
+        dictionary of euid: bites. If any euid can't be found at any of the
+        storage providers, raises an error.
+        '''
+        found = {}
+        missing = list(collections.OrderedDict.fromkeys(euids))
+        for storage_provider in storage_providers:
+            if not missing:
+                break
+            batch = storage_provider.download_many(missing)
+            for euid in missing:
+                bites = batch.get(euid)
+                if bites:
+                    found[euid] = bites
+            missing = [euid for euid in missing if euid not in found]
+
+        if missing:
+            raise RuntimeError('Failed to find ' + str(len(missing)) + ' of '
+                               'the given euids at any of the given storage '
+                               'providers.')
+        return found
+
+    @staticmethod
+    def poll_range(euid, offset, length, storage_providers):
+        ''' Requests (up to) length bytes of the euid, starting at offset,
+        from the storage providers, and returns the first response. If no 
+        storage provider has the file, raises an error. 
+
+        The result is NOT checked against the euid (it can't be), so it 
+        must be authenticated some other way before being trusted.
+        '''
+        for storage_provider in storage_providers:
+            bites = storage_provider.download_range(euid, offset, length)
+            # An empty range (say, past the end of the file) still counts.
+            if bites is not None:
+                return bites
+
+        raise RuntimeError('Failed to find the given euid at any of the '
+                           'given storage providers.')
+
+    @staticmethod
+    def poll_ranges(ranges, storage_providers):
+        ''' Batch counterpart to poll_range(). Takes an iterable of 
+        (euid, offset, length) tuples, requests all of them from the first
+        storage provider, then whatever is still missing from the next, 
+        and so on. Returns a list of results in the same order. If any of
+        them can't be found at any of the storage providers, raises an 
+        error.
+        '''
+        ranges = list(ranges)
+        results = [None] * len(ranges)
+        missing = list(range(len(ranges)))
+        for storage_provider in storage_providers:
+            if not missing:
+                break
+            batch = storage_provider.download_ranges(
+                [ranges[ii] for ii in missing])
+            for ii, bites in zip(missing, batch):
+                if bites is not None:
+                    results[ii] = bites
+            missing = [ii for ii in missing if results[ii] is None]
+
+        if missing:
+            raise RuntimeError('Failed to find ' + str(len(missing)) + ' of '
+                               'the given ranges at any of the given storage '
+                               'providers.')
+        return results
+
+    @staticmethod
+    def every(storage_providers):
+        ''' Returns a list of every one of the storage providers, in their
+        original order. Unlike iterating over a ProviderSelector directly,
+        this doesn't skip circuit-broken providers, so it's what writes 
+        (which must reach all of them) and fixed placements should use.
+        '''
+        if isinstance(storage_providers, ProviderSelector):
+            return storage_providers.every()
+        return list(storage_providers)
+
+    @staticmethod
+    def distribute_many(blobs, storage_providers, euids=None):
+        ''' Batch counterpart to distribute(). Uploads the blobs (in 
+        order) to each storage provider in a single batch, optionally 
+        verifying their success with the provided euids. Returns the euids
+        reported by the storage providers.
+        '''
+        blobs = list(blobs)
+        if euids is not None:
+            euids = list(euids)
+            if len(euids) != len(blobs):
+                raise ValueError('Need exactly one euid per blob.')
+
+        results = None
+        for storage_provider in StorageProvider.every(storage_providers):
+            results = storage_provider.upload_many(blobs)
+            for ii, status in enumerate(results):
+                if isinstance(status, Exception):
+                    raise RuntimeError('Unsuccessful upload.') from status
+                if euids and status != euids[ii]:
+                    raise RuntimeError('Unsuccessful upload. EUID '
+                                       'verification mismatch.')
+        return results
+
     @staticmethod
     def distribute(bites, storage_providers, euid=None):
         ''' Uploads the bytes object to the storage providers, optionally 
         verifying their success with the provied euid.
         '''
-        for storage_provider in storage_providers:
+        for storage_provider in StorageProvider.every(storage_providers):
             status = storage_provider.upload(bites)
             # Check that the euids match
             if euid and status != euid:
@@ -809,6 +1760,636 @@ class StorageProvider(metaclass=abc.ABCMeta):
                                    'mismatch.')
 
 
+class Subscription():
+    ''' A single subscriber's stream of (dynamic_ref, file_hash) events, 
+    published by a StorageProvider whenever it accepts a new frame.
+
+    Events are coalesced per dynamic reference: if a reference gets 
+    several new frames before the subscriber catches up, only the most 
+    recent one is delivered. Publishers that can race each other number 
+    their events, so that a late publish of an older frame can't replace
+    (or follow) a newer one. Events can be delivered through a callback 
+    (called from a dedicated thread), pulled with get() or drain(), or 
+    awaited with get_async() or async iteration.
+    '''
+    def __init__(self, dynamic_refs=None, callback=None, on_close=None):
+        ''' on_close is called (with the subscription) once, when it's 
+        closed, so the publisher can forget about it.
+        '''
+        self.dynamic_refs = None if dynamic_refs is None \
+            else frozenset(dynamic_refs)
+        self.closed = False
+        self._on_close = on_close
+        # dynamic ref: most recent file hash
+        self._pending = collections.OrderedDict()
+        # dynamic ref: sequence number of the most recent event published
+        self._latest = {}
+        self._cond = threading.Condition()
+        # (loop, future) for everything awaiting an event
+        self._waiters = []
+        self._thread = None
+        if callback is not None:
+            self._thread = threading.Thread(target=self._deliver, 
+                                            args=(callback,), daemon=True)
+            self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        event = await self.get_async()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+    def wants(self, dynamic_ref):
+        ''' Returns True if the subscription covers dynamic_ref.
+        '''
+        return self.dynamic_refs is None or dynamic_ref in self.dynamic_refs
+
+    def publish(self, dynamic_ref, file_hash, seq=None):
+        ''' Queues up an event, replacing any still-pending event for the
+        same dynamic reference. If seq is supplied, the event is dropped 
+        unless it's newer than the last one published for the dynamic 
+        reference. Safe to call from any thread.
+        '''
+        with self._cond:
+            if self.closed:
+                return
+            if seq is not None:
+                if seq <= self._latest.get(dynamic_ref, seq - 1):
+                    return
+                self._latest[dynamic_ref] = seq
+            self._pending[dynamic_ref] = file_hash
+            self._cond.notify()
+            self._wake()
+
+    def get(self, timeout=None):
+        ''' Waits (up to timeout seconds) for the next event, and returns
+        it as a tuple of (dynamic_ref, file_hash). Returns None on timeout,
+        or once the subscription is closed.
+        '''
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending or self.closed, 
+                                timeout)
+            if self._pending:
+                return self._pending.popitem(last=False)
+            return None
+
+    def drain(self):
+        ''' Returns every pending event at once, without waiting.
+        '''
+        with self._cond:
+            events = list(self._pending.items())
+            self._pending.clear()
+        return events
+
+    async def get_async(self):
+        ''' Coroutine equivalent of get() (without the timeout; use 
+        asyncio.wait_for for that).
+        '''
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._pending:
+                    return self._pending.popitem(last=False)
+                if self.closed:
+                    return None
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            await waiter
+
+    def close(self):
+        ''' Stops the subscription. Any pending events are discarded.
+        '''
+        with self._cond:
+            if self.closed:
+                return
+            self.closed = True
+            self._pending.clear()
+            self._cond.notify_all()
+            self._wake()
+        if self._on_close is not None:
+            self._on_close(self)
+
+    def _wake(self):
+        ''' Wakes up every coroutine waiting on us. Call with the 
+        condition held.
+        '''
+        for loop, waiter in self._waiters:
+            loop.call_soon_threadsafe(self._resolve, waiter)
+        self._waiters.clear()
+
+    @staticmethod
+    def _resolve(waiter):
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def _deliver(self, callback):
+        ''' Callback delivery loop, run on its own thread.
+        '''
+        while True:
+            event = self.get()
+            if event is None:
+                return
+            try:
+                callback(*event)
+            except Exception:
+                # A broken callback shouldn't take down the subscription.
+                warn('Subscription callback raised an exception.')
+
+
+class HedgePolicy():
+    ''' Controls when StorageProvider.poll_euid sends backup (hedged) 
+    requests to the next storage provider.
+
+    With a fixed delay, backups are sent after that many seconds. 
+    Otherwise, the delay tracks the given percentile of recently observed
+    download latencies (clamped to [min_delay, max_delay]), starting at 
+    default_delay until any latencies have been observed.
+
+    Every read hedged by the same policy shares one pool of (at most) 
+    max_workers threads, which should comfortably exceed the number of 
+    providers, so that stalled requests can't hold up the backups.
+    '''
+    def __init__(self, delay=None, percentile=95, window=256, 
+        default_delay=.05, min_delay=.001, max_delay=2, max_workers=32):
+        if delay is not None and delay < 0:
+            raise ValueError('Hedging delay cannot be negative.')
+        if not 0 < percentile <= 100:
+            raise ValueError('Percentile must be within (0, 100].')
+        self.fixed_delay = delay
+        self.percentile = percentile
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.max_workers = max_workers
+        self._latencies = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def submit(self, func, *args):
+        ''' Runs func(*args) on the policy's shared thread pool, creating 
+        it if needed. Returns a future.
+        '''
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers)
+            return self._executor.submit(func, *args)
+
+    def record(self, latency):
+        ''' Records an observed download latency, in seconds.
+        '''
+        with self._lock:
+            self._latencies.append(latency)
+
+    @property
+    def delay(self):
+        ''' Read-only property for the current hedging delay, in seconds.
+        '''
+        if self.fixed_delay is not None:
+            return self.fixed_delay
+
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return self.default_delay
+
+        # Nearest-rank percentile
+        rank = int(math.ceil(self.percentile / 100 * len(latencies))) - 1
+        delay = latencies[max(rank, 0)]
+        return min(max(delay, self.min_delay), self.max_delay)
+
+
+class ProviderSelector():
+    ''' Wraps a list of StorageProviders, keeping exponentially-decayed 
+    latency, error rate and hit rate statistics for each of them, and 
+    reordering them (best first) every time it is iterated over. Providers
+    that keep failing are circuit-broken: they're skipped for cooldown 
+    seconds, after which a single trial call decides whether they're back.
+
+    Can be passed anywhere a list of storage providers is expected, 
+    without changing any calling code. Note that iterating skips the 
+    circuit-broken providers, which is only right for reads: writes go 
+    through StorageProvider.every() (see every()), so that distribute() 
+    still reaches all of them.
+    '''
+    def __init__(self, storage_providers, decay=.2, failure_threshold=5, 
+        cooldown=30):
+        ''' decay is the weight given to each new observation.
+        '''
+        if not 0 < decay <= 1:
+            raise ValueError('Decay must be within (0, 1].')
+        self.decay = decay
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._providers = [_MeteredProvider(storage_provider, self) 
+                           for storage_provider in storage_providers]
+
+    def __iter__(self):
+        return iter(self.ranked())
+
+    def __len__(self):
+        return len(self._providers)
+
+    def every(self):
+        ''' Returns every provider, in the order they were originally 
+        given, whatever the state of its circuit.
+        '''
+        return list(self._providers)
+
+    def ranked(self):
+        ''' Returns the usable providers, best first. If every provider is
+        circuit-broken, returns all of them (still ranked) rather than 
+        nothing at all.
+        '''
+        now = time.monotonic()
+        with self._lock:
+            ranked = sorted(self._providers, key=lambda p: p._score())
+            usable = [p for p in ranked if p._available(now)]
+        return usable or ranked
+
+    def stats(self):
+        ''' Returns a list of dictionaries of statistics, one per provider,
+        in the order the providers were originally given.
+        '''
+        now = time.monotonic()
+        with self._lock:
+            return [provider._stats(now) for provider in self._providers]
+
+
+class _MeteredProvider(StorageProvider):
+    ''' A StorageProvider proxy that records the outcome of every call 
+    with its ProviderSelector.
+    '''
+    def __init__(self, storage_provider, selector):
+        self.storage_provider = storage_provider
+        self._selector = selector
+        self._calls = 0
+        self._latency = 0
+        self._error_rate = 0
+        self._hit_rate = 1
+        self._failures = 0
+        self._opened = None
+        # Whether the half-open circuit's single trial call is under way
+        self._trial = False
+
+    def ping(self, address):
+        return self._call('ping', address)
+
+    def upload(self, bites):
+        return self._call('upload', bites)
+
+    def download(self, euid):
+        return self._call('download', euid)
+
+    def list_frames(self, dynamic_ref):
+        return self._call('list_frames', dynamic_ref)
+
+    def ping_many(self, addresses):
+        return self._call('ping_many', addresses, batch=True)
+
+    def download_many(self, euids):
+        return self._call('download_many', euids, batch=True)
+
+    def upload_many(self, blobs):
+        return self._call('upload_many', blobs, batch=True)
+
+    def head(self, dynamic_ref):
+        return self._call('head', dynamic_ref)
+
+    def list_frames_since(self, dynamic_ref, known_head):
+        return self._call('list_frames_since', dynamic_ref, known_head)
+
+    def download_range(self, euid, offset, length):
+        return self._call('download_range', euid, offset, length)
+
+    def download_ranges(self, ranges):
+        return self._call('download_ranges', ranges, batch=True)
+
+    def upload_frames(self, blobs):
+        return self._call('upload_frames', blobs, batch=True)
+
+    def delete(self, address):
+        return self._call('delete', address)
+
+    def summarize(self, prefix=b''):
+        return self._call('summarize', prefix)
+
+    def list_heads(self, prefix=b''):
+        return self._call('list_heads', prefix)
+
+    def summarize_heads(self, prefix=b''):
+        return self._call('summarize_heads', prefix)
+
+    # Subscriptions and enumeration are long-lived (or lazy), so there's no
+    # sensible latency to meter for them.
+    def subscribe(self, dynamic_refs=None, callback=None):
+        return self.storage_provider.subscribe(dynamic_refs, callback)
+
+    def iter_euids(self, prefix=b''):
+        return self.storage_provider.iter_euids(prefix)
+
+    def iter_references(self, prefix=b''):
+        return self.storage_provider.iter_references(prefix)
+
+    def __getattr__(self, name):
+        ''' Anything else passes straight through, unmetered. Note that this
+        only catches names StorageProvider doesn't define itself.
+        '''
+        # Avoid infinite recursion if we're not fully initialized.
+        if name == 'storage_provider':
+            raise AttributeError(name)
+        return getattr(self.storage_provider, name)
+
+    def _call(self, method, *args, batch=False):
+        ''' Calls the wrapped provider, recording latency, errors and 
+        hits (truthy results). For batch calls, the result holds one 
+        item per request (as a list, or the values of a dict); each 
+        exception in it counts as an error, and the latency is spread 
+        evenly over the items, so that batches are comparable with 
+        single calls.
+        '''
+        self._begin()
+        start = time.monotonic()
+        try:
+            result = getattr(self.storage_provider, method)(*args)
+        except NotImplementedError:
+            # Not supporting an optional method isn't a failure.
+            with self._selector._lock:
+                self._trial = False
+            raise
+        except Exception:
+            self._record(time.monotonic() - start, error=True, hit=False)
+            raise
+        latency = time.monotonic() - start
+
+        if not batch:
+            self._record(latency, error=False, hit=bool(result))
+            return result
+
+        items = list(result.values() if isinstance(result, dict) 
+                     else result)
+        if items:
+            errors = sum(isinstance(item, Exception) for item in items)
+            hits = sum(bool(item) for item in items 
+                       if not isinstance(item, Exception))
+            self._record(latency / len(items), error=errors / len(items), 
+                         hit=hits / max(len(items) - errors, 1))
+        return result
+
+    def _begin(self):
+        ''' Claims the trial call, if the circuit is half-open.
+        '''
+        with self._selector._lock:
+            if self._opened is not None and self._available(time.monotonic()):
+                self._trial = True
+
+    def _record(self, latency, error, hit):
+        ''' Folds an observation into the decayed statistics, and trips 
+        or resets the circuit breaker. error and hit may be fractions (for
+        batches), in which case hit is the fraction of the non-error items
+        that hit. Only a call that failed outright counts towards the 
+        breaker.
+        '''
+        selector = self._selector
+        alpha = selector.decay
+        with selector._lock:
+            # Seed with the first observation instead of decaying from zero
+            if not self._calls:
+                self._latency = latency
+            else:
+                self._latency += alpha * (latency - self._latency)
+            self._error_rate += alpha * (error - self._error_rate)
+            # Errors don't tell us anything about hit rate.
+            self._hit_rate += alpha * (1 - error) * (hit - self._hit_rate)
+            self._calls += 1
+            self._trial = False
+
+            if error >= 1:
+                self._failures += 1
+                if self._failures >= selector.failure_threshold:
+                    # (Re)open the circuit.
+                    self._opened = time.monotonic()
+            else:
+                self._failures = 0
+                self._opened = None
+
+    def _available(self, now):
+        ''' Closed circuits are available, as are open circuits that have
+        cooled down (half-open), for a single trial call at a time.
+        '''
+        return self._opened is None or (
+            not self._trial and now - self._opened >= self._selector.cooldown)
+
+    def _score(self):
+        ''' Lower is better. Unmeasured providers go first, so that they
+        get measured.
+        '''
+        if not self._calls:
+            return 0
+        return (self._latency * (1 + self._error_rate) / 
+                max(self._hit_rate, .01))
+
+    def _stats(self, now):
+        if self._opened is None:
+            circuit = 'closed'
+        elif self._trial or self._available(now):
+            circuit = 'half-open'
+        else:
+            circuit = 'open'
+        return {'provider': self.storage_provider,
+                'calls': self._calls,
+                'latency': self._latency,
+                'error_rate': self._error_rate,
+                'hit_rate': self._hit_rate,
+                'consecutive_failures': self._failures,
+                'circuit': circuit}
+
+
+class AsyncStorageProvider(metaclass=abc.ABCMeta):
+    ''' An abstract base class for asyncio storage providers for .eic 
+    files. Identical to StorageProvider, except that all of the provider 
+    methods are coroutines, and the multi-provider helpers query every 
+    provider concurrently instead of one at a time.
+
+    Synchronous StorageProviders can be used anywhere an 
+    AsyncStorageProvider is expected by wrapping them in an 
+    AsyncStorageAdapter (see AsyncStorageProvider.adapt()).
+    '''
+
+    @abc.abstractmethod
+    async def ping(self, address):
+        ''' Coroutine. Queries the storage provider about whether it has 
+        a copy of the address. Address may be either an euid or a dynamic 
+        reference.
+
+        returns:
+        b'd' if dynamic
+        b's' if static
+        False if not found
+        '''
+        pass
+
+    @abc.abstractmethod
+    async def upload(self, bites):
+        ''' Coroutine. Pushes an eic file to the storage provider. If 
+        unsuccessful, raise an error. If successful, returns the EUID.
+        '''
+        pass
+
+    @abc.abstractmethod
+    async def download(self, euid):
+        ''' Coroutine. Gets an eic file from the storage provider. If the
+        provider was successfully reached, but does not have the object, 
+        return None. If the provider was not successfully reached, throw 
+        an error.
+        '''
+        pass
+
+    @abc.abstractmethod
+    async def list_frames(self, dynamic_ref):
+        ''' Coroutine. Returns a list of the full EUIDs associated with a
+        specified EICd header hash, in "chronological" order from most 
+        recent frame [0] to oldest frame [n].
+        '''
+        pass
+
+    @staticmethod
+    def adapt(storage_providers):
+        ''' Returns a list of AsyncStorageProviders, wrapping any 
+        synchronous StorageProviders in an AsyncStorageAdapter.
+        '''
+        adapted = []
+        for storage_provider in storage_providers:
+            if not isinstance(storage_provider, AsyncStorageProvider):
+                storage_provider = AsyncStorageAdapter(storage_provider)
+            adapted.append(storage_provider)
+        return adapted
+
+    @staticmethod
+    async def _first_truthy(coros):
+        ''' Runs the coroutines concurrently, returning the first truthy 
+        result and cancelling the rest. Errors are treated as misses, 
+        unless every coroutine errors, in which case the first error is
+        re-raised. If nothing is found, returns None.
+        '''
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+        errors = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    result = await next_done
+                except Exception as exc:
+                    errors.append(exc)
+                    continue
+                if result:
+                    return result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if tasks and len(errors) == len(tasks):
+            raise errors[0]
+        return None
+
+    @staticmethod
+    async def ping_multi(euid, storage_providers):
+        ''' Pings every storage provider concurrently, returning the first
+        positive status (b'd' or b's') received, or False if none of them
+        have the address.
+        '''
+        storage_providers = AsyncStorageProvider.adapt(storage_providers)
+        status = await AsyncStorageProvider._first_truthy(
+            storage_provider.ping(euid) 
+            for storage_provider in storage_providers)
+
+        # 404: your princess is in another castle
+        return status or False
+
+    @staticmethod
+    async def poll_euid(euid, storage_providers):
+        ''' Requests the euid from every storage provider concurrently, 
+        returning the first bites received. If no storage provider has the 
+        file, raises an error.
+        '''
+        storage_providers = AsyncStorageProvider.adapt(storage_providers)
+        bites = await AsyncStorageProvider._first_truthy(
+            storage_provider.download(euid) 
+            for storage_provider in storage_providers)
+
+        if not bites:
+            raise RuntimeError('Failed to find the given euid at any of the '
+                               'given storage providers.')
+        return bites
+
+    @staticmethod
+    async def poll_frames(reference, storage_providers):
+        ''' Requests the dynamic reference from every storage provider 
+        concurrently, returning the first frame list received (from most
+        recent to oldest).
+        '''
+        storage_providers = AsyncStorageProvider.adapt(storage_providers)
+        framelist = await AsyncStorageProvider._first_truthy(
+            storage_provider.list_frames(reference) 
+            for storage_provider in storage_providers)
+
+        if not framelist:
+            raise RuntimeError('Failed to find the given dynamic reference at '
+                               'any of the given storage providers.')
+        return framelist
+
+    @staticmethod
+    async def distribute(bites, storage_providers, euid=None):
+        ''' Uploads the bytes object to every storage provider 
+        concurrently, optionally verifying their success with the provided
+        euid.
+        '''
+        storage_providers = AsyncStorageProvider.adapt(storage_providers)
+        statuses = await asyncio.gather(
+            *[storage_provider.upload(bites) 
+              for storage_provider in storage_providers])
+        # Check that the euids match
+        for status in statuses:
+            if euid and status != euid:
+                raise RuntimeError('Unsuccessful upload. EUID verification '
+                                   'mismatch.')
+
+
+class AsyncStorageAdapter(AsyncStorageProvider):
+    ''' Wraps a synchronous StorageProvider so that it can be used as an
+    AsyncStorageProvider. Every call is run in the event loop's default 
+    executor.
+    '''
+    def __init__(self, storage_provider):
+        ''' Wraps storage_provider.
+        '''
+        if not isinstance(storage_provider, StorageProvider):
+            raise TypeError('Can only adapt StorageProviders.')
+        self.storage_provider = storage_provider
+
+    async def ping(self, address):
+        return await _run_in_executor(self.storage_provider.ping, address)
+
+    async def upload(self, bites):
+        return await _run_in_executor(self.storage_provider.upload, bites)
+
+    async def download(self, euid):
+        return await _run_in_executor(self.storage_provider.download, euid)
+
+    async def list_frames(self, dynamic_ref):
+        return await _run_in_executor(self.storage_provider.list_frames, 
+                                      dynamic_ref)
+
+
 class AccessProvider(metaclass=abc.ABCMeta):
     ''' An abstract base class for something that returns symmetric keys 
     for specified euids.
@@ -907,9 +2488,14 @@ class EICBase(metaclass=abc.ABCMeta):
         '''
         # Preinitialize output dict
         delivery = {}
-        # Parse that shit
+        # Parse that shit. Copy the (small) header fields out as bytes, so 
+        # that buffer-backed bites (memoryview, mmap) behave just like bytes,
+        # but leave the payload as-is to avoid copying it.
         for key, address in cls.header_bits.items():
-            delivery[key] = bites[address]
+            if key == 'payload':
+                delivery[key] = bites[address]
+            else:
+                delivery[key] = bytes(bites[address])
 
         return delivery
 
@@ -935,6 +2521,129 @@ class EICBase(metaclass=abc.ABCMeta):
         # Success!
         return True
 
+    @staticmethod
+    def _check_signature(euid, author, signed, signature, storage_providers):
+        ''' Verifies author's signature over signed, resolving their 
+        public key through AUTHOR_KEY_CACHE. If a VerificationLedger is in 
+        use, it's consulted first, and told about every success. Errors out
+        if unsuccessful. Returns True if successful.
+        '''
+        ledger = AUTHOR_KEY_CACHE.ledger
+        if ledger is not None and ledger.check(euid, author, signed, 
+                                               signature):
+            return True
+
+        pubkey = AUTHOR_KEY_CACHE.get(author, storage_providers)
+        EICBase.verify_signature(signed, pubkey, signature)
+
+        if ledger is not None:
+            ledger.record(euid, author, pubkey, signed, signature)
+        return True
+
+    @classmethod
+    def verify_many(cls, objects, storage_providers, workers=None):
+        ''' Verifies the author signatures of many already-fetched EIC 
+        objects at once.
+
+        Objects are grouped by author, so that each author's public key 
+        is resolved only once, and the RSA verifications themselves are 
+        run in parallel on a thread pool of (at most) workers threads.
+
+        Returns a list in the same order as objects, containing True for 
+        every object whose signature verified, and the raised exception 
+        for every object that didn't. Does not stop at the first failure.
+        '''
+        signatures = []
+        for obj in objects:
+            try:
+                signatures.append((obj.euid, obj.author, obj._signed_bytes(), 
+                                   obj._signature))
+            except Exception as exc:
+                signatures.append(exc)
+        return cls._check_signatures(signatures, storage_providers, workers)
+
+    @classmethod
+    def _check_signatures(cls, signatures, storage_providers, workers=None):
+        ''' Batch counterpart to _check_signature(). Takes a list of 
+        (euid, author, signed bytes, signature) tuples (or exceptions, 
+        which are passed straight through), and returns a list of True or 
+        the raised exception for each, in the same order. See 
+        verify_many().
+        '''
+        results = [None] * len(signatures)
+        ledger = AUTHOR_KEY_CACHE.ledger
+
+        # Group the signatures by author, preserving order. Anything already
+        # in the ledger doesn't need its key at all.
+        by_author = collections.OrderedDict()
+        for ii, signature in enumerate(signatures):
+            if isinstance(signature, Exception):
+                results[ii] = signature
+            elif ledger is not None and ledger.check(
+                    signature[0], signature[1], signature[2], signature[3]):
+                results[ii] = True
+            else:
+                by_author.setdefault(signature[1], []).append(ii)
+
+        # Resolve each author once, and build up the verification jobs.
+        jobs = []
+        indices = []
+        for author, members in by_author.items():
+            try:
+                pubkey = AUTHOR_KEY_CACHE.get(author, storage_providers)
+            except Exception as exc:
+                # Couldn't get the key, so every object by them fails.
+                for ii in members:
+                    results[ii] = exc
+                continue
+
+            for ii in members:
+                jobs.append((signatures[ii][2], pubkey, signatures[ii][3]))
+                indices.append(ii)
+
+        # Okay, now run them all and merge the results back in.
+        for job, ii, result in zip(jobs, indices, 
+                                   cls._verify_batch(jobs, workers)):
+            results[ii] = result
+            if ledger is not None and result is True:
+                euid, author = signatures[ii][0:2]
+                ledger.record(euid, author, job[1], job[0], job[2])
+
+        return results
+
+    @staticmethod
+    def _verify_batch(jobs, workers=None):
+        ''' Runs an iterable of (bites, pubkey, signature) jobs through 
+        EICBase.verify_signature on a thread pool. The underlying crypto 
+        releases the GIL, so threads are enough to use every core.
+
+        Returns a list of results in job order: True on success, or the 
+        raised exception on failure.
+        '''
+        jobs = list(jobs)
+        results = []
+        if not jobs:
+            return results
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) \
+                as executor:
+            futures = [executor.submit(EICBase.verify_signature, *job) 
+                       for job in jobs]
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as exc:
+                    results.append(exc)
+
+        return results
+
+    def _signed_bytes(self):
+        ''' Returns the bytes covered by the author's signature. Must be
+        overridden by subclasses.
+        '''
+        raise NotImplementedError('Subclasses must define their signed '
+                                  'bytes.')
+
     @staticmethod
     def _hash(bites):
         ''' Man, this bites.'''
@@ -964,6 +2673,21 @@ class EICBase(metaclass=abc.ABCMeta):
         
         return signature
 
+    @staticmethod
+    def matches_euid(bites, euid):
+        ''' Cheaply checks that bites are an intact copy of the EIC file
+        with the given euid, by checking the recorded file hash against 
+        both the euid and the hashed file contents. Every EIC format keeps
+        the file hash in the same place. Returns True or False.
+        '''
+        try:
+            recorded = bites[EICs.header_bits['file_hash']]
+            if recorded != euid:
+                return False
+            return EICBase._hash(bites[EICs.file_hash_bytes]) == euid
+        except (TypeError, ValueError):
+            return False
+
     @staticmethod
     def check_euid(euid, fatal=True):
         ''' Checks that the object forms a valid EUID. If desired, can also 
@@ -1027,7 +2751,7 @@ class EICBase(metaclass=abc.ABCMeta):
 
     @classmethod
     @abc.abstractmethod
-    def fetch(cls, euid, key, storage_providers):
+    def fetch(cls, euid, key, storage_providers, hedge=None):
         ''' Factory classmethod to produce an EIC object from the listed
         storage providers.
 
@@ -1040,6 +2764,7 @@ class EICBase(metaclass=abc.ABCMeta):
         euid:               The object to load                      bytes
         key:                The decryption key.                     bytes
         storage_providers   A list of StorageProvider objects       []
+        hedge               Optional HedgePolicy for the download   HedgePolicy
 
         Returns
         ----------
@@ -1047,10 +2772,46 @@ class EICBase(metaclass=abc.ABCMeta):
         Unlocked and verified EIC object
         '''        
         # Okay, so we have a single euid for a single file. Get it.
-        bites = StorageProvider.poll_euid(euid, storage_providers)
+        bites = StorageProvider.poll_euid(euid, storage_providers, hedge)
+        return cls._open(bites, euid, key)
 
-        # Load the public parts and verify them thus far
-        unpacked_public = cls.verify_public(bites, euid=euid)
+    @classmethod
+    async def _fetch_async(cls, euid, key, storage_providers):
+        ''' Coroutine equivalent of EICBase.fetch() for 
+        AsyncStorageProviders. The decryption and unpacking are run in an 
+        executor.
+        '''
+        bites = await AsyncStorageProvider.poll_euid(euid, storage_providers)
+        return await _run_in_executor(cls._open, bites, euid, key)
+
+    async def _verify_signature_async(self, storage_providers):
+        ''' Coroutine equivalent of verify_signature() for 
+        AsyncStorageProviders. The RSA verification is run in an executor.
+        '''
+        bites = self._signed_bytes()
+        ledger = AUTHOR_KEY_CACHE.ledger
+        if ledger is not None and ledger.check(self.euid, self.author, bites,
+                                               self._signature):
+            return True
+
+        pubkey = await AUTHOR_KEY_CACHE.get_async(self.author, 
+                                                  storage_providers)
+        await _run_in_executor(EICBase.verify_signature, bites, pubkey, 
+                               self._signature)
+
+        if ledger is not None:
+            ledger.record(self.euid, self.author, pubkey, bites, 
+                          self._signature)
+        return True
+
+    @classmethod
+    def _open(cls, bites, euid, key):
+        ''' Verifies the public parts of bites, then unlocks and unpacks 
+        the payload. Returns a tuple of (unpacked_public, unpacked_payload).
+        '''
+        # Load the public parts and verify them thus far (unless we already
+        # have, for this exact buffer)
+        unpacked_public = VERIFIED_BLOB_CACHE.verify(cls, bites, euid=euid)
 
         # Unlock and unpack the payload
         payload = cls._unlock_payload(unpacked_public['payload'], key)
@@ -1096,7 +2857,7 @@ class EICBase(metaclass=abc.ABCMeta):
 
         Currently just a placeholder.
         '''
-        nonce = payload[0:16]
+        nonce = bytes(payload[0:16])
         payload = payload[16:]
         cipher = Cipher(algorithms.AES(sym_key), modes.CTR(nonce), 
                         backend=cls.BACKEND)
@@ -1106,6 +2867,26 @@ class EICBase(metaclass=abc.ABCMeta):
         del decryptor, cipher, nonce
         return payload
 
+    @classmethod
+    def _unlock_range(cls, payload, sym_key, start, stop):
+        ''' Decrypts only the [start:stop] range of the plaintext of the 
+        supplied (locked) payload. CTR mode is seekable: the counter for 
+        the nth block is just the nonce + n, so we can start decrypting 
+        at any block boundary.
+        '''
+        block_size = algorithms.AES.block_size // 8
+        first_block = start // block_size
+        counter = int.from_bytes(bytes(payload[0:16]), 'big') + first_block
+        counter = (counter % 2 ** 128).to_bytes(16, 'big')
+        ct = payload[16 + first_block * block_size:16 + stop]
+        cipher = Cipher(algorithms.AES(sym_key), modes.CTR(counter), 
+                        backend=cls.BACKEND)
+        del sym_key
+        decryptor = cipher.decryptor()
+        plaintext = decryptor.update(ct) + decryptor.finalize()
+        del decryptor, cipher
+        return plaintext[start - first_block * block_size:]
+
 
 class EICa(EICBase):
     ''' Generates an asymmetric .eic file for a key, target, author 
@@ -1200,6 +2981,35 @@ class EICa(EICBase):
         ''' Assembles the .EICa file, signs it, and pushes it to all of the 
         listed storage providers.
         '''
+        # We need to get the pubkey from the storage_proviers
+        pubkey = AUTHOR_KEY_CACHE.get(self.recipient, storage_providers)
+        built = self._build(sig_key, pubkey)
+        del sig_key
+
+        # Send it to every storage provider.
+        StorageProvider.distribute(built, storage_providers, euid=self.euid)
+
+        # If successful, return the EUID (note that in this case, all of
+        # them should match).
+        return self.euid
+
+    async def push_async(self, sig_key, storage_providers):
+        ''' Coroutine equivalent of push() for AsyncStorageProviders. The
+        encryption and signing are run in an executor.
+        '''
+        pubkey = await AUTHOR_KEY_CACHE.get_async(self.recipient, 
+                                                  storage_providers)
+        built = await _run_in_executor(self._build, sig_key, pubkey)
+        del sig_key
+
+        await AsyncStorageProvider.distribute(built, storage_providers, 
+                                              euid=self.euid)
+        return self.euid
+
+    def _build(self, sig_key, pubkey):
+        ''' Assembles and signs the .EICa file for the recipient pubkey,
+        returning the finished bytes. Does not push it anywhere.
+        '''
         # Warning trap if it's already been built
         if self._signature:
             warn(RuntimeWarning('You\'re building an already-signed EICa. '
@@ -1208,12 +3018,6 @@ class EICa(EICBase):
 
         # Don't need to do further error checking, since __init__ already did.
 
-        # We do, however, need to get the pubkey from the storage_proviers
-        pubkey = EICs.fetch(self.recipient, AUTHOR_BOOTSTRAP_SYMKEY, 
-                            storage_providers)[b'pubkey']
-        pubkey = serialization.load_pem_public_key(pubkey, 
-                                                   backend=self.BACKEND)
-
         # Preinitialize build_array. Note that this only works because the
         # final EICa size is determined by the spec.
         build_array = bytearray(self.__class__.final_size)
@@ -1255,14 +3059,7 @@ class EICa(EICBase):
         build_array[build_map['magic']] = self.__class__.magic
         build_array[build_map['signature']] = self.signature
         build_array[build_map['file_hash']] = self._file_hash
-        built = bytes(build_array)
-
-        # Send it to every storage provider.
-        StorageProvider.distribute(built, storage_providers, euid=self.euid)
-
-        # If successful, return the EUID (note that in this case, all of
-        # them should match).
-        return self.euid
+        return bytes(build_array)
 
     @classmethod
     def verify_public(cls, bites, euid=None):
@@ -1299,23 +3096,25 @@ class EICa(EICBase):
         ''' Convenience wrapper for ABC signature verification, to give it the
         appropriate bytes.
         '''
+        # Get the signed bytes first, so we error out before any fetching
+        bites = self._signed_bytes()
+        # Get pubkey from the cache (or, failing that, the storage providers)
+        return self._check_signature(self.euid, self.author, bites, 
+                                     self._signature, storage_providers)
+
+    def _signed_bytes(self):
+        ''' EICa signatures cover the file hash and the inner hash.
+        '''
         # Error trap if missing definitions
         if not (self._file_hash and self._inner_hash):
             raise RuntimeError('Cannot verify EICa signature without first '
                                'unlocking the container.')
 
         # EICa signatures are constructed thusly...
-        bites = self._file_hash + self._inner_hash
-        # Get pubkey from the storage providers
-        pubkey = EICs.fetch(self.author, AUTHOR_BOOTSTRAP_SYMKEY, 
-                            storage_providers)[b'pubkey']
-        pubkey = serialization.load_pem_public_key(pubkey, 
-                                                   backend=self.BACKEND)
-
-        return super().verify_signature(bites, pubkey, self._signature)
+        return self._file_hash + self._inner_hash
 
     @classmethod
-    def fetch(cls, euid, prv_key, storage_providers):
+    def fetch(cls, euid, prv_key, storage_providers, hedge=None):
         ''' Factory classmethod to produce an EICa object from the listed
         storage providers.
 
@@ -1328,26 +3127,19 @@ class EICa(EICBase):
         bites:              The bytes object to load                bytes
         prv_key:            The decryption key.                     bytes
         storage_providers   A list of StorageProvider objects       []
+        hedge               Optional HedgePolicy for the download   HedgePolicy
 
-        Returns
-        ----------
-
-        tuple:      (EICa object, stripped payload to verify)
-        '''
-        unpacked_public, unpacked_payload = super().fetch(euid, prv_key, 
-                                                          storage_providers)
-        
-        # Build the eica
-        eica = cls(unpacked_public['recipient'], unpacked_payload['target'], 
-                   unpacked_payload['author'], unpacked_payload['key'], 
-                   net_class=unpacked_payload['class'],
-                   inner_hash=unpacked_payload['inner_hash'],
-                   signature=unpacked_public['signature'],
-                   file_hash=unpacked_public['file_hash'],
-                   euid=euid)
-
+        Returns
+        ----------
+
+        tuple:      (EICa object, stripped payload to verify)
+        '''
+        unpacked_public, unpacked_payload = super().fetch(euid, prv_key, 
+                                                          storage_providers,
+                                                          hedge)
         # For a bit of added reassurance, delete stuff explicitly right meow
         del prv_key
+        eica = cls._from_unpacked(euid, unpacked_public, unpacked_payload)
 
         # Finally, verify the signature (we could not do this before, as it 
         # requires unlocking and unpacking the payload)
@@ -1356,6 +3148,30 @@ class EICa(EICBase):
         # finally, return the eica
         return eica
 
+    @classmethod
+    async def fetch_async(cls, euid, prv_key, storage_providers):
+        ''' Coroutine equivalent of fetch() for AsyncStorageProviders. The
+        decryption and signature verification are run in an executor.
+        '''
+        unpacked_public, unpacked_payload = \
+            await cls._fetch_async(euid, prv_key, storage_providers)
+        del prv_key
+        eica = cls._from_unpacked(euid, unpacked_public, unpacked_payload)
+        await eica._verify_signature_async(storage_providers)
+        return eica
+
+    @classmethod
+    def _from_unpacked(cls, euid, unpacked_public, unpacked_payload):
+        ''' Builds the (not yet signature-verified) eica.
+        '''
+        return cls(unpacked_public['recipient'], unpacked_payload['target'], 
+                   unpacked_payload['author'], unpacked_payload['key'], 
+                   net_class=unpacked_payload['class'],
+                   inner_hash=unpacked_payload['inner_hash'],
+                   signature=unpacked_public['signature'],
+                   file_hash=unpacked_public['file_hash'],
+                   euid=euid)
+
     @staticmethod
     def _unlock_payload(bites, prv_key):
         ''' Implements the EICa standard to unencrypt the payload, then 
@@ -1363,7 +3179,7 @@ class EICa(EICBase):
         '''
         cipher = PKCS1_OAEP.new(prv_key, hashAlgo=SHA512)
         del prv_key
-        return cipher.decrypt(bites)
+        return cipher.decrypt(bytes(bites))
 
     @staticmethod
     def _lock_payload(payload, pubkey):
@@ -1572,6 +3388,56 @@ class EICd(EICBase):
         self.history[self._index]['built'] = bytes(packed)
         self.history[self._index]['euid'] = euid
 
+    @classmethod
+    def push_many(cls, eicds, sym_keys, sig_key, storage_providers, 
+        workers=None):
+        ''' Commits the pending content of many (distinct) EICd objects 
+        at once, and pushes the newly-committed frames.
+
+        Each commit (encryption, hashing and signing) is run on a thread 
+        pool of (at most) workers threads, and each new frame is uploaded
+        to the storage providers as soon as it is ready. Frames within a
+        single EICd form a hash chain and cannot be built in parallel, so
+        each EICd may only appear once per batch.
+
+        Returns the new euids, in the same order as eicds.
+        '''
+        eicds = list(eicds)
+        sym_keys = list(sym_keys)
+        if len(eicds) != len(sym_keys):
+            raise ValueError('Need exactly one symmetric key per EICd.')
+        if len(set(id(eicd) for eicd in eicds)) != len(eicds):
+            raise ValueError('Each EICd may only be committed once per '
+                             'batch.')
+
+        euids = [None] * len(eicds)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) \
+                as executor:
+            futures = {executor.submit(eicd.commit, sym_key, sig_key): ii 
+                       for ii, (eicd, sym_key) in 
+                       enumerate(zip(eicds, sym_keys))}
+            del sym_keys, sig_key
+
+            # Stream the finished frames into the uploads.
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    ii = futures[future]
+                    future.result()
+                    # Only push the frame we just built; everything older 
+                    # should already be up there.
+                    frame = eicds[ii].history[eicds[ii]._index]
+                    StorageProvider.distribute(frame['built'], 
+                                               storage_providers, 
+                                               euid=frame['euid'])
+                    euids[ii] = frame['euid']
+            # Don't bother committing anything else if something went wrong.
+            except:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        return euids
+
     @classmethod
     def _unpack_public(cls, bites):
         ''' Do some post-processing of the unloaded public values.
@@ -1596,10 +3462,7 @@ class EICd(EICBase):
             raise RuntimeError('Payload length doesn\'t match payload.')
 
         # Verify the header hash
-        to_hash = bytes()
-        for component in cls.header_hash_bytes:
-            to_hash += bites[component]
-        if unloaded['header_hash'] != cls._hash(to_hash):
+        if unloaded['header_hash'] != cls._hash_header(bites):
             raise RuntimeError('Mismatched header hash. This doesn\'t appear '
                 'to be the correct dynamic file.')
 
@@ -1617,6 +3480,137 @@ class EICd(EICBase):
         # We've gotten to the end. Return everything.
         return unloaded
 
+    @classmethod
+    def _hash_header(cls, bites):
+        ''' Computes the header hash (ie, the dynamic reference) from the
+        header bytes it covers.
+        '''
+        to_hash = bytes()
+        for component in cls.header_hash_bytes:
+            to_hash += bites[component]
+        return cls._hash(to_hash)
+
+    @classmethod
+    def peek_header(cls, euid, storage_providers):
+        ''' Reads just the header of the EICd frame euid, using a ranged
+        download. See peek_headers().
+        '''
+        return cls.peek_headers([euid], storage_providers)[0]
+
+    @classmethod
+    def peek_headers(cls, euids, storage_providers):
+        ''' Reads just the headers of the EICd frames with the given 
+        euids, using (vectored) ranged downloads, and returns a list of 
+        the unpacked public values (without the payload) for each.
+
+        The magic number, version and header hash are checked, but since
+        the file hash covers the whole frame, the headers are NOT 
+        authenticated against their euids. Treat them as hints until the
+        frame itself has been verified.
+        '''
+        euids = list(euids)
+        headers = StorageProvider.poll_ranges(
+            [(euid, 0, cls.header_size) for euid in euids], storage_providers)
+
+        unloaded = []
+        for euid, header in zip(euids, headers):
+            header = bytes(header)
+            if len(header) != cls.header_size:
+                raise RuntimeError('Truncated EICd header.')
+            if header[cls.header_bits['magic']] != cls.magic:
+                raise RuntimeError('Mismatched magic numbers while loading.')
+            if header[cls.header_bits['version']] != cls.version:
+                raise RuntimeError('Mismatched EIC versions while loading.')
+
+            partial = cls._unpack_public(header)
+            del partial['payload']
+            if partial['file_hash'] != euid:
+                raise RuntimeError('EUID doesn\'t match header, check EIC '
+                                   'integrity.')
+            if partial['header_hash'] != cls._hash_header(header):
+                raise RuntimeError('Mismatched header hash. This doesn\'t '
+                                   'appear to be the correct dynamic file.')
+            partial['euid'] = euid
+            unloaded.append(partial)
+
+        return unloaded
+
+    @classmethod
+    def verify_chain(cls, dynamic_ref, storage_providers, sym_key=None, 
+                     frames=(), check_hashes=False, workers=None):
+        ''' Audits the frame buffer of the dynamic reference, mostly from
+        the frame headers alone:
+
+        1. every frame's header hash must be the dynamic reference
+        2. every frame's previous_hash must be the next oldest frame's 
+           file hash
+        3. every frame's signature must verify (in one batch)
+
+        Only the frames whose euids are in frames are downloaded in full 
+        and decrypted (with sym_key). If check_hashes is True, every frame
+        is also downloaded in full and its file hash checked, but not 
+        decrypted.
+
+        Note that the file hash (and therefore the signed euid) covers the
+        whole frame, so a header alone can't be authenticated. Without 
+        check_hashes, the previous_hash links of frames that weren't 
+        downloaded in full are only as trustworthy as the storage 
+        providers that served them.
+
+        Returns a list of the unpacked public values (without payload) 
+        for every frame, from most recent [0] to oldest [n]. Frames that 
+        were decrypted also have 'content'. Raises RuntimeError if 
+        anything fails to check out.
+        '''
+        euids = StorageProvider.poll_frames(dynamic_ref, storage_providers)
+        frames = set(frames)
+        if frames - set(euids):
+            raise ValueError('Requested frames aren\'t in the buffer.')
+        if frames and sym_key is None:
+            raise ValueError('Need sym_key to decrypt frames.')
+
+        if check_hashes:
+            found = StorageProvider.poll_euids(euids, storage_providers)
+            headers = []
+            for euid in euids:
+                partial = VERIFIED_BLOB_CACHE.verify(cls, found[euid], 
+                                                     euid=euid)
+                del partial['payload']
+                headers.append(partial)
+        else:
+            headers = cls.peek_headers(euids, storage_providers)
+
+        # Check the links, from most recent to oldest
+        for newer, older in zip(headers, headers[1:] + [None]):
+            if newer['header_hash'] != dynamic_ref:
+                raise RuntimeError('Frame doesn\'t belong to the dynamic '
+                                   'reference.')
+            # The oldest frame points at either the dynamic reference (if 
+            # it's the zeroth frame) or something already evicted.
+            if older is not None and \
+                    newer['previous_hash'] != older['file_hash']:
+                raise RuntimeError('Broken hash chain.')
+
+        # Now the signatures, all at once
+        results = cls._check_signatures(
+            [(partial['euid'], partial['author'], partial['euid'], 
+              partial['signature']) for partial in headers], 
+            storage_providers, workers)
+        for result in results:
+            if result is not True:
+                raise RuntimeError('Signature verification failed.') \
+                    from result
+
+        # And finally decrypt anything we were asked for.
+        for partial in headers:
+            if partial['euid'] in frames:
+                __, unpacked_payload = super(EICd, cls).fetch(
+                    partial['euid'], sym_key, storage_providers)
+                partial['content'] = unpacked_payload
+
+        del sym_key
+        return headers
+
     def verify_signature(self, storage_providers):
         ''' The necessary / convenient wrapper for ABC signature verification, 
         to give it the appropriate bytes.
@@ -1624,17 +3618,20 @@ class EICd(EICBase):
         Are we, in fact, assured that verifying ONLY the most recent signature
         does, in fact, ensure the veracity of the entire chain?
         '''
-        # Get pubkey from the storage providers
-        pubkey = EICs.fetch(self.author, AUTHOR_BOOTSTRAP_SYMKEY, 
-                            storage_providers)[b'pubkey']
-        pubkey = serialization.load_pem_public_key(pubkey, 
-                                                   backend=self.BACKEND)
-
-        return super().verify_signature(self.euid, pubkey, self._signature)
+        # Get pubkey from the cache (or, failing that, the storage providers)
+        return self._check_signature(self.euid, self.author, 
+                                     self._signed_bytes(), self._signature, 
+                                     storage_providers)
         # Don't need to verify each frame, as they are all uploaded separately.
 
+    def _signed_bytes(self):
+        ''' EICd signatures cover the euid of the most recent frame.
+        '''
+        return self.euid
+
     @classmethod
-    def fetch(cls, address, sym_key, storage_providers, parse_history=False):
+    def fetch(cls, address, sym_key, storage_providers, parse_history=False,
+        hedge=None):
         ''' Factory classmethod to produce an EICd object from the listed
         storage providers.
 
@@ -1650,12 +3647,79 @@ class EICd(EICBase):
         history:            Controls whether the entire object      bool
                             history is loaded (True), or just the
                             most recent frame (False).
+        hedge:              Optional HedgePolicy for downloading    HedgePolicy
+                            the frames
 
         Returns
         ----------
 
         tuple:      (EICa object, stripped payload to verify)
         '''
+        euids = cls._resolve_frames(address, storage_providers, 
+                                    parse_history)
+        # If we're not getting the entire history, get rid of everything else
+        # to save a bit of time.
+        if not parse_history:
+            euids = [euids[0]]
+
+        # Download and decrypt them in parallel, checking the links.
+        frames = list(cls._iter_frames(euids, sym_key, storage_providers, 
+                                       hedge=hedge))
+        # For a bit of added reassurance, delete stuff explicitly right meow
+        del sym_key
+
+        # Construct the object.
+        eicd = cls._from_frames(frames)
+
+        # Verify the signature
+        eicd.verify_signature(storage_providers)
+        # finally, return the eica
+        return eicd
+
+    @classmethod
+    def iter_history(cls, address, sym_key, storage_providers, prefetch=4,
+        hedge=None):
+        ''' Generator that yields the history of the EICd, from the most 
+        recent frame to the oldest, as each frame is decrypted. Address is
+        either a dynamic reference (starting from the most recent frame), 
+        or a frame euid (starting from that frame).
+
+        Up to prefetch frames are downloaded and decrypted ahead of time,
+        in parallel, and no more than that are ever held at once.
+
+        The first frame's signature is verified before anything is 
+        yielded, and every subsequent frame must be the previous_hash of 
+        the one before it.
+
+        Yields dicts with the same keys as EICd.history frames, plus the 
+        frame's 'euid'. If hedge (a HedgePolicy) is given, the frames are 
+        downloaded with hedged reads.
+        '''
+        euids = cls._resolve_frames(address, storage_providers, True)
+        frames = cls._iter_frames(euids, sym_key, storage_providers, 
+                                  prefetch, hedge)
+        del sym_key
+        try:
+            for ii, (unpacked_public, unpacked_payload) in enumerate(frames):
+                if not ii:
+                    cls._check_signature(unpacked_public['euid'], 
+                                         unpacked_public['author'], 
+                                         unpacked_public['euid'],
+                                         unpacked_public['signature'], 
+                                         storage_providers)
+                frame = cls._history_entry(unpacked_public, unpacked_payload)
+                frame['euid'] = unpacked_public['euid']
+                yield frame
+        finally:
+            frames.close()
+
+    @classmethod
+    def _resolve_frames(cls, address, storage_providers, parse_history):
+        ''' Works out the list of frame euids, from most recent [0] to 
+        oldest [n], for an address that's either a dynamic reference or a 
+        frame euid. For an euid, if parse_history is True, the list runs 
+        from that frame back through whatever remains of the buffer.
+        '''
         # First we need to figure out if "address" is an euid or a dynamic ref
         # Both euids and references look the same
         cls.check_euid(address)
@@ -1663,53 +3727,195 @@ class EICd(EICBase):
         # Dynamic reference?
         if status == b'd':
             # Load the most recent euids.
-            dynamic_ref = address
-            euids = StorageProvider.poll_frames(address, storage_providers)
+            return StorageProvider.poll_frames(address, storage_providers)
         # Not a dynamic reference. Euid?
         elif status == b's':
-            # Use it as the euid.
-            euids = [address]
-
-            # Except first raise an error if it wants the history because we 
-            # aren't there yet.
-            if parse_history:   
-                raise NotImplementedError('Can\'t yet fetch the history for a '
-                                          'specific euid.')
+            if not parse_history:
+                return [address]
+            # The header tells us where to find the rest of the buffer. It's
+            # only a hint, but every frame gets fully verified later anyways.
+            dynamic_ref = cls.peek_header(address, 
+                                          storage_providers)['header_hash']
+            return cls._frames_from(address, StorageProvider.poll_frames(
+                dynamic_ref, storage_providers))
         # Anything else?
         else:
             # That's a problem.
             raise RuntimeError('Unable to find the euid at the listed '
                                'storage providers.')
 
-        # If we're not getting the entire history, get rid of everything else
-        # to save a bit of time.
+    @staticmethod
+    def _frames_from(euid, euids):
+        ''' Trims the (most recent first) frame list euids to start at 
+        euid. If it isn't there, it's all we've got.
+        '''
+        euids = list(euids)
+        try:
+            return euids[euids.index(euid):]
+        except ValueError:
+            return [euid]
+
+    @classmethod
+    def _iter_frames(cls, euids, sym_key, storage_providers, prefetch=4, 
+        hedge=None):
+        ''' Generator that downloads and decrypts the frames (in order), 
+        keeping up to prefetch of them in flight on a thread pool, and 
+        yields (unpacked_public, unpacked_payload) for each. Checks that 
+        each frame is the previous_hash of the frame before it. Each 
+        download is hedged if hedge (a HedgePolicy) is given.
+        '''
+        if prefetch < 1:
+            raise ValueError('Must prefetch at least one frame.')
+        remaining = iter(euids)
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=prefetch)
+        in_flight = collections.deque()
+
+        def launch():
+            ''' Starts the next frame, if there are any left. '''
+            for euid in remaining:
+                in_flight.append(executor.submit(
+                    super(EICd, cls).fetch, euid, sym_key, storage_providers,
+                    hedge))
+                return
+
+        try:
+            for __ in range(prefetch):
+                launch()
+            previous_hash = None
+            while in_flight:
+                unpacked_public, unpacked_payload = in_flight.popleft().result()
+                launch()
+                if previous_hash is not None and \
+                        unpacked_public['file_hash'] != previous_hash:
+                    raise RuntimeError('Broken hash chain.')
+                previous_hash = unpacked_public['previous_hash']
+                yield unpacked_public, unpacked_payload
+        finally:
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    @classmethod
+    async def fetch_async(cls, address, sym_key, storage_providers, 
+        parse_history=False):
+        ''' Coroutine equivalent of fetch() for AsyncStorageProviders. 
+        Frames are downloaded concurrently, and decryption and signature
+        verification are run in an executor.
+        '''
+        cls.check_euid(address)
+        status = await AsyncStorageProvider.ping_multi(address, 
+                                                       storage_providers)
+        if status == b'd':
+            euids = await AsyncStorageProvider.poll_frames(address, 
+                                                           storage_providers)
+        elif status == b's':
+            euids = [address]
+            if parse_history:
+                # No ranged reads here, so just get the frame's header out
+                # of the whole thing.
+                bites = await AsyncStorageProvider.poll_euid(
+                    address, storage_providers)
+                dynamic_ref = bytes(bites[cls.header_bits['header_hash']])
+                euids = cls._frames_from(
+                    address, await AsyncStorageProvider.poll_frames(
+                        dynamic_ref, storage_providers))
+        else:
+            raise RuntimeError('Unable to find the euid at the listed '
+                               'storage providers.')
+
         if not parse_history:
             euids = [euids[0]]
 
-        # Predeclare history
-        history = []
-        # Use super to get, well, pretty much everything
-        for euid in euids:
-            unpacked_public, unpacked_payload = \
-                super().fetch(euid, sym_key, storage_providers)
-            history.append({'content': unpacked_payload, 
-                    'file_hash': unpacked_public['file_hash'],
-                    'previous_hash': unpacked_public['previous_hash']})
+        frames = await asyncio.gather(
+            *[cls._fetch_async(euid, sym_key, storage_providers) 
+              for euid in euids])
+        del sym_key
+        for newer, older in zip(frames, frames[1:]):
+            if newer[0]['previous_hash'] != older[0]['file_hash']:
+                raise RuntimeError('Broken hash chain.')
+
+        eicd = cls._from_frames(frames)
+        await eicd._verify_signature_async(storage_providers)
+        return eicd
+
+    @classmethod
+    def _from_frames(cls, frames):
+        ''' Builds the (not yet signature-verified) EICd from a list of 
+        (unpacked_public, unpacked_payload) frames, from most recent [0] to
+        oldest [n].
+        '''
+        # History runs the other way around, with the most recent frame on
+        # the right, and that's the frame the object is built from.
+        history = [cls._history_entry(unpacked_public, unpacked_payload) 
+                   for unpacked_public, unpacked_payload in reversed(frames)]
+        unpacked_public = frames[0][0]
 
         # Construct the object.
-        eicd = cls(unpacked_public['author'], 
+        return cls(unpacked_public['author'], 
                    unpacked_public['buffer_req'], history=history,
-                   euid=euid, dynamic_ref=unpacked_public['header_hash'], 
+                   euid=unpacked_public['euid'], 
+                   dynamic_ref=unpacked_public['header_hash'], 
                    zeroth_hash=unpacked_public['zeroth_hash'],
                    signature=unpacked_public['signature'])
 
-        # For a bit of added reassurance, delete stuff explicitly right meow
-        del sym_key, unpacked_public, unpacked_payload
+    def refresh(self, sym_key, storage_providers, hedge=None):
+        ''' Brings the (already loaded) EICd object up-to-date with the 
+        storage providers, downloading only the frames that are newer than
+        our most recent one. If our most recent frame has already left 
+        the buffer, the history is replaced with the current buffer.
 
-        # Verify the signature
-        eicd.verify_signature(storage_providers)
-        # finally, return the eica
-        return eicd
+        Returns a list of the new frame euids, from most recent [0] to 
+        oldest [n]. Cheap (a single head check) if nothing has changed. 
+        The new frames are downloaded with hedged reads if hedge (a 
+        HedgePolicy) is given.
+        '''
+        known_head = self._file_hash
+        if not known_head:
+            raise RuntimeError('Cannot refresh an EICd with uncommitted '
+                               'content.')
+
+        head = StorageProvider.poll_head(self.dynamic_ref, storage_providers)
+        if head == known_head:
+            return []
+
+        euids = StorageProvider.poll_frames_since(self.dynamic_ref, 
+                                                  known_head, 
+                                                  storage_providers)
+        if not euids:
+            return []
+        frames = list(self._iter_frames(euids, sym_key, storage_providers, 
+                                        hedge=hedge))
+        del sym_key
+
+        newest = frames[0][0]
+        if newest['header_hash'] != self.dynamic_ref:
+            raise RuntimeError('Frame doesn\'t belong to the dynamic '
+                               'reference.')
+        self._check_signature(newest['euid'], self.author, newest['euid'], 
+                              newest['signature'], storage_providers)
+
+        # Do we pick up where we left off, or is there a gap?
+        history = self.history
+        if frames[-1][0]['previous_hash'] != known_head:
+            history.clear()
+        if newest['buffer_req'] != self.buffer_req:
+            self.buffer_req = newest['buffer_req']
+            history = collections.deque(history, maxlen=self.buffer_req)
+        for unpacked_public, unpacked_payload in reversed(frames):
+            history.append(self._history_entry(unpacked_public, 
+                                               unpacked_payload))
+        self.history = history
+        self._signature = newest['signature']
+
+        return euids
+
+    @staticmethod
+    def _history_entry(unpacked_public, unpacked_payload):
+        ''' Turns an unpacked frame into an entry for EICd.history.
+        '''
+        return {'content': unpacked_payload, 
+                'file_hash': unpacked_public['file_hash'],
+                'previous_hash': unpacked_public['previous_hash']}
 
     def push(self, storage_providers):
         ''' Brings all storage providers up-to-date with the EICd object, 
@@ -1734,6 +3940,22 @@ class EICd(EICBase):
         # Todo: think about this, since it's a crazy awkward verification
         return euid
 
+    async def push_async(self, storage_providers):
+        ''' Coroutine equivalent of push() for AsyncStorageProviders. 
+        Frames are pushed in order, but each frame is uploaded to every 
+        provider concurrently.
+        '''
+        euid = None
+        for frame in self.history:
+            try:
+                euid = frame['euid']
+                built = frame['built']
+            except KeyError:
+                continue
+            await AsyncStorageProvider.distribute(built, storage_providers, 
+                                                  euid=euid)
+        return euid
+
     @staticmethod
     def check_reference(dynamic_ref, fatal=True):
         ''' Tests validity of a dynamic reference. Returns True if it appears 
@@ -1984,6 +4206,73 @@ class EICs(EICBase, SplitHashMap):
         ''' Assembles the .EICs file, signs it, and pushes it to all of the 
         listed storage providers.
         '''
+        built = self._build(sym_key, sig_key)
+        del sym_key, sig_key
+
+        # Send it to every storage provider.
+        StorageProvider.distribute(built, storage_providers, euid=self.euid)
+
+        # If successful, return the EUID (note that in this case, all of
+        # them should match).
+        return self.euid
+
+    async def push_async(self, sym_key, sig_key, storage_providers):
+        ''' Coroutine equivalent of push() for AsyncStorageProviders. The
+        packing, encryption and signing are run in an executor.
+        '''
+        built = await _run_in_executor(self._build, sym_key, sig_key)
+        del sym_key, sig_key
+        await AsyncStorageProvider.distribute(built, storage_providers, 
+                                              euid=self.euid)
+        return self.euid
+
+    @classmethod
+    def push_many(cls, objs, sym_keys, sig_key, storage_providers, 
+        workers=None):
+        ''' Assembles, signs, and pushes many EICs objects at once.
+
+        Packing, encryption, hashing and signing for each object are run on
+        a thread pool of (at most) workers threads, and each finished file 
+        is uploaded to the storage providers as soon as it is ready, while
+        the rest are still being built.
+
+        Returns the euids, in the same order as objs.
+        '''
+        objs = list(objs)
+        sym_keys = list(sym_keys)
+        if len(objs) != len(sym_keys):
+            raise ValueError('Need exactly one symmetric key per EICs.')
+        # Building the same object twice concurrently would be a race.
+        if len(set(id(obj) for obj in objs)) != len(objs):
+            raise ValueError('Each EICs may only be pushed once per batch.')
+
+        euids = [None] * len(objs)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) \
+                as executor:
+            futures = {executor.submit(obj._build, sym_key, sig_key): ii 
+                       for ii, (obj, sym_key) in enumerate(zip(objs, sym_keys))}
+            del sym_keys, sig_key
+
+            # Stream the finished files into the uploads.
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    ii = futures[future]
+                    built = future.result()
+                    StorageProvider.distribute(built, storage_providers, 
+                                               euid=objs[ii].euid)
+                    euids[ii] = objs[ii].euid
+            # Don't bother building anything else if something went wrong.
+            except:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        return euids
+
+    def _build(self, sym_key, sig_key):
+        ''' Assembles and signs the .EICs file, returning the finished 
+        bytes. Does not push it anywhere.
+        '''
         # Warning trap if it's already been built
         if self._signature:
             warn(RuntimeWarning('You\'re building an already-signed EICs. '
@@ -2033,14 +4322,7 @@ class EICs(EICBase, SplitHashMap):
         build_array[build_map['magic']] = self.__class__.magic
         build_array[build_map['signature']] = self.signature
         build_array[build_map['file_hash']] = self._file_hash
-        built = bytes(build_array)
-
-        # Send it to every storage provider.
-        StorageProvider.distribute(built, storage_providers, euid=self.euid)
-
-        # If successful, return the EUID (note that in this case, all of
-        # them should match).
-        return self.euid
+        return bytes(build_array)
 
     @classmethod
     def verify_public(cls, bites, euid=None):
@@ -2080,43 +4362,115 @@ class EICs(EICBase, SplitHashMap):
         return raw
 
     @classmethod
-    def fetch(cls, euid, sym_key, storage_providers):
+    def fetch(cls, euid, sym_key, storage_providers, lazy=False, hedge=None):
         ''' Loads an existing .eics file from an ordered list of storage 
-        providers using the specified key.
+        providers using the specified key. If hedge (a HedgePolicy) is 
+        given, the file and its parents are downloaded with hedged reads.
+
+        If lazy is True, only the inner header, heritage, manifest and ToC 
+        are decrypted up front; each value is decrypted (and checked 
+        against the ToC) the first time it's accessed. The file hash is 
+        still checked up front, since that's what authenticates the ToC.
         '''
         # Check the euid
         cls.check_euid(euid)
-        # Call super to get the party rollin'.
-        unpacked_public, unpacked_payload = \
-            super().fetch(euid, sym_key, storage_providers)
-        del sym_key
-        # Okay, grab a few things from the unpacked payload
-        d = unpacked_payload['content']
-        anteherits = unpacked_payload['anteherits']
-        inherits = unpacked_payload['inherits']
-
-        # Construct the object.
-        eics = cls(unpacked_public['author'], d=d, 
-                   euid=unpacked_public['euid'], mutable=False, 
-                   signature=unpacked_public['signature'])
+        if lazy:
+            bites = StorageProvider.poll_euid(euid, storage_providers, hedge)
+            eics, inherits = cls._open_lazy(bites, euid, sym_key)
+        else:
+            # Call super to get the party rollin'.
+            unpacked_public, unpacked_payload = \
+                super().fetch(euid, sym_key, storage_providers, hedge)
+            # Construct the object.
+            eics = cls._from_unpacked(unpacked_public, unpacked_payload)
+            inherits = unpacked_payload['inherits']
+            del unpacked_public, unpacked_payload
         # Verify the signature
         eics.verify_signature(storage_providers)
 
         # Now, and only now, resolve the file.
         # First get the parents.
-        for parent in unpacked_payload['inherits']:
+        for parent in inherits:
             # Note that this won't work once encryption is actually implemented
             # as the symmetric keys will differ. Needs to use an access 
             # provider.
-            unpacked_parent = eics.fetch(parent, sym_key, storage_providers)
+            unpacked_parent = eics.fetch(parent, sym_key, storage_providers,
+                                         lazy=lazy, hedge=hedge)
             eics.aggregate(unpacked_parent, prepend=True)
         # Any anteheriting EICs will need to individually call aggregate().
 
         # For a bit of added reassurance, delete stuff explicitly right meow
-        del unpacked_public, unpacked_payload
+        del sym_key
 
         # finally, return the eics
         return eics
+
+    @classmethod
+    async def fetch_async(cls, euid, sym_key, storage_providers, lazy=False):
+        ''' Coroutine equivalent of fetch() for AsyncStorageProviders. The
+        decryption and signature verification are run in an executor.
+        '''
+        cls.check_euid(euid)
+        if lazy:
+            bites = await AsyncStorageProvider.poll_euid(euid, 
+                                                         storage_providers)
+            eics, inherits = await _run_in_executor(cls._open_lazy, bites, 
+                                                    euid, sym_key)
+        else:
+            unpacked_public, unpacked_payload = \
+                await cls._fetch_async(euid, sym_key, storage_providers)
+            eics = cls._from_unpacked(unpacked_public, unpacked_payload)
+            inherits = unpacked_payload['inherits']
+            del unpacked_public, unpacked_payload
+        await eics._verify_signature_async(storage_providers)
+
+        # Same (depth-first) heritage resolution as fetch().
+        for parent in inherits:
+            unpacked_parent = await cls.fetch_async(parent, sym_key, 
+                                                    storage_providers, 
+                                                    lazy=lazy)
+            eics.aggregate(unpacked_parent, prepend=True)
+
+        del sym_key
+        return eics
+
+    @classmethod
+    def _from_unpacked(cls, unpacked_public, unpacked_payload):
+        ''' Builds the (not yet signature-verified) eics.
+        '''
+        return cls(unpacked_public['author'], d=unpacked_payload['content'], 
+                   euid=unpacked_public['euid'], mutable=False, 
+                   signature=unpacked_public['signature'])
+
+    @classmethod
+    def _open_lazy(cls, bites, euid, sym_key):
+        ''' Lazy counterpart to _open() and _from_unpacked(). Verifies 
+        the public parts of bites, and decrypts just enough of the payload
+        to build the (not yet signature-verified) eics around a 
+        _LazyContents. Returns a tuple of (eics, inherited euids).
+        '''
+        unpacked_public = VERIFIED_BLOB_CACHE.verify(cls, bites, euid=euid)
+        # Avoid copying the payload out of bites.
+        payload = memoryview(bites)[cls.header_bits['payload']]
+
+        fixed = cls._unlock_range(payload, sym_key, 0, cls.inner_fixed_offset)
+        slices = cls._unpack_inner_header(fixed)
+        # Everything else up to the contents goes in one go.
+        offset = slices['payload'].start
+        inner = fixed + cls._unlock_range(payload, sym_key, 
+                                          cls.inner_fixed_offset, offset)
+        inherits = cls._unpack_heritage(inner[slices['inheritance']])
+        manifest = cls._unpack_manifest(inner[slices['manifest']])
+        toc = cls._unpack_toc(inner[slices['toc']])
+
+        contents = _LazyContents(cls, payload, sym_key, toc, offset)
+        eics = cls(unpacked_public['author'], euid=unpacked_public['euid'], 
+                   mutable=False, signature=unpacked_public['signature'])
+        # Slot the manifest and the lazy contents in as our own mappings.
+        eics._split_keys.maps[0].update(manifest)
+        eics._split_values = TrackingChainMap(contents)
+        eics._split_values.track(0)
+        return eics, inherits
         
     def _resolve_ante(self):
         ''' WARNING: DEPRECATED. AND BROKEN. THIS WILL NOT WORK.
@@ -2205,21 +4559,18 @@ class EICs(EICBase, SplitHashMap):
         # Get pubkey from the storage providers
         # pubkey = self.key_resolver.fetch_pubkey(self.author, storage_providers)
         
-        # Catch any time we're an identity and need to bootstrap.
-        if self.author == AUTHOR_BOOTSTRAP:
-            pubkey = AUTHOR_BOOTSTRAP_PUBKEY
-        # Not an identity; proceed as usual.
-        else:
-            pubkey = EICs.fetch(self.author, AUTHOR_BOOTSTRAP_SYMKEY, 
-                                storage_providers)[b'pubkey']
-        # Whatever it is, load it up into a format we can use.
-        pubkey = serialization.load_pem_public_key(pubkey, 
-                                                backend=self.BACKEND)
-            
+        # The cache handles bootstrapping identities, too.
         # pubkey = EICs.fetch(self.author, access.IdentityAccessProvider(), 
                             # storage_providers)[b'pubkey']
 
-        return super().verify_signature(self.euid, pubkey, self._signature)
+        return self._check_signature(self.euid, self.author, 
+                                     self._signed_bytes(), self._signature, 
+                                     storage_providers)
+
+    def _signed_bytes(self):
+        ''' EICs signatures cover the euid.
+        '''
+        return self.euid
 
     def _pack_payload(self):
         ''' Generates unencrypted payload bytes from self.
@@ -2255,8 +4606,48 @@ class EICs(EICBase, SplitHashMap):
     def _unpack_payload(cls, bites):
         ''' Turns the payload into a handy dictionary.
         '''
-        # Predeclare unpacked; get the various lengths and process them.
+        # Predeclare unpacked; get the various slices.
         unpacked = {}
+        slices = cls._unpack_inner_header(bites)
+
+        # Okay, now actually extract the content
+        split_inner_header = {key: bites[value] for 
+                              key, value in slices.items()}
+
+        # And process it appropriately
+        unpacked['inherits'] = \
+            cls._unpack_heritage(split_inner_header['inheritance'])
+        unpacked['anteherits'] = \
+            cls._unpack_heritage(split_inner_header['anteheritance'])
+        # Get the manifest
+        manifest = cls._unpack_manifest(split_inner_header['manifest'])
+
+        # Turn the ToC into the payload
+        payload = {}
+        toc = cls._unpack_toc(split_inner_header['toc'])
+        # For every hash: slice pair
+        for address, partition in toc.items():
+            # Get the binary blob associated with this item on the toc
+            blob = split_inner_header['payload'][partition]
+            # Verify that the hash matches the toc
+            if cls._hash(blob) != address:
+                raise ValueError('Blob hash doesn\'t match the ToC hash. '
+                                 'Check data integrity.')
+            # Matches? Add to payload.
+            payload[address] = blob
+        # Okay, now join payload and the manifest into a single dict with key:
+        # content pairs
+        payload = cls._recursive_join(manifest, payload)
+        # Add it to unpacked
+        unpacked['content'] = payload
+
+        return unpacked
+
+    @classmethod
+    def _unpack_inner_header(cls, bites):
+        ''' Turns the fixed inner header at the start of the (unlocked) 
+        payload into a dictionary of slices for each part of the payload.
+        '''
         lengths = super()._unpack_payload(bites)
 
         # Unpack numeric values
@@ -2295,44 +4686,11 @@ class EICs(EICBase, SplitHashMap):
             slices.append(slice(my_start, my_end))
             offsets.append(my_end)
         # Convert to a dict
-        slices = {'inheritance': slices[0],
-                  'anteheritance': slices[1],
-                  'manifest': slices[2],
-                  'toc': slices[3],
-                  'payload': slices[4]}
-
-        # Okay, now actually extract the content
-        split_inner_header = {key: bites[value] for 
-                              key, value in slices.items()}
-
-        # And process it appropriately
-        unpacked['inherits'] = \
-            cls._unpack_heritage(split_inner_header['inheritance'])
-        unpacked['anteherits'] = \
-            cls._unpack_heritage(split_inner_header['anteheritance'])
-        # Get the manifest
-        manifest = cls._unpack_manifest(split_inner_header['manifest'])
-
-        # Turn the ToC into the payload
-        payload = {}
-        toc = cls._unpack_toc(split_inner_header['toc'])
-        # For every hash: slice pair
-        for address, partition in toc.items():
-            # Get the binary blob associated with this item on the toc
-            blob = split_inner_header['payload'][partition]
-            # Verify that the hash matches the toc
-            if cls._hash(blob) != address:
-                raise ValueError('Blob hash doesn\'t match the ToC hash. '
-                                 'Check data integrity.')
-            # Matches? Add to payload.
-            payload[address] = blob
-        # Okay, now join payload and the manifest into a single dict with key:
-        # content pairs
-        payload = cls._recursive_join(manifest, payload)
-        # Add it to unpacked
-        unpacked['content'] = payload
-
-        return unpacked
+        return {'inheritance': slices[0],
+                'anteheritance': slices[1],
+                'manifest': slices[2],
+                'toc': slices[3],
+                'payload': slices[4]}
 
     @classmethod
     def _unpack_toc(cls, bites):
@@ -2387,7 +4745,7 @@ class EICs(EICBase, SplitHashMap):
         # Iterate over each "row" based on the class "row" length
         for ii in range(0, int(len(bites) / cls.heritage_row_length)):
             offset = ii * cls.heritage_row_length
-            partition = slice(offset, offset + heritage_row_length)
+            partition = slice(offset, offset + cls.heritage_row_length)
             heritage.append(bites[partition])
 
         # Might need to reverse them at some point?
@@ -0,0 +1,453 @@
+'''
+LICENSING
+-------------------------------------------------
+
+pyEIC: A python library for EIC manipulation.
+    Copyright (C) 2014-2015 Nicholas Badger
+    badg@nickbadger.com
+    nickbadger.com
+
+    This library is free software; you can redistribute it and/or
+    modify it under the terms of the GNU Lesser General Public
+    License as published by the Free Software Foundation; either
+    version 2.1 of the License, or (at your option) any later version.
+
+    This library is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+    Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public
+    License along with this library; if not, write to the Free Software
+    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301
+    USA
+
+------------------------------------------------------
+
+Erasure-coded distribution of EIC files across storage providers.
+
+A file is split into k data shards, and n - k parity shards are added,
+such that any k of the n shards can rebuild it (systematic Reed-Solomon
+over GF(256), using a Cauchy matrix for the parity rows). Each shard is
+stored as its own object, addressed by shard_address(euid, index), so
+that it can be found from the euid alone.
+
+Shard layout:
+    magic           [0:4]       b'eicx'
+    euid            [4:68]      euid of the complete file
+    index           [68:69]     shard index, 0 <= index < n
+    k               [69:70]     shards needed to rebuild
+    n               [70:71]     total number of shards
+    length          [71:79]     length of the complete file (>Q)
+    data_hash       [79:143]    SHA-512 of the shard data
+    data            [143:]
+'''
+
+# Import the base package
+from .core import StorageProvider
+from .core import EICBase
+from .core import EICs
+
+# Global dependencies that aren't here because I'm being lazy
+import struct
+import threading
+import itertools
+import concurrent.futures
+
+
+magic = b'eicx'
+header_size = 143
+
+header_bits = {}
+header_bits['magic'] = slice(0, 4)
+header_bits['euid'] = slice(4, 68)
+header_bits['index'] = slice(68, 69)
+header_bits['k'] = slice(69, 70)
+header_bits['n'] = slice(70, 71)
+header_bits['length'] = slice(71, 79)
+header_bits['data_hash'] = slice(79, 143)
+header_bits['data'] = slice(header_size, None)
+
+
+# -----------------------------------------------------------------------------
+# GF(256) arithmetic, over the usual x^8 + x^4 + x^3 + x^2 + 1 polynomial.
+# -----------------------------------------------------------------------------
+
+_EXP = [0] * 512
+_LOG = [0] * 256
+_value = 1
+for _power in range(255):
+    _EXP[_power] = _value
+    _LOG[_value] = _power
+    _value <<= 1
+    if _value & 0x100:
+        _value ^= 0x11d
+for _power in range(255, 512):
+    _EXP[_power] = _EXP[_power - 255]
+del _value, _power
+
+# coefficient: bytes.translate table for multiplying by it
+_MUL_TABLES = {}
+_MUL_TABLES_LOCK = threading.Lock()
+
+
+def _gf_mul(a, b):
+    if not a or not b:
+        return 0
+    return _EXP[_LOG[a] + _LOG[b]]
+
+
+def _gf_inv(a):
+    if not a:
+        raise ZeroDivisionError('Zero has no inverse in GF(256).')
+    return _EXP[255 - _LOG[a]]
+
+
+def _mul_table(coefficient):
+    ''' Returns the bytes.translate table that multiplies every byte by
+    coefficient, so that whole shards can be multiplied at C speed.
+    '''
+    try:
+        return _MUL_TABLES[coefficient]
+    except KeyError:
+        pass
+    table = bytes(_gf_mul(coefficient, byte) for byte in range(256))
+    with _MUL_TABLES_LOCK:
+        _MUL_TABLES[coefficient] = table
+    return table
+
+
+def _combine(coefficients, shards, size):
+    ''' Returns the GF(256) linear combination of the (equal length)
+    shards. Addition is XOR, which we do on whole shards at once by way of
+    ints.
+    '''
+    accumulated = 0
+    for coefficient, shard in zip(coefficients, shards):
+        if not coefficient:
+            continue
+        if coefficient != 1:
+            shard = shard.translate(_mul_table(coefficient))
+        accumulated ^= int.from_bytes(shard, 'big')
+    return accumulated.to_bytes(size, 'big')
+
+
+def _encoding_row(index, k):
+    ''' Returns row index of the systematic encoding matrix: the identity
+    for the first k (data) rows, and then Cauchy rows for the parity.
+    '''
+    if index < k:
+        return [int(column == index) for column in range(k)]
+    return [_gf_inv(index ^ column) for column in range(k)]
+
+
+def _invert(matrix):
+    ''' Inverts a square GF(256) matrix by Gauss-Jordan elimination.
+    '''
+    size = len(matrix)
+    work = [list(row) + [int(column == ii) for column in range(size)]
+            for ii, row in enumerate(matrix)]
+    for column in range(size):
+        pivot = next((row for row in range(column, size)
+                      if work[row][column]), None)
+        if pivot is None:
+            raise ValueError('Singular matrix.')
+        work[column], work[pivot] = work[pivot], work[column]
+        scale = _gf_inv(work[column][column])
+        work[column] = [_gf_mul(scale, value) for value in work[column]]
+        for row in range(size):
+            factor = work[row][column]
+            if row != column and factor:
+                work[row] = [value ^ _gf_mul(factor, pivot_value)
+                             for value, pivot_value in
+                             zip(work[row], work[column])]
+    return [row[size:] for row in work]
+
+
+# -----------------------------------------------------------------------------
+# Encoding and decoding
+# -----------------------------------------------------------------------------
+
+def _check_parameters(k, n):
+    if not 1 <= k <= n <= 255:
+        raise ValueError('Need 1 <= k <= n <= 255.')
+
+
+def shard_address(euid, index):
+    ''' Returns the address that shard index of the file euid is stored
+    under.
+    '''
+    return EICBase._hash(magic + euid + bytes([index]))
+
+
+def encode(bites, euid, k, n):
+    ''' Splits bites (the complete file with the given euid) into n
+    shards, any k of which can rebuild it. Returns a list of the packed
+    shards, in index order.
+    '''
+    _check_parameters(k, n)
+    bites = bytes(bites)
+    length = len(bites)
+    # Round up, and pad out the last data shard with zeroes.
+    size = max(-(-length // k), 1)
+    padded = bites.ljust(size * k, b'\x00')
+    data = [padded[ii * size:(ii + 1) * size] for ii in range(k)]
+
+    shards = []
+    for index in range(n):
+        if index < k:
+            shard = data[index]
+        else:
+            shard = _combine(_encoding_row(index, k), data, size)
+        shards.append(_pack_shard(euid, index, k, n, length, shard))
+    return shards
+
+
+def decode(shards):
+    ''' Rebuilds the complete file from (at least) k verified, unpacked
+    shards (as from unpack_shard) of the same file. Does NOT check the
+    result against the euid.
+    '''
+    by_index = {}
+    for shard in shards:
+        by_index.setdefault(shard['index'], shard)
+    some_shard = next(iter(by_index.values()))
+    k = some_shard['k']
+    length = some_shard['length']
+    if len(by_index) < k:
+        raise ValueError('Need at least ' + str(k) + ' distinct shards.')
+
+    # Prefer the data shards, since they don't need any arithmetic.
+    indices = sorted(by_index)[:k]
+    chosen = [by_index[index]['data'] for index in indices]
+    size = len(chosen[0])
+
+    if indices == list(range(k)):
+        data = chosen
+    else:
+        inverse = _invert([_encoding_row(index, k) for index in indices])
+        data = [_combine(row, chosen, size) for row in inverse]
+
+    return b''.join(data)[:length]
+
+
+def _pack_shard(euid, index, k, n, length, data):
+    return (magic + euid + bytes([index, k, n]) + struct.pack('>Q', length) +
+            EICBase._hash(data) + data)
+
+
+def unpack_shard(bites):
+    ''' Unpacks and verifies a shard, returning a dictionary of its
+    fields (plus its 'address'). Raises RuntimeError if it's malformed or
+    its data doesn't match its hash.
+    '''
+    if len(bites) < header_size or bites[header_bits['magic']] != magic:
+        raise RuntimeError('Malformed EIC shard.')
+    unpacked = {'euid': bytes(bites[header_bits['euid']]),
+                'index': bites[68],
+                'k': bites[69],
+                'n': bites[70],
+                'length': struct.unpack('>Q', bites[header_bits['length']])[0],
+                'data': bytes(bites[header_bits['data']])}
+    k, n, index = unpacked['k'], unpacked['n'], unpacked['index']
+    if not 1 <= k <= n or index >= n:
+        raise RuntimeError('Malformed EIC shard.')
+    if -(-unpacked['length'] // k) != len(unpacked['data']) and \
+            unpacked['length']:
+        raise RuntimeError('Malformed EIC shard.')
+    if EICBase._hash(unpacked['data']) != bytes(bites[header_bits['data_hash']]):
+        raise RuntimeError('Mismatched shard hash, check shard integrity.')
+    unpacked['address'] = shard_address(unpacked['euid'], index)
+    return unpacked
+
+
+def matches_address(bites, address):
+    ''' Checks that bites are an intact copy of whatever is stored under 
+    address: either a shard with that shard address, or an EIC file with
+    that euid (as per EICBase.matches_euid). Returns True or False.
+    '''
+    try:
+        if bites[header_bits['magic']] == magic:
+            return unpack_shard(bites)['address'] == address
+    except (RuntimeError, TypeError, ValueError):
+        return False
+    return EICBase.matches_euid(bites, address)
+
+
+# -----------------------------------------------------------------------------
+# Distribution
+# -----------------------------------------------------------------------------
+
+def distribute_coded(bites, storage_providers, k, n, euid=None):
+    ''' Erasure-coded counterpart to StorageProvider.distribute(). Splits
+    the file into n shards, any k of which can rebuild it, and uploads
+    shard i to storage provider i % len(storage_providers). If the euid
+    isn't supplied, it's read (and checked) from the file. Returns the
+    euid.
+    '''
+    # Placement depends on the order, so it mustn't change between calls.
+    storage_providers = StorageProvider.every(storage_providers)
+    if not storage_providers:
+        raise ValueError('Need at least one storage provider.')
+    if euid is None:
+        euid = bytes(bites[EICs.header_bits['file_hash']])
+    if not EICBase.matches_euid(bites, euid):
+        raise RuntimeError('File doesn\'t match its euid.')
+
+    shards = encode(bites, euid, k, n)
+    # Group the shards by provider, so each gets a single batch.
+    batches = {}
+    for index, shard in enumerate(shards):
+        batches.setdefault(index % len(storage_providers), []).append(
+            (shard_address(euid, index), shard))
+
+    for ii, batch in batches.items():
+        StorageProvider.distribute_many(
+            [shard for __, shard in batch], [storage_providers[ii]],
+            euids=[address for address, __ in batch])
+    return euid
+
+
+def poll_euid_coded(euid, storage_providers, n, repair=False, 
+                    max_attempts=4096):
+    ''' Erasure-coded counterpart to StorageProvider.poll_euid(). Requests
+    all n shards of the euid in parallel (each from its home provider
+    first, then the others), rebuilds the file as soon as enough valid
+    shards have arrived, checks it against the euid, and returns it.
+
+    A shard's own hash only shows that it's intact, not that it belongs 
+    to the file, so a rebuild can fail on a bogus (but self-consistent) 
+    shard. If it does, other subsets of the shards are tried as they 
+    arrive, and failing that, every copy of every shard is fetched from 
+    every provider and tried. max_attempts caps the work done in all, 
+    counting both the subsets of shards considered and the decodes. If 
+    repair is True, providers found holding bogus shards have them 
+    replaced (through delete() and upload()) with the right ones.
+
+    Raises RuntimeError if the file can't be rebuilt.
+    '''
+    # Placement depends on the order, so it mustn't change between calls.
+    storage_providers = StorageProvider.every(storage_providers)
+    if not storage_providers:
+        raise ValueError('Need at least one storage provider.')
+    # index: list of distinct copies, as (shard, [providers holding it])
+    candidates = {}
+    attempts = [max_attempts]
+
+    def fetch(storage_provider, index):
+        try:
+            bites = storage_provider.download(shard_address(euid, index))
+            if not bites:
+                return None
+            shard = unpack_shard(bites)
+        except Exception:
+            return None
+        if shard['euid'] == euid and shard['index'] == index:
+            return shard
+        return None
+
+    def fetch_shard(index):
+        ''' Gets a valid copy of shard index from whoever has it. '''
+        start = index % len(storage_providers)
+        for storage_provider in (storage_providers[start:] +
+                                 storage_providers[:start]):
+            shard = fetch(storage_provider, index)
+            if shard is not None:
+                return index, [(shard, [storage_provider])]
+        return index, []
+
+    def fetch_copies(index):
+        ''' Gets every distinct valid copy of shard index. '''
+        copies = {}
+        for storage_provider in storage_providers:
+            shard = fetch(storage_provider, index)
+            if shard is not None:
+                copies.setdefault(shard['data'], (shard, []))[1].append(
+                    storage_provider)
+        return index, list(copies.values())
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=n)
+    try:
+        futures = [executor.submit(fetch_shard, index) for index in range(n)]
+        for future in concurrent.futures.as_completed(futures):
+            index, copies = future.result()
+            if not copies:
+                continue
+            candidates[index] = copies
+            rebuilt = _rebuild(candidates, euid, attempts, newest=index)
+            if rebuilt is not None:
+                break
+        else:
+            # Something's lying to us. Look at everybody's copies.
+            futures = [executor.submit(fetch_copies, index) 
+                       for index in range(n)]
+            for future in concurrent.futures.as_completed(futures):
+                index, copies = future.result()
+                if copies:
+                    candidates[index] = copies
+            rebuilt = _rebuild(candidates, euid, attempts)
+    finally:
+        # Stragglers can't be interrupted, but we don't have to wait.
+        executor.shutdown(wait=False)
+
+    if rebuilt is None:
+        raise RuntimeError('Failed to rebuild the given euid from the shards '
+                           'at the given storage providers.')
+    bites, k = rebuilt
+    if repair:
+        _repair(bites, euid, k, n, candidates)
+    return bites
+
+
+def _rebuild(candidates, euid, attempts, newest=None):
+    ''' Tries to rebuild the file from k of the candidate shards (as 
+    collected by poll_euid_coded), preferring data shards. If newest is
+    given, only subsets including it are tried (the others already have 
+    been). attempts is a single-item list holding what's left of the 
+    budget, which every subset considered and every decode tried costs 
+    one of. Returns a tuple of (file, k), or None.
+    '''
+    indices = sorted(candidates)
+    others = [index for index in indices if index != newest]
+    # A bogus shard could lie about k, too.
+    for k in sorted(set(shard['k'] for copies in candidates.values() 
+                        for shard, __ in copies)):
+        if newest is None:
+            subsets = itertools.combinations(indices, k)
+        else:
+            subsets = (tuple(sorted(rest + (newest,))) for rest 
+                       in itertools.combinations(others, k - 1))
+        for subset in subsets:
+            if attempts[0] <= 0:
+                return None
+            attempts[0] -= 1
+            for choice in itertools.product(*(candidates[index] 
+                                              for index in subset)):
+                if attempts[0] <= 0:
+                    return None
+                attempts[0] -= 1
+                try:
+                    bites = decode([shard for shard, __ in choice])
+                except (ValueError, OverflowError):
+                    continue
+                if EICBase.matches_euid(bites, euid):
+                    return bites, k
+    return None
+
+
+def _repair(bites, euid, k, n, candidates):
+    ''' Replaces every bogus shard copy seen while rebuilding with the 
+    right one. Providers that don't support deletion are skipped.
+    '''
+    shards = encode(bites, euid, k, n)
+    for index, copies in candidates.items():
+        right = shards[index]
+        for shard, storage_providers in copies:
+            if shard['data'] == right[header_bits['data']]:
+                continue
+            for storage_provider in storage_providers:
+                try:
+                    storage_provider.delete(shard_address(euid, index))
+                    storage_provider.upload(right)
+                except Exception:
+                    pass
@@ -27,22 +27,176 @@ pyEIC: A python library for EIC manipulation.
 
 # Import the base package
 from .core import *
+from . import erasure
 
 # Global dependencies that aren't here because I'm being lazy
+import abc
 import base64
 import struct
 import os
 import errno
 from collections import deque
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.backends import default_backend
+import mmap
+import bisect
+import sqlite3
+import tempfile
+import contextlib
+import threading
+import time
+import collections
+import concurrent.futures
+import itertools
 
-class MemoryStore(StorageProvider):
-    ''' A storage provider contained within a python object. 
+
+def _atomic_write(path, data):
+    ''' Writes data to path atomically, by way of a temporary file in the 
+    same directory that gets fsync'd and then renamed over path.
+    '''
+    directory = os.path.dirname(path)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as outfile:
+            outfile.write(data)
+            outfile.flush()
+            os.fsync(outfile.fileno())
+        os.replace(temp_path, path)
+    except:
+        # Don't leave the partial file lying around.
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _chain_frames(partials):
+    ''' Orders the public values of EICd frames (all from the same 
+    dynamic reference) along their previous_hash chain. Returns them as a 
+    list from most recent [0] to oldest [n]. The oldest frame doesn't need
+    to be the zeroth one, since older frames may have been evicted, but 
+    the frames must form a single unbroken chain, or RuntimeError is 
+    raised.
+    '''
+    partials = list(partials)
+    file_hashes = set(partial['file_hash'] for partial in partials)
+    # previous_hash: frame
+    successors = {}
+    for partial in partials:
+        if partial['previous_hash'] in successors:
+            raise RuntimeError('Forked hash chain.')
+        successors[partial['previous_hash']] = partial
+
+    # The oldest frame is the only one whose predecessor isn't here.
+    oldest = [partial for partial in partials 
+              if partial['previous_hash'] not in file_hashes]
+    if len(oldest) != 1:
+        raise RuntimeError('Broken hash chain.')
+
+    ordered = [oldest[0]]
+    while ordered[-1]['file_hash'] in successors:
+        ordered.append(successors[ordered[-1]['file_hash']])
+    if len(ordered) != len(partials):
+        raise RuntimeError('Broken hash chain.')
+
+    ordered.reverse()
+    return ordered
+
+
+class LocalStore(StorageProvider):
+    ''' Base class for storage providers that keep their own copies of 
+    objects, and therefore need to verify and do bookkeeping on everything
+    uploaded to them. 
+
+    Subclasses supply the actual storage through the _has, _get, _put and 
+    _discard hooks. Dynamic (EICd) bookkeeping is kept in 
+    self._dynamic_bookie, a dict of dynamic reference: deque of file hashes,
+    from most recent [0] to oldest [n]; subclasses that need to persist it
+    should extend _save_frames.
     '''
     def __init__(self):
-        self.store = {}
         self._dynamic_bookie = {}
+        # Guards the dynamic bookkeeping against concurrent uploads
+        self._lock = threading.RLock()
+        self._subscriptions = []
+        self._subscriptions_lock = threading.Lock()
+        # Numbers the frames we accept, in order, for the subscribers
+        self._accepted = 0
+
+    @abc.abstractmethod
+    def _has(self, euid):
+        ''' Returns True if the euid is stored.
+        '''
+        pass
+
+    @abc.abstractmethod
+    def _get(self, euid):
+        ''' Returns the stored bites (or some other buffer) for the euid, 
+        or None if it isn't stored.
+        '''
+        pass
+
+    @abc.abstractmethod
+    def _put(self, euid, bites):
+        ''' Stores (already-verified) bites under euid.
+        '''
+        pass
+
+    @abc.abstractmethod
+    def _discard(self, euid):
+        ''' Removes the euid, if stored.
+        '''
+        pass
+
+    def _frames(self, dynamic_ref):
+        ''' Returns the frame deque for dynamic_ref, or None if unknown.
+        '''
+        return self._dynamic_bookie.get(dynamic_ref)
+
+    def _save_frames(self, dynamic_ref, buffr):
+        ''' Records the frame deque for dynamic_ref.
+        '''
+        self._dynamic_bookie[dynamic_ref] = buffr
+
+    def _forget_frames(self, dynamic_ref):
+        ''' Drops the frame deque for dynamic_ref (but not the frames).
+        '''
+        self._dynamic_bookie.pop(dynamic_ref, None)
+
+    def _euids(self, prefix=b''):
+        ''' Returns an iterable of every stored euid starting with prefix.
+        Subclasses that can enumerate their storage should override this.
+        '''
+        raise NotImplementedError('This store can\'t enumerate its objects.')
+
+    def _references(self, prefix=b''):
+        ''' Returns an iterable of every known dynamic reference starting 
+        with prefix.
+        '''
+        return [dynamic_ref for dynamic_ref in list(self._dynamic_bookie) 
+                if dynamic_ref.startswith(prefix)]
+
+    def iter_euids(self, prefix=b''):
+        ''' Yields every stored euid starting with prefix.
+        '''
+        yield from self._euids(prefix)
+
+    def iter_references(self, prefix=b''):
+        ''' Yields every known dynamic reference starting with prefix.
+        '''
+        yield from self._references(prefix)
+
+    def delete(self, address):
+        ''' Removes the euid, or the dynamic reference along with all of
+        its frames.
+        '''
+        with self._lock:
+            frames = self._frames(address)
+            if frames is None:
+                self._discard(address)
+                return
+            self._forget_frames(address)
+            for euid in frames:
+                self._discard(euid)
 
     def ping(self, address):
         ''' Checks self for the address (euid or dynamic reference).
@@ -53,142 +207,356 @@ class MemoryStore(StorageProvider):
         False if not found
         '''
         # Is it an euid?
-        if address in self.store:
+        if self._has(address):
             return b's'
         # Is it a dynamic reference?
-        elif address in self._dynamic_bookie:
+        elif self._frames(address) is not None:
             return b'd'
-        # It's neither?
+        # It's neither? Then we don't have it.
         else:
-            raise TypeError('Address appears to be neither an euid nor a '
-                            'dynamic reference.')
+            return False
 
     def upload(self, bites):
-        ''' Stores the object.
+        ''' Verifies and stores the object. Uploading an object that is 
+        already stored is a no-op.
+        '''
+        held = self._held(bites)
+        if held is not None:
+            return held
+
+        euid, partial = self._verify(bites)
+        return self._accept(euid, bites, partial)
+
+    def _accept(self, euid, bites, partial):
+        ''' Stores an object that has already passed _verify(), which 
+        returned euid and partial. Returns the euid.
+        '''
+        # Static objects need no further bookkeeping.
+        if partial is None:
+            if not self._has(euid):
+                self._put(euid, bites)
+            return euid
+
+        # Dynamic objects must be stored and recorded together.
+        with self._lock:
+            try:
+                buffr, evicted = self._next_frames(partial)
+            except Exception:
+                raise RuntimeError('Failed to verify EICd.')
+
+            self._record_frame(euid, bites, partial, buffr, evicted)
+            seq = self._sequence()
+
+        self._publish(partial['header_hash'], euid, seq)
+        # Return the euid as verification of success
+        return euid
+
+    def upload_frames(self, blobs):
+        ''' Verifies and stores a run of EICd frames, oldest first. The 
+        first frame we see for a dynamic reference we don't know yet is 
+        adopted as its oldest frame, even if it isn't the zeroth one. Each
+        frame's signature is still checked, but nothing can vouch for the 
+        adopted frame being recent, so only use this with trusted sources.
+        '''
+        euids = []
+        for bites in blobs:
+            held = self._held(bites)
+            if held is not None:
+                euids.append(held)
+                continue
+
+            euid, partial = self._verify(bites)
+            if partial is None:
+                raise RuntimeError('Not an EICd frame.')
+            with self._lock:
+                adopt = self._frames(partial['header_hash']) is None
+                try:
+                    buffr, evicted = self._next_frames(partial, adopt)
+                except Exception:
+                    raise RuntimeError('Failed to verify EICd.')
+                self._record_frame(euid, bites, partial, buffr, evicted)
+                seq = self._sequence()
+
+            self._publish(partial['header_hash'], euid, seq)
+            euids.append(euid)
+        return euids
+
+    def subscribe(self, dynamic_refs=None, callback=None):
+        ''' Subscribes to new frames for the dynamic references (or all 
+        of them, if dynamic_refs is None). Returns a Subscription.
+        '''
+        subscription = Subscription(dynamic_refs, callback, 
+                                    on_close=self._unsubscribe)
+        with self._subscriptions_lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        with self._subscriptions_lock:
+            try:
+                self._subscriptions.remove(subscription)
+            except ValueError:
+                pass
+
+    def _sequence(self):
+        ''' Returns the sequence number for a frame that was just accepted.
+        Call with the lock held.
+        '''
+        self._accepted += 1
+        return self._accepted
+
+    def _publish(self, dynamic_ref, file_hash, seq):
+        ''' Tells every interested subscriber about a new frame. Happens 
+        after the lock is released, so seq (from _sequence()) is what lets
+        the subscribers put racing publishes back in order.
+        '''
+        with self._subscriptions_lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            if subscription.wants(dynamic_ref):
+                subscription.publish(dynamic_ref, file_hash, seq)
+
+    def _record_frame(self, euid, bites, partial, buffr, evicted):
+        ''' Stores a verified EICd frame and updates the bookkeeping. 
+        Called with the lock held.
+        '''
+        # Store the file first, so that the bookkeeping never points at
+        # something we don't have.
+        if not self._has(euid):
+            self._put(euid, bites)
+        self._save_frames(partial['header_hash'], buffr)
+        for old_euid in evicted:
+            self._discard(old_euid)
+
+    def _held(self, bites):
+        ''' If an identical copy of bites is already stored, returns its 
+        euid (without re-verifying anything). Otherwise, returns None.
+        '''
+        try:
+            euid = bytes(bites[EICs.header_bits['file_hash']])
+        except (TypeError, ValueError):
+            return None
+        stored = self._get(euid)
+        # Note that the file hash doesn't cover the signature, so we need
+        # to compare everything.
+        if stored is not None and (stored is bites or stored == bites):
+            return euid
+        return None
+
+    def download(self, euid):
+        ''' Retrieves an object. If the object does not exist, return None.
+        Other errors will not be caught.
+        '''
+        return self._get(euid)
+
+    def head(self, dynamic_ref):
+        ''' Returns the most recent frame of the dynamic reference, or 
+        None if we don't know it.
+        '''
+        frames = self._frames(dynamic_ref)
+        if not frames:
+            return None
+        return frames[0]
+
+    def list_frames_since(self, dynamic_ref, known_head):
+        ''' Returns the frames more recent than known_head, from most 
+        recent [0] to oldest [n], stopping as soon as known_head is found.
+        Returns None if we don't know the dynamic reference.
+        '''
+        frames = self._frames(dynamic_ref)
+        if frames is None:
+            return None
+        newer = []
+        for frame in frames:
+            if frame == known_head:
+                break
+            newer.append(frame)
+        return newer
+
+    def download_range(self, euid, offset, length):
+        ''' Retrieves part of an object, without copying it where 
+        possible. If the object does not exist, return None.
+        '''
+        return self._get_range(euid, offset, length)
+
+    def download_ranges(self, ranges):
+        ''' Retrieves many (euid, offset, length) ranges at once, as a 
+        list in the same order. Missing objects give None.
+        '''
+        return [self._get_range(euid, offset, length) 
+                for euid, offset, length in ranges]
+
+    def _get_range(self, euid, offset, length):
+        ''' Returns part of the stored object, or None if it isn't stored.
+        By default, slices a memoryview of whatever _get returns.
+        '''
+        bites = self._get(euid)
+        if bites is None:
+            return None
+        return memoryview(bites)[offset:offset + length]
+
+    def list_frames(self, dynamic_ref):
+        '''Looks through the record of dynamic objects, finds the corresponding
+        dynamic reference, and then returns a list of relevant frames, sorted
+        from most recent [0] to oldest [n].
+        '''
+        # First make sure we have it.
+        frames = self._frames(dynamic_ref)
+        if frames is None:
+            raise RuntimeError('This store has no EICd files with a matching '
+                               'dynamic reference.')
+
+        # Now, like, do that shit.
+        return list(frames)
+
+    def _verify(self, bites):
+        ''' Verifies an incoming object as far as we're able to. Returns a 
+        tuple of (euid, partial), where partial is the dictionary of public 
+        EICd values for dynamic files, and None for static files.
         '''
         # Check the appropriate bytes for the magic number, then do some
         # checking before storing the file.
         if bites[EICa.header_bits['magic']] == EICa.magic:
             # It's an EICa. Verify what we can and extract the EUID.
             try:
-                euid = EICa.verify_public(bites)['euid']
+                euid = VERIFIED_BLOB_CACHE.verify(EICa, bites)['euid']
                 # Cannot verify signature without the private key.
             except:
                 raise RuntimeError('Failed to verify EICa.')
+            return euid, None
 
         elif bites[EICs.header_bits['magic']] == EICs.magic:
             # It's an EICs. Verify what we can and extract the EUID.
             try:
-                euid = EICs.verify_public(bites)['euid']
+                euid = VERIFIED_BLOB_CACHE.verify(EICs, bites)['euid']
             except:
                 raise RuntimeError('Failed to verify EICs.')
-
+            return euid, None
 
         elif bites[EICd.header_bits['magic']] == EICd.magic:
             # It's a dynamic file. First verify.
-            # This needs a serious refactor at some point.
             try:
                 # Verify the public parts, returning dict
-                partial = EICd.verify_public(bites)
-                # Get the pubkey
-                # Danger! This will be an issue if the pubkey format or crypto
-                # API ever changes.
-                pubkey = EICs.fetch(partial['author'], AUTHOR_BOOTSTRAP_SYMKEY,
-                    [self])[b'pubkey']
-                pubkey = serialization.load_pem_public_key(
-                    pubkey,
-                    backend=default_backend()
-                )
+                partial = VERIFIED_BLOB_CACHE.verify(EICd, bites)
                 # Grab the euid
                 euid = partial['euid']
-                # Verify the signature
-                if not EICBase.verify_signature(euid, pubkey, 
-                        partial['signature']):
+                # Verify the signature (resolving the pubkey through us)
+                # Danger! This will be an issue if the pubkey format or crypto
+                # API ever changes.
+                if not EICBase._check_signature(euid, partial['author'], euid,
+                        partial['signature'], self._identity_providers()):
                     raise RuntimeError('Signature verficiation failed.')
+            except:
+                raise RuntimeError('Failed to verify EICd.')
+            return euid, partial
 
-                # Okay, everything looks good. Add it to self._dynamic_bookie
+        elif bites[erasure.header_bits['magic']] == erasure.magic:
+            # It's a shard of an erasure-coded file. Store it as a static
+            # object under its shard address.
+            try:
+                euid = erasure.unpack_shard(bites)['address']
+            except:
+                raise RuntimeError('Failed to verify EIC shard.')
+            return euid, None
 
-                # First find out how many buffer frames are requested
-                buffer_req = partial['buffer_req']
-                # Get the reference hash
-                half_euid = partial['header_hash']
+        else:
+            # It's neither. Error.
+            raise RuntimeError('Malformed EIC file: bad magic.')
 
-                # Todo:
+    def _identity_providers(self):
+        ''' Returns the storage providers used to look up author 
+        identities while verifying uploads. By default, just ourselves.
+        '''
+        return [self]
 
-                # WE NEED TO FIRST CHECK TO MAKE SURE THAT THE PREVIOUS HASH
-                # MATCHES THE EXPECTED VALUE! Otherwise we're creating a 
-                # vulnerability by updating the buffer size prematurely
+    def _next_frames(self, partial, adopt=False):
+        ''' Works out the new frame deque for the dynamic reference once 
+        the (verified) EICd frame described by partial is added. Does not 
+        modify anything. Returns a tuple of (new deque, list of evicted 
+        euids). If adopt is True and the dynamic reference is new to us, 
+        the frame may start the deque without being the zeroth frame.
+        '''
+        # First find out how many buffer frames are requested
+        buffer_req = partial['buffer_req']
+        # Get the reference hash
+        dynamic_ref = partial['header_hash']
+        evicted = []
 
-                # WE NEED TO IMPLEMENT DELETION OF OLD EICD FILES IN THE STORE
-                # UPON RESIZING THE BUFFER REQUEST. Currently any downsized
-                # EICd files are left as rotting entropic orphans.
+        # Check if it's already known to us
+        existing = self._frames(dynamic_ref)
+        if existing is not None:
+            # Copy it, so that a failure can't leave it half-modified. Most
+            # recent frames are on the left, so if the buffer request has 
+            # shrunk, the oldest frames fall off the right.
+            frames = list(existing)
+            buffr = deque(frames[:buffer_req], maxlen=buffer_req)
+            evicted.extend(frames[buffer_req:])
+            # The most recent file hash is the expected previous hash
+            check_previous = frames[0]
+        # It doesn't exist, so create it.
+        else:
+            check_previous = partial['previous_hash'] if adopt else dynamic_ref
+            buffr = deque(maxlen=buffer_req)
 
-                # Check if it's already known to us
-                try:
-                    buffr = self._dynamic_bookie[half_euid]
-                    # If the buffer request has changed, we need to copy the
-                    # buffer deque
-                    if buffr.maxlen != buffer_req:
-                        buffr = deque(buffr, maxlen=buffer_req)
-                    # Grab the last file hash for checking order
-                    check_previous = buffr[len(buffr) - 1]
-
-                # Can't find the key, so it doesn't exist, so create it.
-                except KeyError:
-                    check_previous = half_euid
-                    buffr = deque(maxlen=buffer_req)
-
-                # Make sure that the incoming EICd has the expected previous
-                if partial['previous_hash'] != check_previous:
-                    raise RuntimeError('Broken hash chain. Check parent EICd '
-                                       'order.')
-
-                # We've verified that this is, in fact, the next one up, so
-                # let's have a go at recording it.
-                # One last thing, before we go, go: if we're at the max length
-                # we can also delete the corresponding file from the store.
-                if len(buffr) == buffr.maxlen:
-                    # The previous 
-                    leftmost_euid = buffr.popleft() + half_euid
-                    del self.store[leftmost_euid]
-                buffr.appendleft(partial['file_hash'])
-                self._dynamic_bookie[half_euid] = buffr
+        # Make sure that the incoming EICd has the expected previous
+        if partial['previous_hash'] != check_previous:
+            raise RuntimeError('Broken hash chain. Check parent EICd '
+                               'order.')
 
-            except:
-                raise RuntimeError('Failed to verify EICd.')
+        # We've verified that this is, in fact, the next one up, so let's 
+        # have a go at recording it. If we're at the max length, the oldest
+        # frame's file can go, too.
+        if buffr.maxlen and len(buffr) == buffr.maxlen:
+            evicted.append(buffr.pop())
+        buffr.appendleft(partial['file_hash'])
 
-        else:
-            # It's neither. Error.
-            raise RuntimeError('Malformed EIC file: bad magic.')
+        return buffr, evicted
 
-        # Validation complete. Store it if we don't already have it.
-        if euid not in self.store:
-            self.store[euid] = bites
 
-        # Return the euid as verification of success
-        return euid
+class MemoryStore(LocalStore):
+    ''' A storage provider contained within a python object. 
+    '''
+    # Map of write_to_disk extensions to EIC classes (None for shards of 
+    # erasure-coded files)
+    _disk_extensions = {'.eica': EICa, '.eics': EICs, '.eicd': EICd, 
+                        '.eicx': None}
 
-    def download(self, euid):
-        ''' Retrieves an object. If the object does not exist, return None.
-        Other errors will not be caught.
-        '''
-        try:
-            return self.store[euid]
-        except KeyError:
-            return None
+    def __init__(self):
+        super().__init__()
+        self.store = {}
 
-    def list_frames(self, dynamic_ref):
-        '''Looks through the record of dynamic objects, finds the corresponding
-        dynamic reference, and then returns a list of relevant frames, sorted
-        from most recent [0] to oldest [n].
+    def _has(self, euid):
+        return euid in self.store
+
+    def _get(self, euid):
+        return self.store.get(euid)
+
+    def _put(self, euid, bites):
+        self.store[euid] = bites
+
+    def _discard(self, euid):
+        self.store.pop(euid, None)
+
+    def _euids(self, prefix=b''):
+        return [euid for euid in list(self.store) if euid.startswith(prefix)]
+
+    def ping_many(self, addresses):
+        ''' Checks self for many addresses at once. Returns a list of 
+        statuses in the same order as addresses.
         '''
-        # First make sure we have it.
-        if not self.ping(dynamic_ref):
-            raise RuntimeError('This store has no EICd files with a matching '
-                               'dynamic reference.')
+        store = self.store
+        bookie = self._dynamic_bookie
+        return [b's' if address in store else 
+                b'd' if address in bookie else 
+                False 
+                for address in addresses]
 
-        # Now, like, do that shit.
-        return list(self._dynamic_bookie[dynamic_ref])
+    def download_many(self, euids):
+        ''' Retrieves many objects at once, as a dictionary of euid: bites.
+        Objects that don't exist map to None.
+        '''
+        store = self.store
+        return {euid: store.get(euid) for euid in euids}
 
     def write_to_disk(self, directory=None):
         ''' Writes the entire memory store to disk in the specified directory.
@@ -223,6 +591,8 @@ class MemoryStore(StorageProvider):
                 fname += '.eics'
             elif blob[EICd.header_bits['magic']] == EICd.magic:
                 fname += '.eicd'
+            elif blob[erasure.header_bits['magic']] == erasure.magic:
+                fname += '.eicx'
             else:
                 raise RuntimeError('This blob doesn\'t appear to be an eic.')
 
@@ -230,8 +600,2284 @@ class MemoryStore(StorageProvider):
                 outfile.write(blob)
 
     @classmethod
-    def read_from_disk(cls, directory):
-        ''' Loads all .eica, .eics, and .eic files within a directory and 
-        returns a MemoryStore object with them.
+    def read_from_disk(cls, directory=None, workers=None):
+        ''' Loads all .eica, .eics, and .eicd files within a directory (as
+        written by write_to_disk) and returns a MemoryStore object with 
+        them.
+
+        Files are read and run through the same public verification as 
+        upload() on a pool of (at most) workers threads, and EICd 
+        signatures are verified in parallel batches once the identities 
+        they depend on are loaded. The dynamic bookkeeping is rebuilt by 
+        ordering each reference's frames along their previous_hash chain, 
+        so the order the files were written in doesn't matter.
+        '''
+        if not directory:
+            directory = 'dump'
+        paths = [os.path.join(directory, fname) 
+                 for fname in sorted(os.listdir(directory)) 
+                 if os.path.splitext(fname)[1] in cls._disk_extensions]
+
+        store = cls()
+        dynamic = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) \
+                as executor:
+            # Load and verify everything
+            for euid, bites, partial in executor.map(cls._read_file, paths):
+                if partial is None:
+                    store.store[euid] = bites
+                else:
+                    dynamic.append((bites, partial))
+
+        # Now that the identities are in, verify the EICd signatures 
+        # (except those the verification ledger already vouches for).
+        ledger = AUTHOR_KEY_CACHE.ledger
+        jobs = []
+        checked = []
+        for bites, partial in dynamic:
+            if ledger is not None and ledger.check(partial['euid'], 
+                    partial['author'], partial['euid'], partial['signature']):
+                continue
+            pubkey = AUTHOR_KEY_CACHE.get(partial['author'], [store])
+            jobs.append((partial['euid'], pubkey, partial['signature']))
+            checked.append(partial)
+        for job, partial, result in zip(
+                jobs, checked, EICBase._verify_batch(jobs, workers)):
+            if result is not True:
+                raise RuntimeError('Failed to verify EICd.')
+            if ledger is not None:
+                ledger.record(partial['euid'], partial['author'], job[1], 
+                              job[0], job[2])
+
+        # And finally rebuild the bookkeeping from the hash chains
+        by_reference = {}
+        blobs = {}
+        for bites, partial in dynamic:
+            by_reference.setdefault(partial['header_hash'], {})[
+                partial['euid']] = partial
+            blobs[partial['euid']] = bites
+        for dynamic_ref, partials in by_reference.items():
+            ordered = _chain_frames(partials.values())
+            # The most recent frame decides the buffer size. Anything older
+            # than that would already have been evicted.
+            buffer_req = ordered[0]['buffer_req']
+            buffr = deque(maxlen=buffer_req)
+            for partial in ordered[:buffer_req]:
+                buffr.append(partial['file_hash'])
+                store.store[partial['euid']] = blobs[partial['euid']]
+            store._dynamic_bookie[dynamic_ref] = buffr
+
+        return store
+
+    @classmethod
+    def _read_file(cls, path):
+        ''' Reads and verifies the public parts of a single file written by
+        write_to_disk. Returns (euid, bites, partial), where partial is the 
+        public EICd values for dynamic files and None otherwise.
+        '''
+        fname = os.path.basename(path)
+        name, extension = os.path.splitext(fname)
+        eic_class = cls._disk_extensions[extension]
+        with open(path, 'rb') as infile:
+            bites = infile.read()
+
+        try:
+            euid = base64.urlsafe_b64decode(name)
+            if eic_class is None:
+                # Shards are stored under their shard address.
+                if erasure.unpack_shard(bites)['address'] != euid:
+                    raise RuntimeError('Mismatched shard address.')
+                return euid, bites, None
+            if bites[eic_class.header_bits['magic']] != eic_class.magic:
+                raise RuntimeError('Bad magic.')
+            # Checks the file name against the contents, too.
+            unloaded = VERIFIED_BLOB_CACHE.verify(eic_class, bites, 
+                                                euid=euid)
+        except Exception:
+            raise RuntimeError('Failed to verify ' + fname + '.')
+
+        if eic_class is EICd:
+            return euid, bites, unloaded
+        return euid, bites, None
+
+
+class FileStore(LocalStore):
+    ''' A persistent, content-addressed storage provider backed by a 
+    directory on disk.
+
+    Objects are stored one per file, named by their hex-encoded euid, in a 
+    two-level directory tree sharded by euid prefix (ab/cd/abcd...), so 
+    that no single directory grows unmanageably large. All writes go 
+    through a temporary file and an atomic rename, so readers never see a 
+    partial file. Objects smaller than mmap_threshold bytes are simply 
+    read into bytes. Larger ones are backed by mmap, and downloads return
+    a read-only memoryview instead of copying the file; the most recently
+    used map_cache_size mappings are kept around, so that repeated reads
+    don't each map (and hold a descriptor for) the file all over again.
+
+    The dynamic (EICd) bookkeeping is persisted alongside the objects, so 
+    frame lists survive restarts.
+    '''
+    def __init__(self, directory, mmap_threshold=2 ** 16, map_cache_size=64):
+        ''' Opens (or creates) a file store in directory.
+        '''
+        super().__init__()
+        self.directory = directory
+        self.mmap_threshold = mmap_threshold
+        self.map_cache_size = map_cache_size
+        # euid: mmap, in LRU order. Objects are immutable, so a mapping 
+        # stays good until the object is discarded.
+        self._maps = collections.OrderedDict()
+        self._objects = os.path.join(directory, 'objects')
+        self._dynamic = os.path.join(directory, 'dynamic')
+        os.makedirs(self._objects, exist_ok=True)
+        os.makedirs(self._dynamic, exist_ok=True)
+        self._load_bookie()
+
+    def _path(self, euid):
+        ''' Returns the sharded path for the euid.
+        '''
+        name = base64.b16encode(euid).decode().lower()
+        return os.path.join(self._objects, name[0:2], name[2:4], name)
+
+    def _has(self, euid):
+        # Don't bother with a path for anything that can't be an euid.
+        if not EICBase.check_euid(euid, fatal=False):
+            return False
+        return os.path.exists(self._path(euid))
+
+    def _get(self, euid):
+        if not EICBase.check_euid(euid, fatal=False):
+            return None
+        with self._lock:
+            mapped = self._maps.get(euid)
+            if mapped is not None:
+                self._maps.move_to_end(euid)
+                return memoryview(mapped)
+        try:
+            infile = open(self._path(euid), 'rb')
+        except FileNotFoundError:
+            return None
+
+        with infile:
+            size = os.fstat(infile.fileno()).st_size
+            # Can't mmap an empty file (which shouldn't happen anyways).
+            if not size:
+                return None
+            if size < self.mmap_threshold:
+                return infile.read()
+            # The mapping stays valid after the file is closed (and even if 
+            # it gets replaced or deleted out from under us).
+            mapped = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+
+        with self._lock:
+            self._maps[euid] = mapped
+            while len(self._maps) > self.map_cache_size:
+                # Outstanding memoryviews keep their mapping alive.
+                self._maps.popitem(last=False)
+        return memoryview(mapped)
+
+    def _put(self, euid, bites):
+        path = self._path(euid)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _atomic_write(path, bites)
+
+    def _discard(self, euid):
+        with self._lock:
+            self._maps.pop(euid, None)
+        try:
+            os.remove(self._path(euid))
+        except FileNotFoundError:
+            pass
+
+    def _euids(self, prefix=b''):
+        # The directory tree is sharded by the first two bytes, so long 
+        # enough prefixes only need to look at one directory.
+        top = self._objects
+        hex_prefix = base64.b16encode(prefix).decode().lower()
+        if len(prefix) >= 2:
+            top = os.path.join(top, hex_prefix[0:2], hex_prefix[2:4])
+        for dirpath, dirnames, filenames in os.walk(top):
+            for name in filenames:
+                # Skip any temporary files left over from a crash.
+                if not name.startswith('.') and name.startswith(hex_prefix):
+                    yield base64.b16decode(name.upper())
+
+    def _save_frames(self, dynamic_ref, buffr):
+        ''' Records the frame deque for dynamic_ref, persisting it as the 
+        buffer request followed by the file hashes, most recent first.
+        '''
+        record = struct.pack('>I', buffr.maxlen) + b''.join(buffr)
+        name = base64.b16encode(dynamic_ref).decode().lower()
+        _atomic_write(os.path.join(self._dynamic, name), record)
+        super()._save_frames(dynamic_ref, buffr)
+
+    def _forget_frames(self, dynamic_ref):
+        name = base64.b16encode(dynamic_ref).decode().lower()
+        try:
+            os.remove(os.path.join(self._dynamic, name))
+        except FileNotFoundError:
+            pass
+        super()._forget_frames(dynamic_ref)
+
+    def _load_bookie(self):
+        ''' Loads the persisted dynamic bookkeeping.
+        '''
+        for name in os.listdir(self._dynamic):
+            # Skip any temporary files left over from a crash.
+            if name.startswith('.'):
+                continue
+            with open(os.path.join(self._dynamic, name), 'rb') as infile:
+                record = infile.read()
+            buffer_req = struct.unpack('>I', record[0:4])[0]
+            frames = [record[ii:ii + 64] for ii in range(4, len(record), 64)]
+            dynamic_ref = base64.b16decode(name.upper())
+            self._dynamic_bookie[dynamic_ref] = deque(frames, 
+                                                      maxlen=buffer_req)
+
+
+class PackStore(LocalStore):
+    ''' A persistent storage provider that appends objects to large 
+    segment files, instead of keeping one file per object. Well suited to
+    lots of small objects (EICa files, identity EICs, etc).
+
+    Each record in a segment is a '>Q' length followed by the object. Once
+    a segment reaches segment_size it is sealed by appending a trailer: an
+    index of (euid, offset, length) rows, followed by a fixed-size footer.
+    On open, the in-memory euid: (segment, offset, length) index is rebuilt
+    from the sealed segments' trailers, and only the active (unsealed) 
+    segment needs to be scanned record-by-record. The dynamic bookkeeping
+    is rebuilt from the stored EICd headers.
+
+    Writes are sequential appends, fsync'd in groups of sync_every (and on
+    flush() and close()). Reads are a single pread. Objects are never 
+    removed in place: deleting one (or evicting an EICd frame) appends a
+    tombstone record instead, and the old record becomes dead until 
+    compact() drops it by rewriting the segment holding it. A tombstone
+    hides its euid in every segment before its horizon (the segment it was
+    first written to), and in earlier records of its own segment; trailers
+    keep them as (euid, 0, horizon) rows.
+    '''
+    _footer = struct.Struct('>QQ8s')
+    _footer_magic = b'EICPACK1'
+    _index_row = struct.Struct('>64sQQ')
+    _length = struct.Struct('>Q')
+    _tombstone = struct.Struct('>8s64sQ')
+    _tombstone_magic = b'EICTOMB1'
+    # Records copied per lock acquisition while compacting
+    _compact_batch = 64
+    # Enough of a record to work out what it's stored under
+    _header_length = max(EICs.header_bits['file_hash'].stop, 
+                         erasure.header_bits['index'].stop)
+
+    def __init__(self, directory, segment_size=64 * 2 ** 20, sync_every=32):
+        ''' Opens (or creates) a pack store in directory.
         '''
-        pass
\ No newline at end of file
+        super().__init__()
+        self.directory = directory
+        self.segment_size = segment_size
+        self.sync_every = sync_every
+        os.makedirs(directory, exist_ok=True)
+
+        # euid: (segment, offset, length)
+        self._index = {}
+        # segment: read-only file descriptor
+        self._readers = {}
+        # segment: bytes of records (excluding any trailer)
+        self._sizes = {}
+        # segment: {euid: horizon} for the tombstones it holds
+        self._tombstones = {}
+        self._sealed = set()
+        self._active = None
+        self._active_file = None
+        self._unsynced = 0
+        self._compacting = threading.Lock()
+
+        self._open_segments()
+        self._rebuild_bookie()
+
+    def _segment_path(self, segment):
+        return os.path.join(self.directory, '%08d.pack' % segment)
+
+    def _open_segments(self):
+        ''' Rebuilds the index from the segment files on disk.
+        '''
+        segments = sorted(int(fname[:-5]) for fname in os.listdir(
+                          self.directory) if fname.endswith('.pack'))
+
+        for segment in segments:
+            path = self._segment_path(segment)
+            self._readers[segment] = os.open(path, os.O_RDONLY)
+            # Later segments win, which only matters for copies left 
+            # behind by an interrupted compaction.
+            if not self._read_trailer(segment):
+                self._scan_segment(segment)
+
+        # Only the last segment can stay active; seal anything else that 
+        # was left unsealed (say, by a crash).
+        for segment in segments[:-1]:
+            if segment not in self._sealed:
+                self._activate(segment)
+                self._seal()
+        if segments and segments[-1] not in self._sealed:
+            self._activate(segments[-1])
+        else:
+            self._activate(segments[-1] + 1 if segments else 0)
+
+    def _read_trailer(self, segment):
+        ''' Loads the index rows from a sealed segment's trailer. Returns 
+        False if the segment isn't sealed.
+        '''
+        fd = self._readers[segment]
+        size = os.fstat(fd).st_size
+        if size < self._footer.size:
+            return False
+        index_offset, count, magic = self._footer.unpack(
+            os.pread(fd, self._footer.size, size - self._footer.size))
+        if (magic != self._footer_magic or index_offset + 
+                count * self._index_row.size + self._footer.size != size):
+            return False
+
+        rows = list(self._index_row.iter_unpack(
+            os.pread(fd, count * self._index_row.size, index_offset)))
+        # The rows are the segment's final state, so they win over its own
+        # tombstones (which only hide older segments by then).
+        for euid, offset, horizon in rows:
+            if not offset:
+                self._bury_loaded(segment, euid, horizon)
+        for euid, offset, length in rows:
+            if offset:
+                self._index[euid] = (segment, offset, length)
+        self._sizes[segment] = index_offset
+        self._sealed.add(segment)
+        return True
+
+    def _scan_segment(self, segment):
+        ''' Rebuilds the index for an unsealed segment by walking its 
+        records, truncating any partially-written record at the end.
+        '''
+        path = self._segment_path(segment)
+        with open(path, 'r+b') as segfile:
+            size = os.fstat(segfile.fileno()).st_size
+            position = 0
+            while position + self._length.size <= size:
+                length = self._length.unpack(
+                    segfile.read(self._length.size))[0]
+                offset = position + self._length.size
+                # Only a record running off the end is a torn write.
+                if offset + length > size:
+                    break
+                header = segfile.read(min(length, self._header_length))
+                if length == self._tombstone.size and header.startswith(
+                        self._tombstone_magic):
+                    __, euid, horizon = self._tombstone.unpack(header)
+                    self._bury_loaded(segment, euid, horizon)
+                else:
+                    address = self._address(header)
+                    if address is not None:
+                        self._index[address] = (segment, offset, length)
+                position = offset + length
+                segfile.seek(position)
+            # Anything past here is a torn write.
+            if position != size:
+                segfile.truncate(position)
+        self._sizes[segment] = position
+
+    def _bury_loaded(self, segment, euid, horizon):
+        ''' Applies a tombstone found in segment while opening the store.
+        '''
+        self._tombstones.setdefault(segment, {})[euid] = horizon
+        entry = self._index.get(euid)
+        if entry is not None and (entry[0] < horizon or entry[0] == segment):
+            del self._index[euid]
+
+    @staticmethod
+    def _address(header):
+        ''' Returns the address a record is stored under, from the start of
+        the record, or None if it can't be worked out. Every EIC keeps its
+        file hash (aka euid) in the same spot, but erasure-coded shards are
+        stored under their shard address instead.
+        '''
+        if header[erasure.header_bits['magic']] == erasure.magic and \
+                len(header) >= erasure.header_bits['index'].stop:
+            return erasure.shard_address(
+                bytes(header[erasure.header_bits['euid']]), 
+                header[erasure.header_bits['index']][0])
+        file_hash = EICs.header_bits['file_hash']
+        if len(header) < file_hash.stop:
+            return None
+        return bytes(header[file_hash])
+
+    def _activate(self, segment):
+        ''' Makes segment the one being appended to.
+        '''
+        path = self._segment_path(segment)
+        self._active_file = open(path, 'ab')
+        if segment not in self._readers:
+            self._readers[segment] = os.open(path, os.O_RDONLY)
+            self._sizes[segment] = 0
+        self._active = segment
+
+    def _seal(self):
+        ''' Writes the trailer for the active segment and closes it for 
+        writing. Does not activate a new segment.
+        '''
+        segment = self._active
+        rows = [self._index_row.pack(euid, offset, length) 
+                for euid, (seg, offset, length) in self._index.items() 
+                if seg == segment]
+        rows.extend(self._index_row.pack(euid, 0, horizon) for euid, horizon
+                    in self._tombstones.get(segment, {}).items())
+        trailer = b''.join(rows) + self._footer.pack(
+            self._sizes[segment], len(rows), self._footer_magic)
+        self._active_file.write(trailer)
+        self._sync()
+        self._active_file.close()
+        self._active_file = None
+        self._sealed.add(segment)
+
+    def _sync(self):
+        ''' Flushes and fsyncs the active segment.
+        '''
+        self._active_file.flush()
+        os.fsync(self._active_file.fileno())
+        self._unsynced = 0
+
+    def _append(self, euid, bites):
+        ''' Appends a record to the active segment, rolling over to a new 
+        segment as needed. Must be called with the lock held.
+        '''
+        segment = self._active
+        offset = self._write(bites)
+        self._index[euid] = (segment, offset, len(bites))
+        self._roll(segment)
+
+    def _bury(self, euid, horizon):
+        ''' Appends a tombstone for euid to the active segment, rolling over
+        to a new segment as needed. Must be called with the lock held.
+        '''
+        segment = self._active
+        self._write(self._tombstone.pack(self._tombstone_magic, euid, 
+                                         horizon))
+        self._tombstones.setdefault(segment, {})[euid] = horizon
+        self._roll(segment)
+
+    def _write(self, bites):
+        ''' Writes a record to the end of the active segment, returning its
+        offset.
+        '''
+        segment = self._active
+        offset = self._sizes[segment] + self._length.size
+        self._active_file.write(self._length.pack(len(bites)))
+        self._active_file.write(bites)
+        # Make it visible to pread
+        self._active_file.flush()
+        self._sizes[segment] = offset + len(bites)
+        return offset
+
+    def _roll(self, segment):
+        ''' Syncs and rolls over to a new segment once it's time to.
+        '''
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            self._sync()
+        if self._sizes[segment] >= self.segment_size:
+            self._seal()
+            self._activate(segment + 1)
+
+    def _rebuild_bookie(self):
+        ''' Rebuilds the dynamic bookkeeping by walking each reference's 
+        frames back from its most recent one. Frames that aren't reached 
+        (because they were evicted) are dead.
+        '''
+        by_reference = {}
+        for euid in list(self._index):
+            header = self._pread(euid, 0, EICd.header_size)
+            if header[EICd.header_bits['magic']] != EICd.magic:
+                continue
+            partial = EICd._unpack_public(header)
+            partial['euid'] = euid
+            by_reference.setdefault(partial['header_hash'], {})[
+                partial['previous_hash']] = partial
+
+        for dynamic_ref, successors in by_reference.items():
+            # The most recent frame is one that nothing else follows. Dead 
+            # frames can leave gaps (and therefore other candidates) behind,
+            # but since records are only ever appended, and compaction only
+            # moves live records, the most recent frame is the candidate 
+            # that was written last.
+            previous = set(successors)
+            recent = max((partial for partial in successors.values() 
+                          if partial['file_hash'] not in previous), 
+                         key=lambda partial: self._index[partial['euid']])
+
+            by_file_hash = {partial['file_hash']: partial 
+                            for partial in successors.values()}
+            frames = []
+            partial = recent
+            buffer_req = partial['buffer_req']
+            while partial is not None and len(frames) < buffer_req:
+                frames.append(partial['file_hash'])
+                partial = by_file_hash.get(partial['previous_hash'])
+            self._dynamic_bookie[dynamic_ref] = deque(frames, 
+                                                      maxlen=buffer_req)
+
+            live = set(frames)
+            for file_hash in by_file_hash:
+                if file_hash not in live:
+                    self._index.pop(file_hash, None)
+
+    def _pread(self, euid, start=0, length=None):
+        ''' Reads (part of) a stored object. Returns None if missing.
+        '''
+        with self._lock:
+            try:
+                segment, offset, stored_length = self._index[euid]
+            except KeyError:
+                return None
+            if length is None or start + length > stored_length:
+                length = max(stored_length - start, 0)
+            return os.pread(self._readers[segment], length, offset + start)
+
+    def _has(self, euid):
+        return euid in self._index
+
+    def _get(self, euid):
+        return self._pread(euid)
+
+    def _get_range(self, euid, offset, length):
+        return self._pread(euid, offset, length)
+
+    def _put(self, euid, bites):
+        with self._lock:
+            if euid not in self._index:
+                self._append(euid, bites)
+
+    def _discard(self, euid):
+        # The record stays in its segment until it gets compacted away, but
+        # the tombstone keeps it from coming back when the store reopens.
+        with self._lock:
+            if self._index.pop(euid, None) is not None:
+                self._bury(euid, self._active)
+
+    def _euids(self, prefix=b''):
+        with self._lock:
+            return [euid for euid in self._index if euid.startswith(prefix)]
+
+    def flush(self):
+        ''' Forces any buffered appends to disk.
+        '''
+        with self._lock:
+            if self._active_file is not None:
+                self._sync()
+
+    def close(self):
+        ''' Flushes and closes the store. Does not seal the active segment.
+        '''
+        with self._lock:
+            if self._active_file is not None:
+                self._sync()
+                self._active_file.close()
+                self._active_file = None
+            for fd in self._readers.values():
+                os.close(fd)
+            self._readers.clear()
+
+    def dead_bytes(self):
+        ''' Returns a dictionary of segment: bytes of dead records.
+        Tombstones don't count, since compaction carries them forward.
+        '''
+        with self._lock:
+            live = dict.fromkeys(self._sizes, 0)
+            for segment, offset, length in self._index.values():
+                live[segment] += self._length.size + length
+            for segment, tombstones in self._tombstones.items():
+                live[segment] += len(tombstones) * (self._length.size + 
+                                                    self._tombstone.size)
+            return {segment: self._sizes[segment] - live[segment] 
+                    for segment in self._sizes}
+
+    def compact(self, min_dead_ratio=.25, background=False):
+        ''' Rewrites every sealed segment where at least min_dead_ratio of
+        the bytes are dead (evicted or orphaned EICd frames), copying its 
+        live records to the end of the store and then deleting it.
+
+        If background is True, compacts on a daemon thread and returns the
+        thread immediately. Reads and writes carry on meanwhile: the live 
+        records are read without holding the store's lock, which is only 
+        taken to append each batch of copies, and to swap out the segment
+        once they're durable.
+        '''
+        if background:
+            worker = threading.Thread(target=self.compact, 
+                                      args=(min_dead_ratio,), daemon=True)
+            worker.start()
+            return worker
+
+        # Only one compaction at a time, so that nothing else closes the 
+        # segments being copied out of.
+        with self._compacting:
+            with self._lock:
+                candidates = [(segment, dead, self._sizes[segment]) 
+                              for segment, dead in self.dead_bytes().items()
+                              if segment in self._sealed]
+            for segment, dead, size in candidates:
+                if size and dead / size < min_dead_ratio:
+                    continue
+                self._compact_segment(segment)
+
+    def _compact_segment(self, segment):
+        ''' Copies the live records of a sealed segment to the active 
+        segment, then deletes it. Must be called while compacting.
+        '''
+        with self._lock:
+            live = [(euid, offset, length) for euid, (seg, offset, length) 
+                    in self._index.items() if seg == segment]
+            fd = self._readers[segment]
+
+        for start in range(0, len(live), self._compact_batch):
+            copies = [(euid, offset, length, os.pread(fd, length, offset))
+                      for euid, offset, length 
+                      in live[start:start + self._compact_batch]]
+            with self._lock:
+                for euid, offset, length, bites in copies:
+                    # Skip anything deleted (or evicted) since.
+                    if self._index.get(euid) == (segment, offset, length):
+                        self._append(euid, bites)
+
+        with self._lock:
+            # Tombstones are still needed while an older segment could hold
+            # what they hide, unless it's since been stored again (which 
+            # always lands after the horizon, so wins on reopen anyway).
+            for euid, horizon in self._tombstones.pop(segment, {}).items():
+                older = [seg for seg in self._sizes 
+                         if seg < horizon and seg != segment]
+                if older and euid not in self._index:
+                    self._bury(euid, horizon)
+            # Make sure the copies are durable before losing the originals.
+            self._sync()
+
+            del self._readers[segment]
+            del self._sizes[segment]
+            self._sealed.discard(segment)
+            os.close(fd)
+            os.remove(self._segment_path(segment))
+
+
+class SQLiteStore(LocalStore):
+    ''' A persistent storage provider backed by a single sqlite database.
+
+    Objects are stored by euid. EICd frames are kept in a 
+    (dynamic_ref, seq, file_hash) table keyed on (dynamic_ref, seq), so 
+    listing frames is an index range scan, and trimming the buffer is a 
+    single DELETE. The database runs in WAL mode, so readers (which each 
+    get their own per-thread connection) aren't blocked by the writer.
+    Uploads within a batch() (including upload_many) share a single 
+    transaction.
+    '''
+    _schema = (
+        'CREATE TABLE IF NOT EXISTS objects ('
+        'euid BLOB PRIMARY KEY, data BLOB NOT NULL) WITHOUT ROWID',
+        'CREATE TABLE IF NOT EXISTS refs ('
+        'dynamic_ref BLOB PRIMARY KEY, buffer_req INTEGER NOT NULL) '
+        'WITHOUT ROWID',
+        'CREATE TABLE IF NOT EXISTS frames ('
+        'dynamic_ref BLOB NOT NULL, seq INTEGER NOT NULL, '
+        'file_hash BLOB NOT NULL, PRIMARY KEY (dynamic_ref, seq)) '
+        'WITHOUT ROWID',
+    )
+
+    def __init__(self, path):
+        ''' Opens (or creates) the database at path.
+        '''
+        super().__init__()
+        self.path = path
+        self._local = threading.local()
+        # (thread, connection) for every per-thread reader
+        self._readers = []
+        self._readers_lock = threading.Lock()
+        # Only one writer at a time, guarded by self._lock
+        self._writer = self._connect()
+        self._writer.execute('PRAGMA journal_mode=WAL')
+        self._writer.execute('PRAGMA synchronous=NORMAL')
+        for statement in self._schema:
+            self._writer.execute(statement)
+        self._batch_owner = None
+        self._batch_depth = 0
+
+    def _connect(self):
+        # Autocommit mode; we manage transactions ourselves.
+        return sqlite3.connect(self.path, isolation_level=None, 
+                               check_same_thread=False)
+
+    def _reader(self):
+        ''' Returns a connection for reading. Inside a batch, the batching
+        thread reads through the writer, so that it sees its own writes.
+        '''
+        if self._batch_owner == threading.get_ident():
+            return self._writer
+        try:
+            return self._local.connection
+        except AttributeError:
+            pass
+
+        connection = self._connect()
+        with self._readers_lock:
+            # Readers belonging to threads that have since died would 
+            # otherwise stay open until close().
+            for thread, reader in self._readers:
+                if not thread.is_alive():
+                    reader.close()
+            self._readers = [(thread, reader) for thread, reader 
+                             in self._readers if thread.is_alive()]
+            self._readers.append((threading.current_thread(), connection))
+        self._local.connection = connection
+        return connection
+
+    @contextlib.contextmanager
+    def _snapshot(self):
+        ''' Context manager that runs every read within it in a single 
+        read transaction, so that they all see the same state. Yields the
+        connection to read through.
+        '''
+        connection = self._reader()
+        # The writer is already in a transaction.
+        if connection is self._writer:
+            yield connection
+            return
+        connection.execute('BEGIN')
+        try:
+            yield connection
+        finally:
+            connection.execute('COMMIT')
+
+    @contextlib.contextmanager
+    def batch(self):
+        ''' Context manager that runs every write within it (from this 
+        thread) in a single transaction. Other writers wait until it exits.
+        '''
+        with self._lock:
+            if not self._batch_depth:
+                self._writer.execute('BEGIN IMMEDIATE')
+                self._batch_owner = threading.get_ident()
+            self._batch_depth += 1
+            try:
+                yield self._writer
+            except:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self._batch_owner = None
+                    self._writer.execute('ROLLBACK')
+                raise
+            else:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self._batch_owner = None
+                    self._writer.execute('COMMIT')
+
+    def upload_many(self, blobs):
+        ''' Uploads the blobs in order, within a single transaction.
+        '''
+        with self.batch():
+            return super().upload_many(blobs)
+
+    def _has(self, euid):
+        return self._reader().execute(
+            'SELECT 1 FROM objects WHERE euid = ?', (euid,)).fetchone() \
+            is not None
+
+    def _get(self, euid):
+        row = self._reader().execute(
+            'SELECT data FROM objects WHERE euid = ?', (euid,)).fetchone()
+        return row[0] if row else None
+
+    def _get_range(self, euid, offset, length):
+        row = self._reader().execute(
+            'SELECT substr(data, ?, ?) FROM objects WHERE euid = ?', 
+            (offset + 1, length, euid)).fetchone()
+        return row[0] if row else None
+
+    def _put(self, euid, bites):
+        with self.batch() as connection:
+            connection.execute('INSERT OR IGNORE INTO objects VALUES (?, ?)', 
+                               (euid, bytes(bites)))
+
+    def _discard(self, euid):
+        with self.batch() as connection:
+            connection.execute('DELETE FROM objects WHERE euid = ?', (euid,))
+
+    @staticmethod
+    def _prefix_clause(column, prefix):
+        ''' Returns a (where clause, parameters) tuple matching the column
+        against prefix as a range, so that it can use the primary key.
+        '''
+        # The smallest blob that's greater than everything starting with 
+        # prefix is prefix with its last non-0xff byte incremented.
+        stripped = prefix.rstrip(b'\xff')
+        if not stripped:
+            if not prefix:
+                return '', ()
+            return ' WHERE ' + column + ' >= ?', (prefix,)
+        upper = stripped[:-1] + bytes([stripped[-1] + 1])
+        return (' WHERE ' + column + ' >= ? AND ' + column + ' < ?', 
+                (prefix, upper))
+
+    def _euids(self, prefix=b''):
+        where, parameters = self._prefix_clause('euid', prefix)
+        return [row[0] for row in self._reader().execute(
+            'SELECT euid FROM objects' + where, parameters)]
+
+    def _references(self, prefix=b''):
+        where, parameters = self._prefix_clause('dynamic_ref', prefix)
+        return [row[0] for row in self._reader().execute(
+            'SELECT dynamic_ref FROM refs' + where, parameters)]
+
+    def _forget_frames(self, dynamic_ref):
+        with self.batch() as connection:
+            connection.execute('DELETE FROM frames WHERE dynamic_ref = ?', 
+                               (dynamic_ref,))
+            connection.execute('DELETE FROM refs WHERE dynamic_ref = ?', 
+                               (dynamic_ref,))
+
+    def _frames(self, dynamic_ref):
+        with self._snapshot() as connection:
+            row = connection.execute(
+                'SELECT buffer_req FROM refs WHERE dynamic_ref = ?', 
+                (dynamic_ref,)).fetchone()
+            if row is None:
+                return None
+            frames = connection.execute(
+                'SELECT file_hash FROM frames WHERE dynamic_ref = ? '
+                'ORDER BY seq DESC', (dynamic_ref,)).fetchall()
+        return deque((frame[0] for frame in frames), maxlen=row[0])
+
+    def head(self, dynamic_ref):
+        row = self._reader().execute(
+            'SELECT file_hash FROM frames WHERE dynamic_ref = ? '
+            'ORDER BY seq DESC LIMIT 1', (dynamic_ref,)).fetchone()
+        return row[0] if row else None
+
+    def list_frames_since(self, dynamic_ref, known_head):
+        with self._snapshot() as connection:
+            if connection.execute(
+                    'SELECT 1 FROM refs WHERE dynamic_ref = ?', 
+                    (dynamic_ref,)).fetchone() is None:
+                return None
+            row = connection.execute(
+                'SELECT seq FROM frames WHERE dynamic_ref = ? AND '
+                'file_hash = ?', (dynamic_ref, known_head)).fetchone()
+            frames = connection.execute(
+                'SELECT file_hash FROM frames WHERE dynamic_ref = ? AND '
+                'seq > ? ORDER BY seq DESC', 
+                (dynamic_ref, row[0] if row else 0)).fetchall()
+        return [frame[0] for frame in frames]
+
+    def _record_frame(self, euid, bites, partial, buffr, evicted):
+        ''' Appends the frame and trims the buffer in one transaction.
+        '''
+        dynamic_ref = partial['header_hash']
+        buffer_req = partial['buffer_req']
+        with self.batch() as connection:
+            connection.execute('INSERT OR IGNORE INTO objects VALUES (?, ?)', 
+                               (euid, bytes(bites)))
+            seq = connection.execute(
+                'SELECT COALESCE(MAX(seq), 0) FROM frames '
+                'WHERE dynamic_ref = ?', (dynamic_ref,)).fetchone()[0] + 1
+            connection.execute('INSERT INTO frames VALUES (?, ?, ?)', 
+                               (dynamic_ref, seq, partial['file_hash']))
+            connection.execute('INSERT OR REPLACE INTO refs VALUES (?, ?)', 
+                               (dynamic_ref, buffer_req))
+            connection.execute('DELETE FROM frames WHERE dynamic_ref = ? '
+                               'AND seq <= ?', (dynamic_ref, seq - buffer_req))
+            connection.executemany('DELETE FROM objects WHERE euid = ?', 
+                                   [(old_euid,) for old_euid in evicted])
+
+    def close(self):
+        ''' Closes every connection to the database.
+        '''
+        with self._lock:
+            self._writer.close()
+            with self._readers_lock:
+                for __, reader in self._readers:
+                    reader.close()
+                self._readers.clear()
+
+
+class CachingStore(StorageProvider):
+    ''' A read-through cache in front of a list of upstream storage 
+    providers.
+
+    Objects are immutable once they have an euid, so downloaded blobs are
+    cached by euid indefinitely (once they've been checked against it), 
+    subject to a least-recently-used byte budget. Frame lists for dynamic 
+    references are mutable, so they're only cached for frame_ttl seconds.
+    Misses are also remembered for miss_ttl seconds, so that repeatedly 
+    asking for something nobody has doesn't go upstream every time.
+
+    Uploads go straight through to every upstream provider.
+    '''
+    def __init__(self, storage_providers, max_bytes=64 * 2 ** 20, 
+                 frame_ttl=5, miss_ttl=5):
+        self.storage_providers = list(storage_providers)
+        self.max_bytes = max_bytes
+        self.frame_ttl = frame_ttl
+        self.miss_ttl = miss_ttl
+        # euid: bites, in LRU order
+        self._blobs = collections.OrderedDict()
+        # dynamic ref: (expiry, frame list)
+        self._frame_lists = {}
+        # address: expiry
+        self._misses = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ping(self, address):
+        ''' Checks the caches for the address, and then the upstream 
+        providers.
+        '''
+        now = time.monotonic()
+        with self._lock:
+            if address in self._blobs:
+                self.hits += 1
+                return b's'
+            if self._fresh(self._frame_lists, address, now):
+                self.hits += 1
+                return b'd'
+            if self._fresh(self._misses, address, now):
+                self.hits += 1
+                return False
+            self.misses += 1
+
+        status = StorageProvider.ping_multi(address, self.storage_providers)
+        if not status:
+            self._remember_miss(address)
+        return status
+
+    def upload(self, bites):
+        ''' Uploads the object to every upstream provider, and forgets 
+        anything cached that it makes stale.
+        '''
+        euid = None
+        for storage_provider in self.storage_providers:
+            status = storage_provider.upload(bites)
+            if euid and status != euid:
+                raise RuntimeError('Unsuccessful upload. EUID verification '
+                                   'mismatch.')
+            euid = status
+
+        with self._lock:
+            self._misses.pop(euid, None)
+            # New frames make the frame list stale.
+            if bites[EICd.header_bits['magic']] == EICd.magic:
+                dynamic_ref = bytes(bites[EICd.header_bits['header_hash']])
+                self._frame_lists.pop(dynamic_ref, None)
+                self._misses.pop(dynamic_ref, None)
+        return euid
+
+    def download(self, euid):
+        ''' Returns the cached object, or else downloads, checks and 
+        caches it. Returns None if no upstream provider has it.
+        '''
+        now = time.monotonic()
+        with self._lock:
+            try:
+                bites = self._blobs[euid]
+            except KeyError:
+                if self._fresh(self._misses, euid, now):
+                    self.hits += 1
+                    return None
+                self.misses += 1
+            else:
+                self._blobs.move_to_end(euid)
+                self.hits += 1
+                return bites
+
+        for storage_provider in self.storage_providers:
+            bites = storage_provider.download(euid)
+            if bites and erasure.matches_address(bites, euid):
+                self._remember(euid, bites)
+                return bites
+
+        self._remember_miss(euid)
+        return None
+
+    def download_many(self, euids):
+        ''' Serves whatever it can from the cache, and then downloads the
+        rest in batches from each upstream provider in turn.
+        '''
+        now = time.monotonic()
+        found = {}
+        missing = []
+        with self._lock:
+            for euid in euids:
+                if euid in self._blobs:
+                    self._blobs.move_to_end(euid)
+                    found[euid] = self._blobs[euid]
+                    self.hits += 1
+                elif self._fresh(self._misses, euid, now):
+                    found[euid] = None
+                    self.hits += 1
+                else:
+                    missing.append(euid)
+                    self.misses += 1
+
+        for storage_provider in self.storage_providers:
+            if not missing:
+                break
+            batch = storage_provider.download_many(missing)
+            for euid in missing:
+                bites = batch.get(euid)
+                if bites and erasure.matches_address(bites, euid):
+                    self._remember(euid, bites)
+                    found[euid] = bites
+            missing = [euid for euid in missing if euid not in found]
+
+        for euid in missing:
+            self._remember_miss(euid)
+            found[euid] = None
+        return found
+
+    def download_range(self, euid, offset, length):
+        ''' Slices the range out of the cached object, if we have it, and
+        otherwise reads just the range from upstream (without caching it).
+        '''
+        return self.download_ranges([(euid, offset, length)])[0]
+
+    def download_ranges(self, ranges):
+        ''' Vectored counterpart to download_range().
+        '''
+        ranges = list(ranges)
+        results = [None] * len(ranges)
+        missing = []
+        now = time.monotonic()
+        with self._lock:
+            for ii, (euid, offset, length) in enumerate(ranges):
+                bites = self._blobs.get(euid)
+                if bites is not None:
+                    self._blobs.move_to_end(euid)
+                    results[ii] = memoryview(bites)[offset:offset + length]
+                    self.hits += 1
+                elif self._fresh(self._misses, euid, now):
+                    self.hits += 1
+                else:
+                    missing.append(ii)
+                    self.misses += 1
+
+        for storage_provider in self.storage_providers:
+            if not missing:
+                break
+            batch = storage_provider.download_ranges(
+                [ranges[ii] for ii in missing])
+            # An empty range (say, past the end) is still a hit.
+            for ii, bites in zip(missing, batch):
+                if bites is not None:
+                    results[ii] = bites
+            missing = [ii for ii in missing if results[ii] is None]
+
+        # Misses aren't remembered here, since a range read only ever sees
+        # part of the object.
+        return results
+
+    def list_frames(self, dynamic_ref):
+        ''' Returns the (recently) cached frame list, or else polls the 
+        upstream providers for it.
+        '''
+        now = time.monotonic()
+        with self._lock:
+            framelist = self._fresh(self._frame_lists, dynamic_ref, now)
+            if framelist:
+                self.hits += 1
+                return list(framelist[1])
+            missed = self._fresh(self._misses, dynamic_ref, now)
+            if missed:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if not missed:
+            try:
+                framelist = StorageProvider.poll_frames(dynamic_ref, 
+                                                        self.storage_providers)
+            except RuntimeError:
+                self._remember_miss(dynamic_ref)
+            else:
+                with self._lock:
+                    self._frame_lists[dynamic_ref] = (now + self.frame_ttl, 
+                                                      list(framelist))
+                return list(framelist)
+
+        raise RuntimeError('Failed to find the given dynamic reference at any '
+                           'of the upstream storage providers.')
+
+    def head(self, dynamic_ref):
+        ''' Returns the most recent frame from the (recently) cached frame
+        list, or else asks the upstream providers for just the head.
+        '''
+        now = time.monotonic()
+        with self._lock:
+            framelist = self._fresh(self._frame_lists, dynamic_ref, now)
+            if framelist:
+                self.hits += 1
+                return framelist[1][0]
+            self.misses += 1
+        for storage_provider in self.storage_providers:
+            head = storage_provider.head(dynamic_ref)
+            if head:
+                return head
+        return None
+
+    def list_frames_since(self, dynamic_ref, known_head):
+        ''' Filters the (recently) cached frame list, or else asks the 
+        upstream providers.
+        '''
+        now = time.monotonic()
+        with self._lock:
+            framelist = self._fresh(self._frame_lists, dynamic_ref, now)
+            if framelist:
+                self.hits += 1
+                framelist = framelist[1]
+                if known_head in framelist:
+                    return framelist[:framelist.index(known_head)]
+                return list(framelist)
+            self.misses += 1
+        for storage_provider in self.storage_providers:
+            framelist = storage_provider.list_frames_since(dynamic_ref, 
+                                                           known_head)
+            if framelist is not None:
+                return framelist
+        return None
+
+    def invalidate(self, address=None):
+        ''' Forgets everything cached about the address. If address is 
+        None, clears the entire cache. Does NOT reset the counters.
+        '''
+        with self._lock:
+            if address is None:
+                self._blobs.clear()
+                self._frame_lists.clear()
+                self._misses.clear()
+                self._bytes = 0
+            else:
+                bites = self._blobs.pop(address, None)
+                if bites is not None:
+                    self._bytes -= len(bites)
+                self._frame_lists.pop(address, None)
+                self._misses.pop(address, None)
+
+    def stats(self):
+        ''' Returns a dictionary of the current cache statistics.
+        '''
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'hit_ratio': self.hits / lookups if lookups else 0.,
+                    'objects': len(self._blobs),
+                    'bytes': self._bytes,
+                    'max_bytes': self.max_bytes,
+                    'evictions': self.evictions}
+
+    @staticmethod
+    def _fresh(cache, address, now):
+        ''' Returns the cache entry for address if it hasn't expired, 
+        dropping it if it has. Entries are either an expiry time, or a 
+        tuple starting with one. Call with the lock held.
+        '''
+        entry = cache.get(address)
+        if entry is None:
+            return None
+        expiry = entry[0] if isinstance(entry, tuple) else entry
+        if expiry <= now:
+            del cache[address]
+            return None
+        return entry
+
+    def _remember(self, euid, bites):
+        ''' Caches the (already checked) bites, evicting the least 
+        recently used objects to stay within budget.
+        '''
+        size = len(bites)
+        # Don't let one enormous object flush the whole cache.
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._misses.pop(euid, None)
+            if euid in self._blobs:
+                self._blobs.move_to_end(euid)
+                return
+            self._blobs[euid] = bites
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                __, evicted = self._blobs.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def _remember_miss(self, address):
+        with self._lock:
+            self._misses[address] = time.monotonic() + self.miss_ttl
+
+
+class _WriteBackLocalStore(MemoryStore):
+    ''' The local half of a WriteBackStore. Identities can also come from
+    upstream, and the first time we see a frame for a dynamic reference, 
+    we pick up its existing chain from upstream (or, when replaying the 
+    journal, trust the frame's previous_hash).
+    '''
+    def __init__(self, storage_providers):
+        super().__init__()
+        self.storage_providers = storage_providers
+        self.replaying = False
+
+    def _identity_providers(self):
+        return [self] + list(self.storage_providers)
+
+    def _needs_chain(self, partial):
+        ''' Returns True if partial's frame continues a chain we don't 
+        know about yet.
+        '''
+        return self._frames(partial['header_hash']) is None and \
+            partial['previous_hash'] != partial['header_hash']
+
+    def _poll_chain(self, partial):
+        ''' Returns the upstream frames for partial's dynamic reference, 
+        or an empty list if there aren't any.
+        '''
+        try:
+            return StorageProvider.poll_frames(partial['header_hash'], 
+                                               self.storage_providers)
+        except RuntimeError:
+            return []
+
+    def _adopt_chain(self, partial, frames):
+        ''' Starts our bookkeeping for partial's dynamic reference from 
+        frames (most recent first), unless it's been started already.
+        '''
+        with self._lock:
+            if frames and self._needs_chain(partial):
+                self._save_frames(partial['header_hash'], deque(
+                    frames[:partial['buffer_req']], 
+                    maxlen=partial['buffer_req']))
+
+    def prime(self, partial):
+        ''' Picks up the existing chain for partial's dynamic reference 
+        from upstream, if we don't know it yet. This talks to the upstream
+        providers, so call it without holding any locks.
+        '''
+        if self._needs_chain(partial):
+            self._adopt_chain(partial, self._poll_chain(partial))
+
+    def _next_frames(self, partial, adopt=False):
+        if not adopt and self.replaying and self._needs_chain(partial):
+            # We accepted (and verified) this frame once already.
+            self._adopt_chain(partial, [partial['previous_hash']])
+        return super()._next_frames(partial, adopt)
+
+
+class WriteBackStore(StorageProvider):
+    ''' A write-back buffer in front of a list of upstream storage 
+    providers. Uploads are verified and stored locally, appended to an 
+    (optional) journal, and acknowledged immediately; a background thread
+    then pushes them upstream in batches of up to batch_size, retrying 
+    (with exponential backoff, up to max_backoff seconds) until they go 
+    through.
+
+    Uploads are flushed in exactly the order they were accepted, so EICd 
+    frames always reach the upstream providers in chain order. Note that
+    an upload the upstream providers keep rejecting will therefore hold 
+    up everything behind it; keep an eye on stats().
+
+    If a journal path is supplied, every accepted upload is written (and,
+    if sync is True, fsync'd) to it before being acknowledged, and 
+    anything not yet flushed is replayed into the queue on startup.
+
+    Reads are served locally when possible, and otherwise from upstream.
+    Once an upload has been flushed, the local copy is dropped, along with
+    the local chain of any dynamic reference with nothing left to flush.
+    '''
+    _journal_record = struct.Struct('>cQQ')
+
+    def __init__(self, storage_providers, journal=None, batch_size=64, 
+                 sync=True, max_backoff=30):
+        self.storage_providers = storage_providers
+        self.batch_size = batch_size
+        self.sync = sync
+        self.max_backoff = max_backoff
+        self.local = _WriteBackLocalStore(storage_providers)
+        # (seq, euid, bites, dynamic ref (None if static), accepted time)
+        self._queue = deque()
+        self._cond = threading.Condition(threading.RLock())
+        self._seq = 0
+        self._closing = False
+        self.flushed = 0
+        self.failures = 0
+        self.last_error = None
+
+        self._journal = None
+        self.journal_path = journal
+        if journal is not None:
+            self._replay()
+            self._journal = open(journal, 'ab')
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def ping(self, address):
+        status = self.local.ping(address)
+        if status:
+            return status
+        return StorageProvider.ping_multi(address, self.storage_providers)
+
+    def upload(self, bites):
+        ''' Verifies and stores the object locally, and queues it up for 
+        the upstream providers. Returns the euid without waiting for them.
+        '''
+        if self._closing:
+            raise RuntimeError('Store is closed.')
+        held = self.local._held(bites)
+        if held is not None:
+            return held
+        # Verification (and any upstream lookups it needs) can be slow, so
+        # only the bookkeeping happens with the condition held.
+        euid, partial = self.local._verify(bites)
+        if partial is not None:
+            self.local.prime(partial)
+
+        with self._cond:
+            if self._closing:
+                raise RuntimeError('Store is closed.')
+            if partial is not None:
+                # A flush may have forgotten the chain in the meantime, in
+                # which case (rarely) we have to ask upstream again.
+                self.local.prime(partial)
+                # Already flushed (and so dropped locally)?
+                if euid in (self.local._frames(partial['header_hash']) or 
+                            ()):
+                    return euid
+            self.local._accept(euid, bites, partial)
+            self._enqueue(euid, bites)
+        return euid
+
+    def download(self, euid):
+        bites = self.local.download(euid)
+        if bites is not None:
+            return bites
+        for storage_provider in self.storage_providers:
+            bites = storage_provider.download(euid)
+            if bites:
+                return bites
+        return None
+
+    def list_frames(self, dynamic_ref):
+        # Anything we've written to is at least as recent as upstream.
+        if self.local._frames(dynamic_ref) is not None:
+            return self.local.list_frames(dynamic_ref)
+        return StorageProvider.poll_frames(dynamic_ref, 
+                                           self.storage_providers)
+
+    def head(self, dynamic_ref):
+        if self.local._frames(dynamic_ref) is not None:
+            return self.local.head(dynamic_ref)
+        try:
+            return StorageProvider.poll_head(dynamic_ref, 
+                                             self.storage_providers)
+        except RuntimeError:
+            return None
+
+    def list_frames_since(self, dynamic_ref, known_head):
+        if self.local._frames(dynamic_ref) is not None:
+            return self.local.list_frames_since(dynamic_ref, known_head)
+        try:
+            return StorageProvider.poll_frames_since(
+                dynamic_ref, known_head, self.storage_providers)
+        except RuntimeError:
+            return None
+
+    def subscribe(self, dynamic_refs=None, callback=None):
+        ''' Subscribes to frames as they're accepted locally.
+        '''
+        return self.local.subscribe(dynamic_refs, callback)
+
+    @property
+    def queue_depth(self):
+        ''' Read-only property for the number of uploads not yet flushed.
+        '''
+        with self._cond:
+            return len(self._queue)
+
+    @property
+    def flush_lag(self):
+        ''' Read-only property for how long (in seconds) the oldest 
+        unflushed upload has been waiting. Zero if there are none.
+        '''
+        with self._cond:
+            if not self._queue:
+                return 0.
+            return time.monotonic() - self._queue[0][4]
+
+    def stats(self):
+        ''' Returns a dictionary of the current write-back statistics.
+        '''
+        with self._cond:
+            return {'queue_depth': len(self._queue),
+                    'queued_bytes': sum(len(entry[2]) 
+                                        for entry in self._queue),
+                    'flush_lag': self.flush_lag,
+                    'flushed': self.flushed,
+                    'failures': self.failures,
+                    'last_error': self.last_error}
+
+    def flush(self, timeout=None):
+        ''' Waits (up to timeout seconds) for everything queued so far to
+        reach the upstream providers. Returns True if it did.
+        '''
+        with self._cond:
+            if not self._queue:
+                return True
+            target = self._queue[-1][0]
+            self._cond.notify_all()
+            return self._cond.wait_for(
+                lambda: not self._queue or self._queue[0][0] > target, 
+                timeout)
+
+    def close(self, flush=True, timeout=None):
+        ''' Stops accepting uploads, optionally flushes (up to timeout 
+        seconds), and stops the background thread. Anything still queued 
+        stays in the journal for next time.
+        '''
+        if flush:
+            self.flush(timeout)
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        with self._cond:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+    def _enqueue(self, euid, bites, seq=None):
+        ''' Journals (unless replaying) and queues an accepted upload. 
+        Call with the condition held.
+        '''
+        if seq is None:
+            self._seq += 1
+            seq = self._seq
+            if self._journal is not None:
+                self._journal.write(self._journal_record.pack(
+                    b'u', seq, len(bites)) + bytes(bites))
+                self._journal.flush()
+                if self.sync:
+                    os.fsync(self._journal.fileno())
+        if bites[EICd.header_bits['magic']] == EICd.magic:
+            dynamic_ref = bytes(bites[EICd.header_bits['header_hash']])
+        else:
+            dynamic_ref = None
+        self._queue.append((seq, euid, bites, dynamic_ref, 
+                            time.monotonic()))
+        self._cond.notify_all()
+
+    def _run(self):
+        ''' Background flush loop.
+        '''
+        backoff = 0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closing)
+                if self._closing:
+                    return
+                batch = [self._queue[ii] for ii in 
+                         range(min(self.batch_size, len(self._queue)))]
+
+            try:
+                StorageProvider.distribute_many(
+                    [entry[2] for entry in batch], self.storage_providers, 
+                    euids=[entry[1] for entry in batch])
+            except Exception as exc:
+                # Leave them at the front of the queue, and try again later.
+                with self._cond:
+                    self.failures += 1
+                    self.last_error = exc
+                    backoff = min(max(backoff * 2, .05), self.max_backoff)
+                    self._cond.wait_for(lambda: self._closing, backoff)
+                continue
+
+            backoff = 0
+            with self._cond:
+                for entry in batch:
+                    self._queue.popleft()
+                self._evict(batch)
+                self.flushed += len(batch)
+                self._checkpoint(batch[-1][0])
+                self._cond.notify_all()
+
+    def _evict(self, batch):
+        ''' Drops the local copies of a flushed batch, which are upstream 
+        now. Dynamic references only keep their local chain while they 
+        still have frames waiting to be flushed; after that, the next 
+        frame picks the chain back up from upstream. Call with the 
+        condition held.
+        '''
+        waiting = {entry[3] for entry in self._queue}
+        with self.local._lock:
+            for entry in batch:
+                self.local._discard(entry[1])
+                if entry[3] is not None and entry[3] not in waiting:
+                    self.local._forget_frames(entry[3])
+
+    def _checkpoint(self, seq):
+        ''' Records in the journal that everything up to seq has been 
+        flushed. Call with the condition held.
+        '''
+        if self._journal is None:
+            return
+        # Everything's out, so start over.
+        if not self._queue:
+            self._journal.truncate(0)
+        else:
+            self._journal.write(self._journal_record.pack(b'f', seq, 0))
+        self._journal.flush()
+
+    def _replay(self):
+        ''' Re-queues everything in the journal that wasn't flushed.
+        '''
+        try:
+            infile = open(self.journal_path, 'rb')
+        except FileNotFoundError:
+            return
+
+        pending = []
+        flushed = 0
+        end = 0
+        with infile:
+            while True:
+                header = infile.read(self._journal_record.size)
+                if len(header) < self._journal_record.size:
+                    break
+                kind, seq, length = self._journal_record.unpack(header)
+                bites = infile.read(length)
+                if kind not in (b'u', b'f') or len(bites) < length:
+                    break
+                end = infile.tell()
+                self._seq = max(self._seq, seq)
+                if kind == b'u':
+                    pending.append((seq, bites))
+                else:
+                    flushed = max(flushed, seq)
+
+        # Get rid of any torn tail, so that appends line up.
+        if end < os.path.getsize(self.journal_path):
+            with open(self.journal_path, 'r+b') as outfile:
+                outfile.truncate(end)
+
+        self.local.replaying = True
+        try:
+            with self._cond:
+                for seq, bites in pending:
+                    if seq > flushed:
+                        self._enqueue(self.local.upload(bites), bites, seq)
+        finally:
+            self.local.replaying = False
+
+
+class ShardedStore(StorageProvider):
+    ''' Spreads objects across many storage providers, instead of
+    expecting every provider to hold everything.
+
+    Each address is placed on `replicas` providers, chosen by walking a
+    consistent-hash ring (with `vnodes` virtual nodes per provider)
+    clockwise from the address. Static objects are placed by euid. EICd
+    frames are placed by their dynamic reference, so a reference and all
+    of its frames always live together; frame euids we've seen (through
+    uploads or frame listings) are remembered, so that downloading them
+    goes straight to the right place. Anything that isn't where the ring
+    says it should be (an unfamiliar frame, or something mid-rebalance)
+    is looked for on every other provider, unless fallback is False.
+
+    Providers are named, and the names (not the provider objects) decide
+    placement, so they must be stable across restarts. Adding or removing
+    a provider only moves the addresses whose owners changed, which
+    requires every provider to support iter_euids(), iter_references()
+    and delete().
+    '''
+    def __init__(self, storage_providers, replicas=2, vnodes=64,
+                 fallback=True, frame_map_size=2 ** 16):
+        ''' storage_providers is a dict of name (str or bytes): storage
+        provider.
+        '''
+        if replicas < 1:
+            raise ValueError('Need at least one replica.')
+        self.replicas = replicas
+        self.vnodes = vnodes
+        self.fallback = fallback
+        self.frame_map_size = frame_map_size
+        # Guards changes to the ring, and the frame map
+        self._lock = threading.Lock()
+        # frame euid: dynamic ref, in LRU order
+        self._frame_refs = collections.OrderedDict()
+        # name: set of authors known to be held there
+        self._authors = {}
+        # Both of these are replaced wholesale (never modified), so readers
+        # can use them without the lock.
+        self._providers = dict(storage_providers)
+        self._ring = self._build_ring(self._providers)
+
+    @property
+    def storage_providers(self):
+        return list(self._providers.values())
+
+    def _build_ring(self, names):
+        ''' Returns the ring for the names, as a tuple of (sorted points,
+        name for each point).
+        '''
+        points = []
+        for name in names:
+            key = name.encode() if isinstance(name, str) else bytes(name)
+            for vnode in range(self.vnodes):
+                digest = EICBase._hash(key + struct.pack('>I', vnode))
+                points.append((int.from_bytes(digest[:8], 'big'), key, name))
+        points.sort()
+        return ([point for point, __, __ in points],
+                [name for __, __, name in points])
+
+    def _owners_on(self, ring, address, count=None):
+        ''' Returns the names of the providers that own the address on the
+        ring, in order of preference. If count is given, returns that many
+        (or every provider, if there are fewer) instead of one per 
+        replica.
+        '''
+        if count is None:
+            count = self.replicas
+        points, names = ring
+        owners = []
+        if not points:
+            return owners
+        # Euids and dynamic refs are already hashes, so use them directly.
+        start = bisect.bisect(points, int.from_bytes(address[:8], 'big'))
+        for ii in range(len(points)):
+            name = names[(start + ii) % len(points)]
+            if name not in owners:
+                owners.append(name)
+                if len(owners) == count:
+                    break
+        return owners
+
+    def owners(self, address):
+        ''' Returns the names of the providers that own the address (an
+        euid or a dynamic reference), in order of preference. Note that
+        EICd frames are owned by their dynamic reference, not their euid.
+        '''
+        return self._owners_on(self._ring, address)
+
+    def _candidates(self, address):
+        ''' Returns the names of the providers to try for the address, in
+        order: its owners, and then (with fallback) everyone else.
+        '''
+        with self._lock:
+            home = self._frame_refs.get(address, address)
+        owners = self.owners(home)
+        if self.fallback:
+            owners.extend(name for name in self._providers
+                          if name not in owners)
+        return owners
+
+    def _remember_frames(self, dynamic_ref, frames):
+        with self._lock:
+            for euid in frames:
+                self._frame_refs[euid] = dynamic_ref
+                self._frame_refs.move_to_end(euid)
+            while len(self._frame_refs) > self.frame_map_size:
+                self._frame_refs.popitem(last=False)
+
+    @staticmethod
+    def _placement(bites):
+        ''' Returns a tuple of (euid, home address, author) for an object
+        about to be uploaded. The author is None for static objects.
+        '''
+        if bites[EICd.header_bits['magic']] == EICd.magic:
+            return (bytes(bites[EICd.header_bits['file_hash']]),
+                    bytes(bites[EICd.header_bits['header_hash']]),
+                    bytes(bites[EICd.header_bits['author']]))
+        elif bites[erasure.header_bits['magic']] == erasure.magic:
+            address = erasure.shard_address(
+                bytes(bites[erasure.header_bits['euid']]),
+                bites[erasure.header_bits['index']][0])
+            return address, address, None
+        else:
+            euid = bytes(bites[EICs.header_bits['file_hash']])
+            return euid, euid, None
+
+    def _place_author(self, author, names, storage_providers=None):
+        ''' Makes sure each of the named providers (from storage_providers,
+        or else our own) holds the author's identity, so that they can 
+        check signatures on the author's EICd frames.
+        '''
+        if author == AUTHOR_BOOTSTRAP:
+            return
+        if storage_providers is None:
+            storage_providers = self._providers
+        identity = None
+        for name in names:
+            with self._lock:
+                if author in self._authors.get(name, ()):
+                    continue
+            storage_provider = storage_providers[name]
+            if not storage_provider.ping(author):
+                if identity is None:
+                    identity = self.download(author)
+                if identity is None:
+                    raise RuntimeError('Couldn\'t find the author\'s identity.')
+                storage_provider.upload(identity)
+            with self._lock:
+                self._authors.setdefault(name, set()).add(author)
+
+    def ping(self, address):
+        ''' Asks the owners of the address, and then (with fallback)
+        everyone else.
+        '''
+        for name in self._candidates(address):
+            status = self._providers[name].ping(address)
+            if status:
+                return status
+        return False
+
+    def upload(self, bites):
+        ''' Uploads the object to each of its owners.
+        '''
+        results = self._upload_grouped([bites], 'upload_many')
+        return self._check_uploads(results)[0]
+
+    def upload_many(self, blobs):
+        ''' Uploads the blobs (in order) to their owners, in one batch per
+        provider.
+        '''
+        return self._upload_grouped(blobs, 'upload_many')
+
+    def upload_frames(self, blobs):
+        ''' Uploads a run of EICd frames (oldest first) to their owners, in
+        one batch per provider.
+        '''
+        return self._check_uploads(self._upload_grouped(blobs,
+                                                        'upload_frames'))
+
+    @staticmethod
+    def _check_uploads(results):
+        for status in results:
+            if isinstance(status, Exception):
+                raise RuntimeError('Unsuccessful upload.') from status
+        return results
+
+    def _upload_grouped(self, blobs, method):
+        ''' Sends each blob to all of its owners, calling method on each
+        owner with its blobs (in their original order). Returns a list of
+        euids or exceptions, as per upload_many.
+        '''
+        blobs = list(blobs)
+        results = [None] * len(blobs)
+        batches = collections.OrderedDict()
+        for ii, bites in enumerate(blobs):
+            try:
+                euid, home, author = self._placement(bites)
+                owners = self.owners(home)
+                if not owners:
+                    raise RuntimeError('No storage providers.')
+                if author is not None:
+                    self._place_author(author, owners)
+                    self._remember_frames(home, [euid])
+            except Exception as exc:
+                results[ii] = exc
+                continue
+            for name in owners:
+                batches.setdefault(name, []).append(ii)
+
+        for name, indices in batches.items():
+            batch = [blobs[ii] for ii in indices]
+            try:
+                statuses = getattr(self._providers[name], method)(batch)
+            except Exception as exc:
+                statuses = [exc] * len(batch)
+            for ii, status in zip(indices, statuses):
+                if isinstance(results[ii], Exception):
+                    continue
+                if isinstance(status, Exception):
+                    results[ii] = status
+                elif results[ii] is not None and status != results[ii]:
+                    results[ii] = RuntimeError('Unsuccessful upload. EUID '
+                                               'verification mismatch.')
+                else:
+                    results[ii] = status
+        return results
+
+    def download(self, euid):
+        ''' Downloads the object from its owners, and then (with fallback)
+        from everyone else. Returns None if nobody has it.
+        '''
+        for name in self._candidates(euid):
+            bites = self._providers[name].download(euid)
+            if bites and erasure.matches_address(bites, euid):
+                return bites
+        return None
+
+    def download_many(self, euids):
+        ''' Downloads the objects in one batch per owning provider.
+        '''
+        def request(storage_provider, batch):
+            found = storage_provider.download_many(batch)
+            return [found.get(euid) if erasure.matches_address(
+                        found.get(euid), euid) else None
+                    for euid in batch]
+        return self._routed(euids, lambda euid: euid, request)
+
+    def download_range(self, euid, offset, length):
+        ''' Reads the range from the object's owners.
+        '''
+        return self.download_ranges([(euid, offset, length)])[0]
+
+    def download_ranges(self, ranges):
+        ''' Reads the ranges in one batch per owning provider.
+        '''
+        def request(storage_provider, batch):
+            return storage_provider.download_ranges(batch)
+        ranges = list(ranges)
+        found = self._routed(ranges, lambda key: key[0], request)
+        return [found[key] for key in ranges]
+
+    def _routed(self, keys, address_of, request):
+        ''' Routes a batch of keys to the providers for their addresses:
+        each key goes to its first candidate, and anything that comes back
+        None moves on to its next candidate. request(storage_provider,
+        batch) returns a list of results in the same order as batch.
+        Returns a dict of key: result, with None for anything not found.
+        '''
+        results = dict.fromkeys(keys)
+        candidates = {key: self._candidates(address_of(key))
+                      for key in results}
+        pending = list(results)
+        while pending:
+            batches = collections.OrderedDict()
+            for key in pending:
+                if candidates[key]:
+                    batches.setdefault(candidates[key].pop(0), []).append(key)
+            pending = []
+            for name, batch in batches.items():
+                try:
+                    found = request(self._providers[name], batch)
+                except Exception:
+                    found = [None] * len(batch)
+                for key, result in zip(batch, found):
+                    if result is not None:
+                        results[key] = result
+                    else:
+                        pending.append(key)
+        return results
+
+    def list_frames(self, dynamic_ref):
+        ''' Lists the frames from the first owner of the dynamic reference
+        that knows it.
+        '''
+        for name in self._candidates(dynamic_ref):
+            try:
+                frames = self._providers[name].list_frames(dynamic_ref)
+            except RuntimeError:
+                continue
+            if frames:
+                frames = list(frames)
+                self._remember_frames(dynamic_ref, frames)
+                return frames
+        raise RuntimeError('Failed to find the given dynamic reference at any '
+                           'of the storage providers.')
+
+    def head(self, dynamic_ref):
+        ''' Asks the owners of the dynamic reference for its head.
+        '''
+        for name in self._candidates(dynamic_ref):
+            head = self._providers[name].head(dynamic_ref)
+            if head:
+                self._remember_frames(dynamic_ref, [head])
+                return head
+        return None
+
+    def list_frames_since(self, dynamic_ref, known_head):
+        ''' Asks the owners of the dynamic reference for its new frames.
+        '''
+        for name in self._candidates(dynamic_ref):
+            frames = self._providers[name].list_frames_since(dynamic_ref,
+                                                             known_head)
+            if frames is not None:
+                self._remember_frames(dynamic_ref, frames)
+                return frames
+        return None
+
+    def iter_euids(self, prefix=b''):
+        ''' Yields every euid held by any provider, once.
+        '''
+        yield from self._iter_once('iter_euids', prefix)
+
+    def iter_references(self, prefix=b''):
+        ''' Yields every dynamic reference held by any provider, once.
+        '''
+        yield from self._iter_once('iter_references', prefix)
+
+    def _iter_once(self, method, prefix, batch_size=256):
+        ''' Yields every address that method (iter_euids or 
+        iter_references) finds on any provider, once, without remembering 
+        everything yielded so far. Instead, an address is only yielded by
+        the first provider holding it, in ring order from the address, 
+        which costs one ping_many per earlier provider per batch.
+        '''
+        # Both get replaced wholesale by a rebalance, so hang on to these.
+        ring = self._ring
+        providers = self._providers
+        for name, storage_provider in providers.items():
+            addresses = getattr(storage_provider, method)(prefix)
+            while True:
+                batch = list(itertools.islice(addresses, batch_size))
+                if not batch:
+                    break
+                # earlier provider name: addresses to ask it about
+                checks = {}
+                for address in batch:
+                    order = self._owners_on(ring, address, len(providers))
+                    for earlier in order[:order.index(name)]:
+                        checks.setdefault(earlier, []).append(address)
+                held = set()
+                for earlier, asking in checks.items():
+                    statuses = providers[earlier].ping_many(asking)
+                    held.update(address for address, status 
+                                in zip(asking, statuses) if status)
+                for address in batch:
+                    if address not in held:
+                        yield address
+
+    def delete(self, address):
+        ''' Deletes the address from every provider (not just its owners,
+        in case of strays).
+        '''
+        for storage_provider in self.storage_providers:
+            storage_provider.delete(address)
+
+    def add_provider(self, name, storage_provider, rebalance=True):
+        ''' Adds a provider to the ring, and (unless rebalance is False)
+        moves onto it everything it now owns. Returns the result of
+        rebalancing (see there).
+        '''
+        with self._lock:
+            if name in self._providers:
+                raise ValueError('Provider names must be unique.')
+            providers = dict(self._providers)
+            providers[name] = storage_provider
+        return self._reshape(providers, providers, rebalance)
+
+    def remove_provider(self, name, rebalance=True):
+        ''' Removes a provider from the ring, first (unless rebalance is
+        False) moving everything it owned onto its new owners. Returns the
+        result of rebalancing (see there).
+        '''
+        with self._lock:
+            everyone = dict(self._providers)
+            providers = dict(everyone)
+            del providers[name]
+        return self._reshape(providers, everyone, rebalance)
+
+    def _reshape(self, providers, everyone, rebalance):
+        ''' Switches to the new providers, rebalancing between the old and
+        new rings using everyone (the union of old and new providers).
+        '''
+        old_ring = self._ring
+        new_ring = self._build_ring(providers)
+        result = {'moved': 0, 'failed': []}
+        if rebalance:
+            result = self._rebalance(old_ring, new_ring, everyone)
+        with self._lock:
+            self._providers = providers
+            self._ring = new_ring
+            self._authors = {name: authors for name, authors
+                             in self._authors.items() if name in providers}
+        return result
+
+    def rebalance(self, previous_providers):
+        ''' Moves everything whose owners changed since the providers were
+        previous_providers (a dict of name: provider, as passed to the 
+        constructor), as when the store is reopened with a different set 
+        of providers. Addresses whose owners didn't change aren't touched.
+
+        Returns a dict with the number of addresses 'moved', and a list of
+        those that 'failed' (and were left where they were). Anything 
+        uploaded while rebalancing is already placed by the new ring.
+        '''
+        everyone = dict(previous_providers)
+        everyone.update(self._providers)
+        return self._rebalance(self._build_ring(previous_providers), 
+                               self._ring, everyone)
+
+    def _rebalance(self, old_ring, new_ring, storage_providers):
+        ''' Copies everything whose owners differ between old_ring and
+        new_ring onto its new owners, and then deletes it from the owners
+        it no longer has. storage_providers is a dict of name: provider 
+        for everyone on either ring.
+        '''
+        moved = 0
+        failed = []
+        old_names = list(collections.OrderedDict.fromkeys(old_ring[1]))
+
+        # Dynamic references first, so their frames can be told apart from
+        # static objects.
+        seen = set()
+        frames = set()
+        for name in old_names:
+            source = storage_providers[name]
+            for dynamic_ref in list(source.iter_references()):
+                if dynamic_ref in seen:
+                    continue
+                seen.add(dynamic_ref)
+                try:
+                    framelist = source.list_frames(dynamic_ref)
+                except RuntimeError:
+                    continue
+                frames.update(framelist)
+                old = self._owners_on(old_ring, dynamic_ref)
+                new = self._owners_on(new_ring, dynamic_ref)
+                if old == new:
+                    continue
+                try:
+                    # Frames go oldest first.
+                    blobs = [source.download(euid)
+                             for euid in reversed(framelist)]
+                    if not all(blobs):
+                        raise RuntimeError('Missing frames.')
+                    targets = [target for target in new if target not in old]
+                    self._place_author(
+                        bytes(blobs[0][EICd.header_bits['author']]), targets,
+                        storage_providers)
+                    for target in targets:
+                        storage_providers[target].upload_frames(blobs)
+                    for leaver in old:
+                        if leaver not in new:
+                            storage_providers[leaver].delete(dynamic_ref)
+                except Exception:
+                    failed.append(dynamic_ref)
+                else:
+                    moved += 1
+
+        seen = frames
+        for name in old_names:
+            source = storage_providers[name]
+            for euid in list(source.iter_euids()):
+                if euid in seen:
+                    continue
+                seen.add(euid)
+                old = self._owners_on(old_ring, euid)
+                new = self._owners_on(new_ring, euid)
+                if old == new:
+                    continue
+                try:
+                    bites = source.download(euid)
+                    if not bites:
+                        raise RuntimeError('Missing object.')
+                    for target in new:
+                        if target not in old:
+                            storage_providers[target].upload(bites)
+                    for leaver in old:
+                        if leaver not in new:
+                            storage_providers[leaver].delete(euid)
+                except Exception:
+                    failed.append(euid)
+                else:
+                    moved += 1
+
+        return {'moved': moved, 'failed': failed}
+
+
+class AsyncMemoryStore(AsyncStorageProvider):
+    ''' A natively asynchronous storage provider contained within a python
+    object. Mostly useful for testing the asyncio code paths without an 
+    executor in the way.
+    '''
+    def __init__(self):
+        # Do all of the actual bookkeeping with a normal memory store.
+        self._memstore = MemoryStore()
+
+    @property
+    def store(self):
+        ''' Read-only property exposing the underlying euid: bites dict.
+        '''
+        return self._memstore.store
+
+    async def ping(self, address):
+        ''' Checks self for the address (euid or dynamic reference).
+        '''
+        return self._memstore.ping(address)
+
+    async def upload(self, bites):
+        ''' Stores the object.
+        '''
+        return self._memstore.upload(bites)
+
+    async def download(self, euid):
+        ''' Retrieves an object. If the object does not exist, return None.
+        '''
+        return self._memstore.download(euid)
+
+    async def list_frames(self, dynamic_ref):
+        ''' Returns the frames for the dynamic reference, sorted from most 
+        recent [0] to oldest [n].
+        '''
+        return self._memstore.list_frames(dynamic_ref)
+
+    def subscribe(self, dynamic_refs=None, callback=None):
+        ''' Subscribes to new frames. The returned Subscription can be 
+        awaited with get_async(), or iterated over with async for.
+        '''
+        return self._memstore.subscribe(dynamic_refs, callback)
+
+
+def sync(store_a, store_b, threshold=64, batch_size=256):
+    ''' Anti-entropy reconciliation between two storage providers. Copies
+    whatever either one holds that the other doesn't, in both directions,
+    without listing everything: both sides are summarized as trees of 
+    euid prefixes (see StorageProvider.summarize), and only the branches 
+    whose summaries differ are walked down to, and listed, so finding d 
+    differences compares and lists O(d log n) buckets. Each summary still
+    rescans its side's euids under the prefix, though, so every level 
+    walked costs O(n) on both sides.
+
+    Dynamic references are reconciled first, by comparing heads: the side
+    that's behind gets the missing frames, oldest first, so that they 
+    chain onto what it has. A side that doesn't know the reference at all
+    adopts the other side's buffer (see upload_frames), so both replicas 
+    are trusted. Static objects are reconciled afterwards; leftover 
+    frames (those evicted on one side but not the other) are left alone.
+
+    Returns a dict with the number of objects copied 'a_to_b' and 
+    'b_to_a', a list of dynamic references in 'conflicts' (forked, or 
+    with one side so far behind that its head was evicted on the other), 
+    and a list of addresses that 'failed' to copy.
+    '''
+    result = {'a_to_b': 0, 'b_to_a': 0, 'conflicts': [], 'failed': []}
+
+    heads_a, heads_b = _reconcile(store_a.summarize_heads, 
+                                  store_b.summarize_heads, 
+                                  store_a.list_heads, store_b.list_heads, 
+                                  threshold)
+    for dynamic_ref in sorted(set(heads_a) | set(heads_b)):
+        head_a = heads_a.get(dynamic_ref)
+        head_b = heads_b.get(dynamic_ref)
+        try:
+            if head_b is None:
+                frames = store_a.list_frames(dynamic_ref)
+                result['a_to_b'] += _copy_frames(frames, store_a, store_b)
+                continue
+            if head_a is None:
+                frames = store_b.list_frames(dynamic_ref)
+                result['b_to_a'] += _copy_frames(frames, store_b, store_a)
+                continue
+            frames = store_a.list_frames(dynamic_ref)
+            if head_b in frames:
+                frames = frames[:frames.index(head_b)]
+                result['a_to_b'] += _copy_frames(frames, store_a, store_b)
+                continue
+            frames = store_b.list_frames(dynamic_ref)
+            if head_a in frames:
+                frames = frames[:frames.index(head_a)]
+                result['b_to_a'] += _copy_frames(frames, store_b, store_a)
+                continue
+        except RuntimeError:
+            result['failed'].append(dynamic_ref)
+        else:
+            result['conflicts'].append(dynamic_ref)
+
+    def lister(store):
+        return lambda prefix: dict.fromkeys(store.iter_euids(prefix))
+
+    euids_a, euids_b = _reconcile(store_a.summarize, store_b.summarize, 
+                                  lister(store_a), lister(store_b), 
+                                  threshold)
+    result['a_to_b'] += _copy_statics(list(euids_a), store_a, store_b, 
+                                      batch_size, result['failed'])
+    result['b_to_a'] += _copy_statics(list(euids_b), store_b, store_a, 
+                                      batch_size, result['failed'])
+    return result
+
+
+def _reconcile(summarize_a, summarize_b, list_a, list_b, threshold):
+    ''' Walks the prefix trees of two summaries (as from summarize()) down
+    to wherever they differ, until the differing buckets are empty on one
+    side or hold no more than threshold entries, and then lists those 
+    buckets on both sides with list_a and list_b (which return dicts of 
+    key: value). Returns two dicts of key: value, one for each side, 
+    holding only the entries that the other side doesn't have.
+    '''
+    buckets = []
+    pending = [b'']
+    while pending:
+        prefix = pending.pop()
+        for byte, (bucket_a, bucket_b) in enumerate(zip(summarize_a(prefix),
+                                                        summarize_b(prefix))):
+            if bucket_a == bucket_b:
+                continue
+            child = prefix + bytes([byte])
+            counts = bucket_a[0], bucket_b[0]
+            if not min(counts) or max(counts) <= threshold or \
+                    len(child) >= 64:
+                buckets.append(child)
+            else:
+                pending.append(child)
+
+    only_a = {}
+    only_b = {}
+    for prefix in buckets:
+        entries_a = list_a(prefix)
+        entries_b = list_b(prefix)
+        for key, value in entries_a.items():
+            if key not in entries_b or entries_b[key] != value:
+                only_a[key] = value
+        for key, value in entries_b.items():
+            if key not in entries_a or entries_a[key] != value:
+                only_b[key] = value
+    return only_a, only_b
+
+
+def _copy_frames(frames, source, destination):
+    ''' Copies the frames (most recent first, as from list_frames) from 
+    source to destination, oldest first. Returns the number copied.
+    '''
+    euids = list(reversed(frames))
+    if not euids:
+        return 0
+    found = source.download_many(euids)
+    blobs = [found.get(euid) for euid in euids]
+    if not all(blobs):
+        raise RuntimeError('Missing frames.')
+    destination.upload_frames(blobs)
+    return len(blobs)
+
+
+def _copy_statics(euids, source, destination, batch_size, failed):
+    ''' Copies the static objects among euids from source to destination,
+    in batches, appending any failures to failed. EICd frames are skipped
+    (they're copied by reference). Returns the number copied.
+    '''
+    copied = 0
+    magic = EICd.header_bits['magic']
+    for ii in range(0, len(euids), batch_size):
+        batch = euids[ii:ii + batch_size]
+        # Peek at the magic numbers first, so frames never get downloaded.
+        peeks = source.download_ranges([(euid, magic.start, 
+                                         magic.stop - magic.start) 
+                                        for euid in batch])
+        batch = [euid for euid, peek in zip(batch, peeks) 
+                 if peek is None or bytes(peek) != EICd.magic]
+        found = source.download_many(batch)
+        # The destination verifies everything it's sent, and answers with 
+        # the address it stored it under.
+        failed.extend(euid for euid in batch if not found.get(euid))
+        batch = [euid for euid in batch if found.get(euid)]
+        statuses = destination.upload_many([found[euid] for euid in batch])
+        for euid, status in zip(batch, statuses):
+            if status == euid:
+                copied += 1
+            else:
+                failed.append(euid)
+    return copied
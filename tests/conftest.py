@@ -0,0 +1,46 @@
+''' Shared fixtures for the test suite.
+
+Everything is authored by the bootstrap identity, so that signatures can be
+checked without pushing an identity anywhere first.
+'''
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from eic import core
+
+
+SYM_KEY = bytes(32)
+
+
+@pytest.fixture
+def build_eics():
+    ''' Returns a function that builds the ii-th test EICs (padded out by
+    size bytes per index), returning a tuple of (EICs, finished bytes).
+    '''
+    def build(ii, size=100):
+        eics = core.EICs(core.AUTHOR_BOOTSTRAP,
+                         d={b'index': str(ii).encode(),
+                            b'padding': bytes(size * ii)})
+        return eics, eics._build(SYM_KEY, core._AUTHOR_BOOTSTRAP_PRIVKEY)
+    return build
+
+
+@pytest.fixture
+def build_chain():
+    ''' Returns a function that commits count frames to a new EICd,
+    returning a tuple of (EICd, list of finished frames, oldest first).
+    The tag makes each chain's dynamic reference distinct.
+    '''
+    def build(count, buffer_req=4, tag=b'frame'):
+        eicd = core.EICd(core.AUTHOR_BOOTSTRAP, buffer_req)
+        frames = []
+        for ii in range(count):
+            eicd.content = tag + str(ii).encode()
+            eicd.commit(SYM_KEY, core._AUTHOR_BOOTSTRAP_PRIVKEY)
+            frames.append(eicd.history[eicd._index]['built'])
+        return eicd, frames
+    return build
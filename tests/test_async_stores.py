@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from eic import core
+from eic.stores import AsyncMemoryStore, MemoryStore
+
+from conftest import SYM_KEY
+
+
+class SlowStore(AsyncMemoryStore):
+    ''' Takes its time over every download.
+    '''
+    async def download(self, euid):
+        await asyncio.sleep(.5)
+        return await super().download(euid)
+
+
+class BrokenStore(AsyncMemoryStore):
+    async def download(self, euid):
+        raise IOError('Unreachable.')
+
+
+def test_eics_round_trip():
+    stores = [AsyncMemoryStore(), MemoryStore()]
+
+    async def run():
+        eics = core.EICs(core.AUTHOR_BOOTSTRAP, d={b'hello': b'world'})
+        euid = await eics.push_async(SYM_KEY, core._AUTHOR_BOOTSTRAP_PRIVKEY,
+                                     stores)
+        assert await core.AsyncStorageProvider.ping_multi(euid, stores) \
+            == b's'
+        return await core.EICs.fetch_async(euid, SYM_KEY, stores)
+
+    assert asyncio.run(run())[b'hello'] == b'world'
+    # The synchronous store was adapted, not skipped
+    assert len(stores[1].store) == 1
+
+
+def test_eicd_round_trip():
+    store = AsyncMemoryStore()
+
+    async def run():
+        eicd = core.EICd(core.AUTHOR_BOOTSTRAP, 3)
+        for ii in range(3):
+            eicd.content = b'frame %d' % ii
+            eicd.commit(SYM_KEY, core._AUTHOR_BOOTSTRAP_PRIVKEY)
+            await eicd.push_async([store])
+        return await core.EICd.fetch_async(eicd.dynamic_ref, SYM_KEY, 
+                                           [store])
+
+    assert asyncio.run(run()).content == b'frame 2'
+
+
+def test_poll_euid_takes_first_answer(build_eics):
+    __, bites = build_eics(0)
+    fast = AsyncMemoryStore()
+    slow = SlowStore()
+    broken = BrokenStore()
+
+    async def run():
+        euid = await fast.upload(bites)
+        await slow.upload(bites)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        found = await core.AsyncStorageProvider.poll_euid(
+            euid, [broken, slow, fast])
+        return found, loop.time() - start
+
+    found, elapsed = asyncio.run(run())
+    assert found == bites
+    assert elapsed < .5
+
+
+def test_poll_euid_missing():
+    async def run():
+        await core.AsyncStorageProvider.poll_euid(
+            bytes(64), [AsyncMemoryStore(), AsyncMemoryStore()])
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+
+
+def test_poll_euid_all_broken():
+    async def run():
+        await core.AsyncStorageProvider.poll_euid(
+            bytes(64), [BrokenStore(), BrokenStore()])
+
+    with pytest.raises(IOError):
+        asyncio.run(run())
@@ -0,0 +1,53 @@
+import pytest
+
+from eic import core
+from eic.stores import MemoryStore
+
+
+def test_get_loads_each_author_once():
+    cache = core.AuthorKeyCache()
+    pubkey = cache.get(core.AUTHOR_BOOTSTRAP, [])
+    assert cache.get(core.AUTHOR_BOOTSTRAP, []) is pubkey
+    assert cache.stats() == {'size': 1, 'maxsize': 256, 'hits': 1,
+                             'misses': 1}
+
+
+def test_evicts_least_recently_used():
+    cache = core.AuthorKeyCache(maxsize=2)
+    cache.put(b'a' * 64, 'a')
+    cache.put(b'b' * 64, 'b')
+    # Touching a makes b the oldest
+    assert cache.lookup(b'a' * 64) == 'a'
+    cache.put(b'c' * 64, 'c')
+    assert cache.lookup(b'b' * 64) is None
+    assert cache.lookup(b'a' * 64) == 'a'
+    assert cache.lookup(b'c' * 64) == 'c'
+
+
+def test_invalidate():
+    cache = core.AuthorKeyCache()
+    cache.put(b'a' * 64, 'a')
+    cache.put(b'b' * 64, 'b')
+    cache.invalidate(b'a' * 64)
+    assert cache.lookup(b'a' * 64) is None
+    assert cache.lookup(b'b' * 64) == 'b'
+    cache.invalidate()
+    assert cache.stats()['size'] == 0
+    # Counters survive invalidation
+    assert cache.stats()['hits'] == 1
+
+
+def test_rejects_empty_cache():
+    with pytest.raises(ValueError):
+        core.AuthorKeyCache(maxsize=0)
+
+
+def test_shared_by_uploads(build_chain):
+    __, frames = build_chain(3)
+    core.AUTHOR_KEY_CACHE.invalidate()
+    misses = core.AUTHOR_KEY_CACHE.stats()['misses']
+    store = MemoryStore()
+    for frame in frames:
+        store.upload(frame)
+    # Only the first frame needed the key loading
+    assert core.AUTHOR_KEY_CACHE.stats()['misses'] == misses + 1
@@ -0,0 +1,74 @@
+import pytest
+
+from eic import core
+from eic.stores import MemoryStore
+
+
+class CountingStore(MemoryStore):
+    ''' Counts batch round trips.
+    '''
+    def __init__(self):
+        super().__init__()
+        self.batches = 0
+
+    def download_many(self, euids):
+        self.batches += 1
+        return super().download_many(euids)
+
+
+def test_ping_many(build_eics, build_chain):
+    store = MemoryStore()
+    euid = store.upload(build_eics(1)[1])
+    eicd, frames = build_chain(2)
+    for frame in frames:
+        store.upload(frame)
+    assert store.ping_many([euid, eicd.dynamic_ref, bytes(64)]) == \
+        [b's', b'd', False]
+
+
+def test_upload_many_reports_each_failure(build_eics):
+    blobs = [build_eics(ii)[1] for ii in range(3)]
+    corrupt = bytearray(blobs[1])
+    corrupt[-1] ^= 1
+    results = MemoryStore().upload_many([blobs[0], bytes(corrupt), blobs[2]])
+    assert isinstance(results[1], Exception)
+    assert results[0] == blobs[0][520:584]
+    assert results[2] == blobs[2][520:584]
+
+
+def test_distribute_many(build_eics):
+    blobs = [build_eics(ii)[1] for ii in range(4)]
+    euids = [bites[520:584] for bites in blobs]
+    stores = [MemoryStore(), MemoryStore()]
+    assert core.StorageProvider.distribute_many(blobs, stores, euids) == euids
+    for store in stores:
+        assert store.download_many(euids) == dict(zip(euids, blobs))
+    with pytest.raises(ValueError):
+        core.StorageProvider.distribute_many(blobs, stores, euids[1:])
+    with pytest.raises(RuntimeError):
+        core.StorageProvider.distribute_many([b'not an eic' * 100], stores)
+
+
+def test_poll_euids_asks_for_leftovers(build_eics):
+    blobs = [build_eics(ii)[1] for ii in range(6)]
+    first = CountingStore()
+    second = CountingStore()
+    third = CountingStore()
+    euids = first.upload_many(blobs[:4]) + second.upload_many(blobs[4:])
+    found = core.StorageProvider.poll_euids(euids + euids[:1], 
+                                            [first, second, third])
+    assert found == dict(zip(euids, blobs))
+    assert (first.batches, second.batches, third.batches) == (1, 1, 0)
+    with pytest.raises(RuntimeError):
+        core.StorageProvider.poll_euids([bytes(64)], [first, second])
+
+
+def test_batches_are_metered_per_item(build_eics):
+    store = MemoryStore()
+    euids = store.upload_many([build_eics(ii)[1] for ii in range(2)])
+    selector = core.ProviderSelector([store], decay=1)
+    selector.every()[0].download_many(euids + [bytes(64), bytes(63) + b'1'])
+    stats = selector.stats()[0]
+    assert stats['calls'] == 1
+    assert stats['hit_rate'] == .5
+    assert stats['error_rate'] == 0
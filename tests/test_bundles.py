@@ -0,0 +1,110 @@
+import io
+
+import pytest
+
+from eic import core
+from eic import erasure
+from eic.bundles import export_bundle
+from eic.bundles import import_bundle
+from eic.bundles import read_bundle_index
+from eic.stores import MemoryStore
+from eic.stores import SQLiteStore
+
+
+class Pipe:
+    ''' A read-only, non-seekable stream, as from a pipe.
+    '''
+    def __init__(self, bites):
+        self._buffer = io.BytesIO(bites)
+
+    def read(self, size=-1):
+        return self._buffer.read(size)
+
+
+@pytest.fixture
+def source(build_eics, build_chain):
+    store = MemoryStore()
+    store.upload_many([build_eics(ii)[1] for ii in range(10)])
+    __, bites = build_eics(11)
+    store.upload_many(erasure.encode(bites, bites[520:584], 2, 3))
+    for tag in (b'first', b'second'):
+        __, frames = build_chain(6, buffer_req=3, tag=tag)
+        store.upload_frames(frames)
+    return store
+
+
+def _export(store, batch_size=256):
+    fileobj = io.BytesIO()
+    result = export_bundle(store, fileobj, batch_size=batch_size)
+    return result, fileobj.getvalue()
+
+
+def test_round_trip(source, tmp_path):
+    result, bundle = _export(source, batch_size=4)
+    assert result == {'objects': 19, 'references': 2, 'failed': []}
+
+    objects, references = read_bundle_index(io.BytesIO(bundle))
+    assert set(objects) == set(source.iter_euids())
+    for euid, (offset, length) in objects.items():
+        assert bundle[offset:offset + length] == source.download(euid)
+    assert references == {
+        dynamic_ref: list(reversed(source.list_frames(dynamic_ref)))
+        for dynamic_ref in source.iter_references()}
+
+    destination = SQLiteStore(str(tmp_path / 'eic.db'))
+    result = import_bundle(Pipe(bundle), destination, batch_size=4, 
+                           workers=2)
+    assert result == {'imported': 19, 'failed': []}
+    assert set(destination.iter_euids()) == set(source.iter_euids())
+    assert destination.list_heads() == source.list_heads()
+
+
+def test_verifies_each_object_once(source, monkeypatch):
+    __, bundle = _export(source)
+    verified = []
+    for eic_class in (core.EICa, core.EICs, core.EICd):
+        def counting_verify(cls, bites, euid=None, 
+                            verify_public=eic_class.verify_public.__func__):
+            verified.append(bytes(bites[520:584]))
+            return verify_public(cls, bites, euid=euid)
+        monkeypatch.setattr(eic_class, 'verify_public', 
+                            classmethod(counting_verify))
+
+    destination = MemoryStore()
+    result = import_bundle(Pipe(bundle), destination, batch_size=4)
+    assert result == {'imported': 19, 'failed': []}
+    # Everything but the shards, once each
+    assert sorted(verified) == sorted(
+        euid for euid in source.iter_euids() 
+        if source.download(euid)[:4] != erasure.magic)
+
+
+def test_counts_corrupt_records(source):
+    __, bundle = _export(source)
+    objects, __ = read_bundle_index(io.BytesIO(bundle))
+    static = [euid for euid in objects if source.ping(euid) == b's']
+    bundle = bytearray(bundle)
+    for euid in static[:2]:
+        offset, length = objects[euid]
+        bundle[offset + length - 1] ^= 0xff
+
+    destination = MemoryStore()
+    result = import_bundle(Pipe(bytes(bundle)), destination)
+    assert result['imported'] == 17
+    assert sorted(result['failed']) == sorted(static[:2])
+    assert not any(destination.ping(euid) for euid in static[:2])
+
+
+def test_rejects_truncated_bundles(source):
+    __, bundle = _export(source)
+    objects, __ = read_bundle_index(io.BytesIO(bundle))
+    end = max(offset + length for offset, length in objects.values())
+    with pytest.raises(RuntimeError):
+        import_bundle(Pipe(bundle[:end - 10]), MemoryStore())
+    with pytest.raises(RuntimeError):
+        read_bundle_index(io.BytesIO(bundle[:-10]))
+
+
+def test_rejects_other_files():
+    with pytest.raises(RuntimeError):
+        import_bundle(Pipe(b'NOTABNDL' + bytes(8)), MemoryStore())
@@ -0,0 +1,137 @@
+import time
+
+from eic.stores import CachingStore
+from eic.stores import MemoryStore
+
+
+class CountingStore(MemoryStore):
+    def __init__(self):
+        super().__init__()
+        self.downloads = 0
+        self.listings = 0
+
+    def download(self, euid):
+        self.downloads += 1
+        return super().download(euid)
+
+    def download_many(self, euids):
+        self.downloads += 1
+        return super().download_many(euids)
+
+    def list_frames(self, dynamic_ref):
+        self.listings += 1
+        return super().list_frames(dynamic_ref)
+
+
+class CorruptStore(MemoryStore):
+    def download(self, euid):
+        bites = super().download(euid)
+        if bites is not None:
+            bites = bites[:-1] + bytes([bites[-1] ^ 1])
+        return bites
+
+
+def test_caches_downloads(build_eics):
+    upstream = CountingStore()
+    cache = CachingStore([upstream])
+    __, bites = build_eics(1)
+    euid = cache.upload(bites)
+    assert cache.download(euid) == bites
+    assert cache.download(euid) == bites
+    assert cache.download_many([euid]) == {euid: bites}
+    assert upstream.downloads == 1
+    assert cache.stats()['hits'] == 2
+    assert cache.download_range(euid, 520, 64) == euid
+
+
+def test_remembers_misses():
+    upstream = CountingStore()
+    cache = CachingStore([upstream], miss_ttl=.1)
+    assert cache.download(bytes(64)) is None
+    assert cache.download(bytes(64)) is None
+    assert upstream.downloads == 1
+    time.sleep(.15)
+    assert cache.download(bytes(64)) is None
+    assert upstream.downloads == 2
+
+
+def test_upload_clears_miss(build_eics):
+    upstream = MemoryStore()
+    cache = CachingStore([upstream])
+    __, bites = build_eics(1)
+    euid = bites[520:584]
+    assert cache.download(euid) is None
+    cache.upload(bites)
+    assert cache.download(euid) == bites
+
+
+def test_skips_corrupt_copies(build_eics):
+    corrupt = CorruptStore()
+    good = MemoryStore()
+    __, bites = build_eics(1)
+    euid = corrupt.upload(bites)
+    good.upload(bites)
+    cache = CachingStore([corrupt, good])
+    assert cache.download(euid) == bites
+    assert cache.download_many([euid]) == {euid: bites}
+
+
+def test_frame_lists_expire(build_chain):
+    upstream = CountingStore()
+    cache = CachingStore([upstream], frame_ttl=.1)
+    eicd, frames = build_chain(3)
+    for frame in frames[:2]:
+        upstream.upload(frame)
+    assert len(cache.list_frames(eicd.dynamic_ref)) == 2
+    # Behind the cache's back, so it can't know
+    upstream.upload(frames[2])
+    assert len(cache.list_frames(eicd.dynamic_ref)) == 2
+    assert upstream.listings == 1
+    time.sleep(.15)
+    assert cache.list_frames(eicd.dynamic_ref)[0] == frames[2][520:584]
+
+
+def test_upload_refreshes_frame_list(build_chain):
+    upstream = MemoryStore()
+    cache = CachingStore([upstream], frame_ttl=60)
+    eicd, frames = build_chain(3)
+    for frame in frames[:2]:
+        cache.upload(frame)
+    cache.list_frames(eicd.dynamic_ref)
+    cache.upload(frames[2])
+    assert cache.head(eicd.dynamic_ref) == frames[2][520:584]
+
+
+def test_byte_budget(build_eics):
+    blobs = [build_eics(ii)[1] for ii in range(3)]
+    upstream = MemoryStore()
+    euids = upstream.upload_many(blobs)
+    cache = CachingStore([upstream], max_bytes=len(blobs[1]) + len(blobs[2]))
+    for euid in euids:
+        cache.download(euid)
+    stats = cache.stats()
+    assert stats['bytes'] <= stats['max_bytes']
+    assert stats['evictions'] == 1
+    cache.invalidate()
+    assert cache.stats()['objects'] == 0
+
+
+def test_empty_ranges_arent_misses(build_eics):
+    upstream = MemoryStore()
+    __, bites = build_eics(1)
+    euid = upstream.upload(bites)
+    cache = CachingStore([upstream])
+    results = cache.download_ranges([(euid, len(bites), 4), (euid, 0, 0)])
+    assert [bytes(result) for result in results] == [b'', b'']
+    assert cache.ping(euid) == b's'
+    assert cache.download(euid) == bites
+
+
+def test_range_misses_arent_remembered(build_eics):
+    upstream = MemoryStore()
+    cache = CachingStore([upstream])
+    __, bites = build_eics(1)
+    euid = bites[520:584]
+    assert cache.download_range(euid, 0, 4) is None
+    upstream.upload(bites)
+    assert cache.download(euid) == bites
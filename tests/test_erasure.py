@@ -0,0 +1,169 @@
+import itertools
+
+import pytest
+
+from eic import core
+from eic import erasure
+from eic.stores import CachingStore
+from eic.stores import FileStore
+from eic.stores import MemoryStore
+from eic.stores import PackStore
+
+
+@pytest.mark.parametrize('length', [0, 1, 999, 1000])
+def test_any_k_shards_rebuild(length):
+    bites = bytes(range(256)) * 4
+    bites = bites[:length]
+    euid = core.EICBase._hash(bites)
+    shards = [erasure.unpack_shard(shard) 
+              for shard in erasure.encode(bites, euid, 3, 5)]
+    for subset in itertools.combinations(shards, 3):
+        assert erasure.decode(subset) == bites
+    with pytest.raises(ValueError):
+        erasure.decode(shards[:2])
+
+
+def test_rejects_bad_parameters():
+    with pytest.raises(ValueError):
+        erasure.encode(b'hello', bytes(64), 3, 2)
+    with pytest.raises(ValueError):
+        erasure.encode(b'hello', bytes(64), 0, 2)
+
+
+def test_rejects_corrupt_shards():
+    shard = bytearray(erasure.encode(b'hello world', bytes(64), 2, 3)[0])
+    erasure.unpack_shard(bytes(shard))
+    shard[-1] ^= 1
+    with pytest.raises(RuntimeError):
+        erasure.unpack_shard(bytes(shard))
+    with pytest.raises(RuntimeError):
+        erasure.unpack_shard(b'eicx')
+
+
+def test_matches_address(build_eics):
+    __, bites = build_eics(1)
+    euid = bites[520:584]
+    shard = erasure.encode(bites, euid, 2, 3)[1]
+    assert erasure.matches_address(shard, erasure.shard_address(euid, 1))
+    assert not erasure.matches_address(shard, erasure.shard_address(euid, 0))
+    assert not erasure.matches_address(shard[:-1], 
+                                       erasure.shard_address(euid, 1))
+    assert erasure.matches_address(bites, euid)
+    assert not erasure.matches_address(bites, bytes(64))
+    assert not erasure.matches_address(None, euid)
+
+
+def test_recovers_from_lost_providers(build_eics):
+    __, bites = build_eics(20)
+    stores = [MemoryStore() for __ in range(5)]
+    euid = erasure.distribute_coded(bites, stores, 3, 5)
+    assert all(len(store.store) == 1 for store in stores)
+
+    stores[0].store.clear()
+    stores[3].store.clear()
+    assert erasure.poll_euid_coded(euid, stores, 5) == bites
+
+    stores[4].store.clear()
+    with pytest.raises(RuntimeError):
+        erasure.poll_euid_coded(euid, stores, 5)
+
+
+def test_rejects_files_not_matching_euid(build_eics):
+    __, bites = build_eics(1)
+    with pytest.raises(RuntimeError):
+        erasure.distribute_coded(bites, [MemoryStore()], 2, 3, 
+                                 euid=bytes(64))
+
+
+def _poisoned(bites):
+    ''' Distributes bites over three stores, then replaces shard 0 at home
+    with a self-consistent one that doesn't belong to the file (leaving 
+    the only good copy elsewhere), and loses shard 2, so that the good 
+    copy is needed. Returns (stores, euid, shard 0's address, good shard 
+    0, bogus shard 0).
+    '''
+    stores = [MemoryStore() for __ in range(3)]
+    euid = erasure.distribute_coded(bites, stores, 2, 3)
+    first = erasure.shard_address(euid, 0)
+    right = stores[0].store[first]
+    bogus = erasure._pack_shard(euid, 0, 2, 3, len(bites), 
+                                b'\x01' * (len(right) - erasure.header_size))
+    stores[0].store[first] = bogus
+    stores[2].store.clear()
+    stores[2].upload(right)
+    return stores, euid, first, right, bogus
+
+
+def test_recovers_from_bogus_shards(build_eics):
+    __, bites = build_eics(20)
+    stores, euid, first, right, bogus = _poisoned(bites)
+    assert erasure.poll_euid_coded(euid, stores, 3) == bites
+    assert stores[0].store[first] == bogus
+    assert erasure.poll_euid_coded(euid, stores, 3, repair=True) == bites
+    assert stores[0].store[first] == right
+
+
+def test_gives_up_after_max_attempts(build_eics):
+    __, bites = build_eics(20)
+    stores, euid, __, __, __ = _poisoned(bites)
+    with pytest.raises(RuntimeError):
+        erasure.poll_euid_coded(euid, stores, 3, max_attempts=1)
+
+
+def test_caps_subsets_enumerated(monkeypatch):
+    # None of these rebuild the euid, and there are far too many subsets of
+    # 20 out of 40 to ever get through.
+    shards = erasure.encode(bytes(range(200)), bytes(64), 20, 40)
+    candidates = {index: [(erasure.unpack_shard(shard), [])] 
+                  for index, shard in enumerate(shards)}
+    enumerated = []
+    combinations = itertools.combinations
+
+    def counting_combinations(iterable, r):
+        for subset in combinations(iterable, r):
+            enumerated.append(subset)
+            yield subset
+    monkeypatch.setattr(itertools, 'combinations', counting_combinations)
+
+    for newest in (39, None):
+        del enumerated[:]
+        attempts = [50]
+        assert erasure._rebuild(candidates, bytes(64), attempts, 
+                                newest=newest) is None
+        assert attempts == [0]
+        assert len(enumerated) <= 50
+
+
+def test_shards_survive_disk(tmp_path, build_eics):
+    __, bites = build_eics(20)
+    directory = str(tmp_path)
+    file_store = FileStore(directory + '/file')
+    pack_store = PackStore(directory + '/pack')
+    memory_store = MemoryStore()
+    stores = [file_store, pack_store, memory_store]
+    euid = erasure.distribute_coded(bites, stores, 2, 3)
+    memory_store.write_to_disk(directory + '/memory')
+    pack_store.close()
+
+    pack_store = PackStore(directory + '/pack')
+    stores = [FileStore(directory + '/file'), pack_store, 
+              MemoryStore.read_from_disk(directory + '/memory')]
+    assert all(len(list(store.iter_euids())) == 1 for store in stores)
+    assert erasure.poll_euid_coded(euid, stores, 3) == bites
+    pack_store.close()
+
+
+def test_coded_reads_through_caching_store(build_eics):
+    __, bites = build_eics(20)
+    upstreams = [MemoryStore() for __ in range(3)]
+    caches = [CachingStore([upstream]) for upstream in upstreams]
+    euid = erasure.distribute_coded(bites, caches, 2, 3)
+    address = erasure.shard_address(euid, 0)
+    assert caches[0].download_many([address])[address] == \
+        upstreams[0].download(address)
+    assert erasure.poll_euid_coded(euid, caches, 3) == bites
+
+    # Whatever got fetched is served from the caches from now on.
+    for upstream in upstreams:
+        upstream.store.clear()
+    assert erasure.poll_euid_coded(euid, caches, 3) == bites
@@ -0,0 +1,73 @@
+from eic import core
+from eic.stores import FileStore
+
+from conftest import SYM_KEY
+
+
+def test_survives_reopening(tmp_path, build_eics, build_chain):
+    store = FileStore(str(tmp_path))
+    euids = [store.upload(build_eics(ii)[1]) for ii in range(5)]
+    eicd, frames = build_chain(6, buffer_req=3)
+    for frame in frames:
+        store.upload(frame)
+
+    store = FileStore(str(tmp_path))
+    assert sorted(store.iter_euids()) == sorted(
+        euids + store.list_frames(eicd.dynamic_ref))
+    assert store.list_frames(eicd.dynamic_ref) == \
+        [frame[520:584] for frame in reversed(frames[3:])]
+    assert core.EICd.fetch(eicd.dynamic_ref, SYM_KEY, [store]).content == \
+        b'frame5'
+    # And the chain carries on where it left off
+    eicd.content = b'more'
+    eicd.commit(SYM_KEY, core._AUTHOR_BOOTSTRAP_PRIVKEY)
+    store.upload(eicd.history[eicd._index]['built'])
+    assert len(store.list_frames(eicd.dynamic_ref)) == 3
+
+
+def test_evicted_frames_are_removed(tmp_path, build_chain):
+    store = FileStore(str(tmp_path))
+    __, frames = build_chain(5, buffer_req=2)
+    for frame in frames:
+        store.upload(frame)
+    assert store.ping(frames[0][520:584]) is False
+    assert len(list(store.iter_euids())) == 2
+
+
+def test_maps_only_large_objects(tmp_path, build_eics):
+    store = FileStore(str(tmp_path), mmap_threshold=2048, map_cache_size=2)
+    small = store.upload(build_eics(0)[1])
+    large = [store.upload(build_eics(ii, size=1000)[1]) for ii in (3, 4, 5)]
+
+    assert isinstance(store.download(small), bytes)
+    views = [store.download(euid) for euid in large]
+    assert all(isinstance(view, memoryview) and view.readonly 
+               for view in views)
+    assert len(store._maps) == 2
+    # Evicted mappings stay good for as long as they're used
+    assert core.EICBase.matches_euid(views[0], large[0])
+    assert store.download(large[2]).obj is views[2].obj
+
+
+def test_delete(tmp_path, build_eics, build_chain):
+    store = FileStore(str(tmp_path), mmap_threshold=0)
+    euid = store.upload(build_eics(1)[1])
+    assert store.download(euid) is not None
+    eicd, frames = build_chain(2)
+    for frame in frames:
+        store.upload(frame)
+
+    store.delete(euid)
+    store.delete(eicd.dynamic_ref)
+    assert store.download(euid) is None
+    assert store.ping(eicd.dynamic_ref) is False
+    assert list(store.iter_euids()) == []
+    assert FileStore(str(tmp_path)).ping(eicd.dynamic_ref) is False
+
+
+def test_iter_euids_by_prefix(tmp_path, build_eics):
+    store = FileStore(str(tmp_path))
+    euids = [store.upload(build_eics(ii)[1]) for ii in range(20)]
+    for prefix in (euids[0][:1], euids[0][:3]):
+        assert sorted(store.iter_euids(prefix)) == sorted(
+            euid for euid in euids if euid.startswith(prefix))
@@ -0,0 +1,115 @@
+import threading
+import time
+
+import pytest
+
+from eic import core
+from eic.stores import MemoryStore
+
+from conftest import SYM_KEY
+
+
+class StalledStore(MemoryStore):
+    ''' Holds every download until released.
+    '''
+    def __init__(self):
+        super().__init__()
+        self.released = threading.Event()
+
+    def download(self, euid):
+        self.released.wait(5)
+        return super().download(euid)
+
+
+class CorruptStore(MemoryStore):
+    ''' Returns a damaged copy of everything.
+    '''
+    def download(self, euid):
+        bites = super().download(euid)
+        if bites is not None:
+            bites = bites[:-1] + bytes([bites[-1] ^ 1])
+        return bites
+
+
+@pytest.fixture
+def stalled():
+    store = StalledStore()
+    yield store
+    store.released.set()
+
+
+def test_fixed_delay():
+    assert core.HedgePolicy(delay=.2).delay == .2
+    with pytest.raises(ValueError):
+        core.HedgePolicy(delay=-1)
+    with pytest.raises(ValueError):
+        core.HedgePolicy(percentile=0)
+
+
+def test_delay_tracks_percentile():
+    hedge = core.HedgePolicy(percentile=50, min_delay=.001, max_delay=1)
+    assert hedge.delay == hedge.default_delay
+    for latency in (.01, .02, .03, .04):
+        hedge.record(latency)
+    assert hedge.delay == .02
+    for __ in range(5):
+        hedge.record(10)
+    # Clamped to max_delay
+    assert hedge.delay == 1
+
+
+def test_hedges_around_stalled_provider(build_eics, stalled):
+    __, bites = build_eics(1)
+    fast = MemoryStore()
+    euid = fast.upload(bites)
+    stalled.upload(bites)
+
+    hedge = core.HedgePolicy(delay=.05)
+    start = time.monotonic()
+    found = core.StorageProvider.poll_euid(euid, [stalled, fast], hedge)
+    assert found == bites
+    assert time.monotonic() - start < 1
+
+
+def test_skips_corrupt_copies(build_eics):
+    __, bites = build_eics(1)
+    corrupt = CorruptStore()
+    good = MemoryStore()
+    euid = corrupt.upload(bites)
+    good.upload(bites)
+
+    hedge = core.HedgePolicy(delay=1)
+    start = time.monotonic()
+    assert core.StorageProvider.poll_euid(euid, [corrupt, good], hedge) \
+        == bites
+    # Misses move on straight away, instead of waiting out the delay
+    assert time.monotonic() - start < 1
+
+
+def test_missing_everywhere(build_eics):
+    __, bites = build_eics(1)
+    corrupt = CorruptStore()
+    euid = corrupt.upload(bites)
+    with pytest.raises(RuntimeError):
+        core.StorageProvider.poll_euid(euid, [corrupt, MemoryStore()], 
+                                       core.HedgePolicy(delay=.01))
+
+
+def test_hedged_fetch(build_eics, build_chain, stalled):
+    __, bites = build_eics(2)
+    eicd, frames = build_chain(3)
+    fast = MemoryStore()
+    for store in (stalled, fast):
+        store.upload(bites)
+        for frame in frames:
+            store.upload(frame)
+    euid = fast.upload(bites)
+
+    hedge = core.HedgePolicy(delay=.05)
+    start = time.monotonic()
+    eics = core.EICs.fetch(euid, SYM_KEY, [stalled, fast], hedge=hedge)
+    fetched = core.EICd.fetch(eicd.dynamic_ref, SYM_KEY, [stalled, fast], 
+                              hedge=hedge)
+    assert time.monotonic() - start < 2
+    assert eics[b'index'] == b'2'
+    assert fetched.content == b'frame2'
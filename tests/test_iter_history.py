@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+from eic import core
+from eic.stores import MemoryStore
+
+from conftest import SYM_KEY
+
+
+class CountingStore(MemoryStore):
+    def __init__(self):
+        super().__init__()
+        self.downloads = 0
+        self._count_lock = threading.Lock()
+
+    def download(self, euid):
+        with self._count_lock:
+            self.downloads += 1
+        return super().download(euid)
+
+
+class LyingStore(MemoryStore):
+    def list_frames(self, dynamic_ref):
+        frames = super().list_frames(dynamic_ref)
+        return frames[1:2] + frames[0:1] + frames[2:]
+
+
+def _stored(store, build_chain, count=8):
+    eicd, frames = build_chain(count, buffer_req=count)
+    for frame in frames:
+        store.upload(frame)
+    return eicd, [frame[520:584] for frame in reversed(frames)]
+
+
+def test_newest_first(build_chain):
+    store = MemoryStore()
+    eicd, euids = _stored(store, build_chain)
+    history = list(core.EICd.iter_history(eicd.dynamic_ref, SYM_KEY, 
+                                          [store], prefetch=3))
+    assert [frame['euid'] for frame in history] == euids
+    assert [frame['content'] for frame in history] == \
+        [b'frame%d' % ii for ii in reversed(range(8))]
+
+
+def test_from_a_frame(build_chain):
+    store = MemoryStore()
+    eicd, euids = _stored(store, build_chain)
+    history = list(core.EICd.iter_history(euids[3], SYM_KEY, [store]))
+    assert [frame['euid'] for frame in history] == euids[3:]
+
+
+def test_stopping_early_bounds_downloads(build_chain):
+    store = CountingStore()
+    eicd, __ = _stored(store, build_chain, count=10)
+    history = core.EICd.iter_history(eicd.dynamic_ref, SYM_KEY, [store], 
+                                     prefetch=2)
+    next(history)
+    history.close()
+    assert store.downloads <= 3
+
+
+def test_broken_chain(build_chain):
+    store = LyingStore()
+    eicd, __ = _stored(store, build_chain)
+    with pytest.raises(RuntimeError):
+        list(core.EICd.iter_history(eicd.dynamic_ref, SYM_KEY, [store]))
+
+
+def test_needs_prefetch(build_chain):
+    store = MemoryStore()
+    eicd, __ = _stored(store, build_chain)
+    with pytest.raises(ValueError):
+        list(core.EICd.iter_history(eicd.dynamic_ref, SYM_KEY, [store], 
+                                    prefetch=0))
@@ -0,0 +1,68 @@
+from eic import core
+from eic.stores import MemoryStore
+
+from conftest import SYM_KEY
+
+
+def _pushed(values):
+    store = MemoryStore()
+    eics = core.EICs(core.AUTHOR_BOOTSTRAP, d=values)
+    euid = eics.push(SYM_KEY, core._AUTHOR_BOOTSTRAP_PRIVKEY, [store])
+    return store, euid
+
+
+def test_matches_eager_fetch():
+    values = {b'key%d' % ii: bytes([ii]) * (100 * ii) for ii in range(1, 8)}
+    store, euid = _pushed(values)
+    eager = core.EICs.fetch(euid, SYM_KEY, [store])
+    lazy = core.EICs.fetch(euid, SYM_KEY, [store], lazy=True)
+    assert sorted(lazy) == sorted(eager) == sorted(values)
+    for key, value in values.items():
+        assert lazy[key] == eager[key] == value
+
+
+def test_only_decrypts_what_is_read(monkeypatch):
+    values = {b'key%d' % ii: bytes([ii]) * 1000 for ii in range(1, 6)}
+    store, euid = _pushed(values)
+    lazy = core.EICs.fetch(euid, SYM_KEY, [store], lazy=True)
+
+    unlocked = []
+    unlock = core.EICs._unlock_range
+
+    def counting_unlock(cls, payload, sym_key, start, stop):
+        unlocked.append(stop - start)
+        return unlock(payload, sym_key, start, stop)
+    monkeypatch.setattr(core.EICs, '_unlock_range', 
+                        classmethod(counting_unlock))
+
+    assert lazy[b'key3'] == values[b'key3']
+    assert lazy[b'key3'] == values[b'key3']
+    assert unlocked == [1000]
+
+
+def test_lets_go_of_payload_once_loaded():
+    values = {b'a': b'1' * 100, b'b': b'2' * 100}
+    store, euid = _pushed(values)
+    lazy = core.EICs.fetch(euid, SYM_KEY, [store], lazy=True)
+    contents = lazy._split_values.maps[0]
+    assert isinstance(contents, core._LazyContents)
+
+    lazy[b'a']
+    assert contents._payload is not None
+    lazy[b'b']
+    assert contents._payload is None
+    assert contents._sym_key is None
+    assert dict(lazy) == values
+
+
+def test_replacing_unread_values():
+    values = {b'a': b'1' * 100, b'b': b'2' * 100}
+    store, euid = _pushed(values)
+    contents = core.EICs.fetch(euid, SYM_KEY, [store], 
+                               lazy=True)._split_values.maps[0]
+    address = next(iter(contents._toc))
+    contents[address] = b'replaced'
+    del contents[next(iter(contents._toc))]
+    assert len(contents) == 1
+    assert contents[address] == b'replaced'
+    assert contents._payload is None
@@ -0,0 +1,70 @@
+import base64
+import os
+
+import pytest
+
+from eic import core
+from eic import erasure
+from eic.stores import MemoryStore
+
+from conftest import SYM_KEY
+
+
+def _dumped(directory, build_eics, build_chain):
+    store = MemoryStore()
+    for ii in range(10):
+        store.upload(build_eics(ii)[1])
+    erasure.distribute_coded(build_eics(10)[1], [store], 2, 3)
+    eicd, frames = build_chain(3, buffer_req=3)
+    for frame in frames:
+        store.upload(frame)
+    store.write_to_disk(directory)
+    # Older frames hang around on disk after they're evicted.
+    for ii in range(3):
+        eicd.content = b'later%d' % ii
+        eicd.commit(SYM_KEY, core._AUTHOR_BOOTSTRAP_PRIVKEY)
+        store.upload(eicd.history[eicd._index]['built'])
+    store.write_to_disk(directory)
+    return store, eicd
+
+
+def test_round_trip(tmp_path, build_eics, build_chain):
+    directory = str(tmp_path)
+    store, eicd = _dumped(directory, build_eics, build_chain)
+    assert len(os.listdir(directory)) == len(store.store) + 3
+
+    loaded = MemoryStore.read_from_disk(directory, workers=4)
+    assert loaded.store == store.store
+    assert loaded.list_frames(eicd.dynamic_ref) == \
+        store.list_frames(eicd.dynamic_ref)
+    assert core.EICd.fetch(eicd.dynamic_ref, SYM_KEY, [loaded]).content == \
+        b'later2'
+
+
+def test_rejects_corrupt_files(tmp_path, build_eics):
+    directory = str(tmp_path)
+    store = MemoryStore()
+    store.upload(build_eics(1)[1])
+    store.write_to_disk(directory)
+    path = os.path.join(directory, os.listdir(directory)[0])
+    with open(path, 'rb') as infile:
+        corrupt = bytearray(infile.read())
+    corrupt[-1] ^= 1
+    with open(path, 'wb') as outfile:
+        outfile.write(corrupt)
+    with pytest.raises(RuntimeError):
+        MemoryStore.read_from_disk(directory)
+
+
+def test_rejects_broken_chains(tmp_path, build_chain):
+    directory = str(tmp_path)
+    store = MemoryStore()
+    __, frames = build_chain(3)
+    for frame in frames:
+        store.upload(frame)
+    store.write_to_disk(directory)
+    middle = frames[1][520:584]
+    os.remove(os.path.join(
+        directory, base64.urlsafe_b64encode(middle).decode() + '.eicd'))
+    with pytest.raises(RuntimeError):
+        MemoryStore.read_from_disk(directory)
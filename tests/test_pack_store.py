@@ -0,0 +1,214 @@
+import os
+import threading
+
+import pytest
+
+from eic import core
+from eic.stores import PackStore
+
+from conftest import SYM_KEY
+
+
+@pytest.fixture
+def directory(tmp_path):
+    return str(tmp_path)
+
+
+def _segments(directory):
+    return sorted(fname for fname in os.listdir(directory) 
+                  if fname.endswith('.pack'))
+
+
+def test_survives_reopening(directory, build_eics):
+    store = PackStore(directory, segment_size=4000)
+    blobs = [build_eics(ii)[1] for ii in range(12)]
+    euids = [store.upload(bites) for bites in blobs]
+    assert len(_segments(directory)) > 2
+    store.close()
+
+    store = PackStore(directory, segment_size=4000)
+    assert [store.download(euid) for euid in euids] == blobs
+    assert sorted(store.iter_euids()) == sorted(euids)
+    assert store.download_range(euids[3], 520, 64) == euids[3]
+    store.close()
+
+
+def test_reopening_only_scans_active_segment(directory, build_eics, 
+                                             monkeypatch):
+    store = PackStore(directory, segment_size=4000)
+    for ii in range(12):
+        store.upload(build_eics(ii)[1])
+    store.close()
+
+    scanned = []
+    scan = PackStore._scan_segment
+
+    def counting_scan(self, segment):
+        scanned.append(segment)
+        return scan(self, segment)
+    monkeypatch.setattr(PackStore, '_scan_segment', counting_scan)
+    store = PackStore(directory, segment_size=4000)
+    assert scanned == [store._active]
+    store.close()
+
+
+def test_truncates_torn_writes(directory, build_eics):
+    store = PackStore(directory, segment_size=2 ** 20)
+    euids = [store.upload(build_eics(ii)[1]) for ii in range(3)]
+    store.close()
+    with open(os.path.join(directory, _segments(directory)[-1]), 'ab') \
+            as segfile:
+        segfile.write(PackStore._length.pack(5000) + b'torn')
+
+    store = PackStore(directory, segment_size=2 ** 20)
+    assert all(store.download(euid) for euid in euids)
+    __, bites = build_eics(4)
+    euid = store.upload(bites)
+    store.close()
+    assert PackStore(directory).download(euid) == bites
+
+
+def test_frames_survive_reopening(directory, build_chain):
+    store = PackStore(directory, segment_size=2000)
+    eicd, frames = build_chain(8, buffer_req=3)
+    for frame in frames:
+        store.upload(frame)
+    expected = store.list_frames(eicd.dynamic_ref)
+    store.close()
+
+    store = PackStore(directory, segment_size=2000)
+    assert store.list_frames(eicd.dynamic_ref) == expected
+    assert sorted(store.iter_euids()) == sorted(expected)
+    assert core.EICd.fetch(eicd.dynamic_ref, SYM_KEY, [store]).content == \
+        b'frame7'
+    eicd.content = b'more'
+    eicd.commit(SYM_KEY, core._AUTHOR_BOOTSTRAP_PRIVKEY)
+    store.upload(eicd.history[eicd._index]['built'])
+    assert store.list_frames(eicd.dynamic_ref)[1:] == expected[:2]
+    store.close()
+
+
+def test_compaction_drops_evicted_frames(directory, build_eics, build_chain):
+    store = PackStore(directory, segment_size=2000)
+    eicd, frames = build_chain(10, buffer_req=2)
+    for frame in frames:
+        store.upload(frame)
+    euids = [store.upload(build_eics(ii)[1]) for ii in range(5)]
+    before = sum(store.dead_bytes().values())
+    assert before
+
+    store.compact(0)
+    dead = store.dead_bytes()
+    assert sum(dead.values()) < before
+    assert not any(dead[segment] for segment in store._sealed)
+    assert all(store.download(euid) for euid in euids)
+    live = store.list_frames(eicd.dynamic_ref)
+    store.close()
+
+    store = PackStore(directory, segment_size=2000)
+    assert store.list_frames(eicd.dynamic_ref) == live
+    assert all(store.download(euid) for euid in euids)
+    store.close()
+
+
+def test_background_compaction(directory, build_chain):
+    store = PackStore(directory, segment_size=2000)
+    eicd, frames = build_chain(10, buffer_req=2)
+    for frame in frames:
+        store.upload(frame)
+    store.compact(0, background=True).join()
+    assert core.EICd.fetch(eicd.dynamic_ref, SYM_KEY, [store]).content == \
+        b'frame9'
+    store.close()
+
+
+def test_deletions_survive_reopening(directory, build_eics):
+    store = PackStore(directory, segment_size=4000)
+    euids = [store.upload(build_eics(ii)[1]) for ii in range(8)]
+    store.delete(euids[1])
+    store.delete(euids[6])
+    store.close()
+
+    store = PackStore(directory, segment_size=4000)
+    assert not store.ping(euids[1])
+    assert store.download(euids[6]) is None
+    assert sorted(store.iter_euids()) == sorted(
+        euid for ii, euid in enumerate(euids) if ii not in (1, 6))
+    store.close()
+
+
+def test_reuploading_after_deletion(directory, build_eics):
+    store = PackStore(directory, segment_size=4000)
+    __, bites = build_eics(1)
+    euid = store.upload(bites)
+    store.delete(euid)
+    assert store.upload(bites) == euid
+    store.close()
+
+    store = PackStore(directory, segment_size=4000)
+    assert store.download(euid) == bites
+    store.close()
+
+
+def test_tombstones_survive_compaction(directory, build_eics):
+    store = PackStore(directory, segment_size=2000)
+    euids = [store.upload(build_eics(ii)[1]) for ii in range(8)]
+    for euid in euids[:3]:
+        store.delete(euid)
+    graveyard = store._active
+    # Pad out the tombstones' segment so that it gets sealed too.
+    euids.extend(store.upload(build_eics(ii)[1]) for ii in range(8, 12))
+    # The deleted records are still in older segments, so compacting the
+    # tombstones on their own has to carry them forward.
+    store._compact_segment(graveyard)
+    assert sum(len(tombstones) for tombstones 
+               in store._tombstones.values()) == 3
+    store.close()
+
+    store = PackStore(directory, segment_size=2000)
+    assert not any(store.ping(euid) for euid in euids[:3])
+    assert all(store.download(euid) for euid in euids[3:])
+    store.compact(0)
+    store.close()
+
+    store = PackStore(directory, segment_size=2000)
+    assert not any(store.ping(euid) for euid in euids[:3])
+    assert all(store.download(euid) for euid in euids[3:])
+    store.close()
+
+
+def test_reads_continue_while_compacting(directory, build_chain, build_eics,
+                                         monkeypatch):
+    store = PackStore(directory, segment_size=2000)
+    eicd, frames = build_chain(10, buffer_req=2)
+    for frame in frames:
+        store.upload(frame)
+    euids = [store.upload(build_eics(ii)[1]) for ii in range(5)]
+
+    # Stall the compaction thread on its first copy.
+    copying = threading.Event()
+    resume = threading.Event()
+    stalls = []
+    pread = os.pread
+
+    def stalling_pread(fd, length, offset):
+        if threading.current_thread() is worker and not stalls:
+            copying.set()
+            # False if reading blocked on the compaction until it timed out
+            stalls.append(resume.wait(5))
+        return pread(fd, length, offset)
+    monkeypatch.setattr(os, 'pread', stalling_pread)
+    worker = threading.Thread(target=store.compact, args=(0,))
+    worker.start()
+    try:
+        assert copying.wait(10)
+        assert all(store.download(euid) for euid in euids)
+        store.upload(build_eics(6)[1])
+    finally:
+        resume.set()
+        worker.join()
+    assert stalls == [True]
+
+    assert not any(store.dead_bytes()[segment] for segment in store._sealed)
+    assert all(store.download(euid) for euid in euids)
+    store.close()
@@ -0,0 +1,127 @@
+import time
+
+import pytest
+
+from eic import core
+from eic.stores import MemoryStore
+
+
+class SlowStore(MemoryStore):
+    def download(self, euid):
+        time.sleep(.02)
+        return super().download(euid)
+
+
+class FlakyStore(MemoryStore):
+    ''' Fails every call while down.
+    '''
+    down = False
+
+    def download(self, euid):
+        if self.down:
+            raise IOError('Down.')
+        return super().download(euid)
+
+    def head(self, dynamic_ref):
+        raise NotImplementedError()
+
+
+def _metered(selector, store):
+    for provider in selector.every():
+        if provider.storage_provider is store:
+            return provider
+
+
+def test_ranks_faster_provider_first(build_eics):
+    __, bites = build_eics(1)
+    slow = SlowStore()
+    fast = MemoryStore()
+    euid = slow.upload(bites)
+    fast.upload(bites)
+    selector = core.ProviderSelector([slow, fast], decay=.5)
+    for __ in range(4):
+        for provider in selector.every():
+            provider.download(euid)
+    assert selector.ranked()[0].storage_provider is fast
+    assert core.StorageProvider.poll_euid(euid, selector) == bites
+    # The original order is kept for writes
+    assert [p.storage_provider for p in selector.every()] == [slow, fast]
+
+
+def test_ranks_misses_last(build_eics):
+    __, bites = build_eics(1)
+    empty = MemoryStore()
+    full = MemoryStore()
+    euid = full.upload(bites)
+    selector = core.ProviderSelector([empty, full], decay=1)
+    for __ in range(3):
+        core.StorageProvider.poll_euid(euid, selector)
+    assert selector.ranked()[0].storage_provider is full
+
+
+def test_circuit_breaker(build_eics):
+    __, bites = build_eics(1)
+    flaky = FlakyStore()
+    good = MemoryStore()
+    euid = flaky.upload(bites)
+    good.upload(bites)
+    selector = core.ProviderSelector([flaky, good], failure_threshold=2, 
+                                     cooldown=.1)
+    metered = _metered(selector, flaky)
+    flaky.down = True
+    for __ in range(2):
+        with pytest.raises(IOError):
+            metered.download(euid)
+    assert selector.stats()[0]['circuit'] == 'open'
+    assert [p.storage_provider for p in selector] == [good]
+
+    time.sleep(.15)
+    assert selector.stats()[0]['circuit'] == 'half-open'
+    # Only one trial call at a time
+    metered._begin()
+    assert flaky not in [p.storage_provider for p in selector]
+
+    flaky.down = False
+    assert metered.download(euid) == bites
+    assert selector.stats()[0]['circuit'] == 'closed'
+    assert selector.stats()[0]['consecutive_failures'] == 0
+
+
+def test_every_provider_is_broken():
+    selector = core.ProviderSelector([FlakyStore()], failure_threshold=1)
+    metered = selector.every()[0]
+    metered.storage_provider.down = True
+    with pytest.raises(IOError):
+        metered.download(bytes(64))
+    # Better to try a broken provider than none at all
+    assert selector.ranked() == [metered]
+
+
+def test_writes_reach_broken_providers(build_eics):
+    flaky = FlakyStore()
+    good = MemoryStore()
+    selector = core.ProviderSelector([flaky, good], failure_threshold=1, 
+                                     cooldown=60)
+    flaky.down = True
+    with pytest.raises(IOError):
+        _metered(selector, flaky).download(bytes(64))
+    assert selector.stats()[0]['circuit'] == 'open'
+
+    __, bites = build_eics(2)
+    core.StorageProvider.distribute(bites, selector)
+    assert flaky.ping(good.upload(bites)) == b's'
+
+
+def test_unsupported_methods_arent_failures():
+    selector = core.ProviderSelector([FlakyStore()], failure_threshold=1)
+    metered = selector.every()[0]
+    with pytest.raises(NotImplementedError):
+        metered.head(bytes(64))
+    stats = selector.stats()[0]
+    assert stats['calls'] == 0
+    assert stats['circuit'] == 'closed'
+
+
+def test_rejects_bad_decay():
+    with pytest.raises(ValueError):
+        core.ProviderSelector([], decay=0)
@@ -0,0 +1,50 @@
+import pytest
+
+from eic import core
+from eic.stores import MemoryStore
+
+from conftest import SYM_KEY
+
+
+def test_eics_push_many():
+    stores = [MemoryStore(), MemoryStore()]
+    objs = [core.EICs(core.AUTHOR_BOOTSTRAP, d={b'index': str(ii).encode()})
+            for ii in range(6)]
+    euids = core.EICs.push_many(objs, [SYM_KEY] * 6, 
+                                core._AUTHOR_BOOTSTRAP_PRIVKEY, stores, 
+                                workers=3)
+    assert euids == [obj.euid for obj in objs]
+    for ii, euid in enumerate(euids):
+        for store in stores:
+            assert store.ping(euid) == b's'
+        fetched = core.EICs.fetch(euid, SYM_KEY, stores)
+        assert fetched[b'index'] == str(ii).encode()
+
+
+def test_eicd_push_many():
+    store = MemoryStore()
+    eicds = [core.EICd(core.AUTHOR_BOOTSTRAP, 3) for __ in range(4)]
+    for round_ in range(2):
+        for ii, eicd in enumerate(eicds):
+            eicd.content = b'%d-%d' % (ii, round_)
+        euids = core.EICd.push_many(eicds, [SYM_KEY] * 4, 
+                                    core._AUTHOR_BOOTSTRAP_PRIVKEY, [store])
+        for eicd, euid in zip(eicds, euids):
+            assert store.head(eicd.dynamic_ref) == euid
+    for eicd in eicds:
+        assert len(store.list_frames(eicd.dynamic_ref)) == 2
+
+
+def test_push_many_rejects_mismatched_keys():
+    objs = [core.EICs(core.AUTHOR_BOOTSTRAP) for __ in range(2)]
+    with pytest.raises(ValueError):
+        core.EICs.push_many(objs, [SYM_KEY], None, [])
+
+
+def test_push_many_rejects_duplicates():
+    obj = core.EICs(core.AUTHOR_BOOTSTRAP)
+    with pytest.raises(ValueError):
+        core.EICs.push_many([obj, obj], [SYM_KEY] * 2, None, [])
+    eicd = core.EICd(core.AUTHOR_BOOTSTRAP, 3)
+    with pytest.raises(ValueError):
+        core.EICd.push_many([eicd, eicd], [SYM_KEY] * 2, None, [])
@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+from eic import core
+from eic.stores import FileStore
+from eic.stores import MemoryStore
+from eic.stores import PackStore
+from eic.stores import SQLiteStore
+
+
+class PlainStore(core.StorageProvider):
+    ''' Only implements what it has to, so gets the default ranges.
+    '''
+    def __init__(self):
+        self.store = {}
+
+    def ping(self, address):
+        return b's' if address in self.store else False
+
+    def upload(self, bites):
+        euid = bytes(bites[520:584])
+        self.store[euid] = bites
+        return euid
+
+    def download(self, euid):
+        return self.store.get(euid)
+
+    def list_frames(self, dynamic_ref):
+        raise RuntimeError('No frames here.')
+
+
+@pytest.fixture(params=['plain', 'memory', 'file', 'pack', 'sqlite'])
+def store(request, tmp_path):
+    directory = str(tmp_path)
+    if request.param == 'plain':
+        yield PlainStore()
+    elif request.param == 'memory':
+        yield MemoryStore()
+    elif request.param == 'file':
+        yield FileStore(directory, mmap_threshold=0)
+    elif request.param == 'pack':
+        store = PackStore(directory)
+        yield store
+        store.close()
+    else:
+        store = SQLiteStore(os.path.join(directory, 'store.db'))
+        yield store
+        store.close()
+
+
+def test_ranges(store, build_eics):
+    __, bites = build_eics(5)
+    euid = store.upload(bites)
+    assert bytes(store.download_range(euid, 520, 64)) == euid
+    # Ranges past the end are cut short
+    assert bytes(store.download_range(euid, len(bites) - 10, 100)) == \
+        bites[-10:]
+    assert store.download_range(bytes(64), 0, 10) is None
+
+    results = store.download_ranges([(euid, 0, 4), (bytes(64), 0, 4), 
+                                     (euid, 520, 64)])
+    assert bytes(results[0]) == bites[0:4]
+    assert results[1] is None
+    assert bytes(results[2]) == euid
+
+
+def test_poll_ranges_falls_back(build_eics):
+    first = MemoryStore()
+    second = MemoryStore()
+    blobs = [build_eics(ii)[1] for ii in range(2)]
+    euids = [first.upload(blobs[0]), second.upload(blobs[1])]
+    assert bytes(core.StorageProvider.poll_range(euids[1], 0, 4, 
+                                                 [first, second])) == \
+        blobs[1][0:4]
+    results = core.StorageProvider.poll_ranges(
+        [(euid, 520, 64) for euid in euids], [first, second])
+    assert [bytes(result) for result in results] == euids
+    with pytest.raises(RuntimeError):
+        core.StorageProvider.poll_ranges([(bytes(64), 0, 4)], [first])
+
+
+def test_poll_empty_ranges(build_eics):
+    store = MemoryStore()
+    __, bites = build_eics(1)
+    euid = store.upload(bites)
+    # Past the end, and zero-length, are found but empty.
+    assert bytes(core.StorageProvider.poll_range(euid, len(bites), 4, 
+                                                 [store])) == b''
+    results = core.StorageProvider.poll_ranges(
+        [(euid, len(bites) + 10, 4), (euid, 0, 0)], [store])
+    assert [bytes(result) for result in results] == [b'', b'']
@@ -0,0 +1,84 @@
+import pytest
+
+from eic import core
+from eic.stores import MemoryStore
+
+from conftest import SYM_KEY
+
+
+class CountingStore(MemoryStore):
+    def __init__(self):
+        super().__init__()
+        self.downloads = 0
+
+    def download(self, euid):
+        self.downloads += 1
+        return super().download(euid)
+
+
+def _commit(eicd, store, contents):
+    for content in contents:
+        eicd.content = content
+        eicd.commit(SYM_KEY, core._AUTHOR_BOOTSTRAP_PRIVKEY)
+        store.upload(eicd.history[eicd._index]['built'])
+
+
+def test_list_frames_since(build_chain):
+    store = MemoryStore()
+    eicd, frames = build_chain(4)
+    for frame in frames:
+        store.upload(frame)
+    euids = store.list_frames(eicd.dynamic_ref)
+    assert store.head(eicd.dynamic_ref) == euids[0]
+    assert store.list_frames_since(eicd.dynamic_ref, euids[2]) == euids[:2]
+    assert store.list_frames_since(eicd.dynamic_ref, euids[0]) == []
+    assert store.list_frames_since(eicd.dynamic_ref, bytes(64)) == euids
+    assert store.list_frames_since(bytes(64), euids[0]) is None
+    assert store.head(bytes(64)) is None
+
+    assert core.StorageProvider.poll_head(
+        eicd.dynamic_ref, [MemoryStore(), store]) == euids[0]
+    assert core.StorageProvider.poll_frames_since(
+        eicd.dynamic_ref, euids[1], [MemoryStore(), store]) == euids[:1]
+    with pytest.raises(RuntimeError):
+        core.StorageProvider.poll_head(eicd.dynamic_ref, [MemoryStore()])
+
+
+def test_refresh_downloads_only_new_frames(build_chain):
+    store = CountingStore()
+    writer, frames = build_chain(2, buffer_req=4)
+    for frame in frames:
+        store.upload(frame)
+    reader = core.EICd.fetch(writer.dynamic_ref, SYM_KEY, [store])
+
+    downloads = store.downloads
+    assert reader.refresh(SYM_KEY, [store]) == []
+    assert store.downloads == downloads
+
+    _commit(writer, store, [b'new0', b'new1'])
+    new = reader.refresh(SYM_KEY, [store])
+    assert new == store.list_frames(writer.dynamic_ref)[:2]
+    assert store.downloads == downloads + 2
+    assert reader.content == b'new1'
+    assert reader.euid == new[0]
+
+
+def test_refresh_across_a_gap(build_chain):
+    store = MemoryStore()
+    writer, frames = build_chain(2, buffer_req=2)
+    for frame in frames:
+        store.upload(frame)
+    reader = core.EICd.fetch(writer.dynamic_ref, SYM_KEY, [store])
+
+    # Our head falls out of the buffer
+    _commit(writer, store, [b'new0', b'new1', b'new2'])
+    assert reader.refresh(SYM_KEY, [store]) == \
+        store.list_frames(writer.dynamic_ref)
+    assert reader.content == b'new2'
+    assert [frame['content'] for frame in reader.history] == \
+        [b'new1', b'new2']
+
+
+def test_refresh_needs_a_commit():
+    with pytest.raises(RuntimeError):
+        core.EICd(core.AUTHOR_BOOTSTRAP, 2).refresh(SYM_KEY, [])
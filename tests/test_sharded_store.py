@@ -0,0 +1,136 @@
+import pytest
+
+from eic import core
+from eic import erasure
+from eic.stores import MemoryStore
+from eic.stores import ShardedStore
+
+from conftest import SYM_KEY
+
+
+def _providers(count):
+    return {'store{}'.format(ii): MemoryStore() for ii in range(count)}
+
+
+def _holders(providers, euid):
+    return sorted(name for name, store in providers.items()
+                  if store.ping(euid))
+
+
+def test_places_on_replicas(build_eics):
+    providers = _providers(4)
+    store = ShardedStore(providers, replicas=2)
+    blobs = [build_eics(ii)[1] for ii in range(20)]
+    euids = store.upload_many(blobs)
+    for euid in euids:
+        assert _holders(providers, euid) == sorted(store.owners(euid))
+    assert store.download_many(euids) == dict(zip(euids, blobs))
+    # Everyone got something
+    assert all(list(provider.iter_euids()) for provider in providers.values())
+
+
+def test_frames_live_with_their_reference(build_chain):
+    providers = _providers(4)
+    store = ShardedStore(providers, replicas=2)
+    eicd, frames = build_chain(6, buffer_req=3)
+    store.upload_frames(frames)
+    owners = sorted(store.owners(eicd.dynamic_ref))
+    listed = store.list_frames(eicd.dynamic_ref)
+    assert len(listed) == 3
+    for euid in listed:
+        assert _holders(providers, euid) == owners
+    assert store.head(eicd.dynamic_ref) == listed[0]
+    assert core.EICd.fetch(eicd.dynamic_ref, SYM_KEY, [store]).content == \
+        b'frame5'
+
+
+def test_fallback(build_eics):
+    providers = _providers(3)
+    __, bites = build_eics(1)
+    euid = bites[520:584]
+    stray = next(name for name in providers
+                 if name not in ShardedStore(providers).owners(euid))
+    providers[stray].upload(bites)
+
+    assert ShardedStore(providers).download(euid) == bites
+    assert ShardedStore(providers, fallback=False).download(euid) is None
+
+
+def test_rejects_no_replicas():
+    with pytest.raises(ValueError):
+        ShardedStore(_providers(2), replicas=0)
+
+
+def test_adding_and_removing_providers(build_eics, build_chain):
+    providers = _providers(3)
+    store = ShardedStore(providers, replicas=2)
+    euids = store.upload_many([build_eics(ii)[1] for ii in range(20)])
+    eicd, frames = build_chain(4, buffer_req=3)
+    store.upload_frames(frames)
+
+    providers['store3'] = MemoryStore()
+    assert store.add_provider('store3', providers['store3'])['failed'] == []
+    assert list(providers['store3'].iter_euids())
+    for euid in euids:
+        assert _holders(providers, euid) == sorted(store.owners(euid))
+    with pytest.raises(ValueError):
+        store.add_provider('store3', MemoryStore())
+
+    assert store.remove_provider('store0')['failed'] == []
+    del providers['store0']
+    for euid in euids:
+        assert _holders(providers, euid) == sorted(store.owners(euid))
+    for euid in store.list_frames(eicd.dynamic_ref):
+        assert _holders(providers, euid) == sorted(
+            store.owners(eicd.dynamic_ref))
+
+    # The chain carries on from its new home
+    eicd.content = b'moved'
+    eicd.commit(SYM_KEY, core._AUTHOR_BOOTSTRAP_PRIVKEY)
+    store.upload(eicd.history[eicd._index]['built'])
+    assert core.EICd.fetch(eicd.dynamic_ref, SYM_KEY, [store]).content == \
+        b'moved'
+
+
+def test_rebalance_on_reopening(build_eics):
+    providers = _providers(3)
+    store = ShardedStore(providers, replicas=1)
+    euids = store.upload_many([build_eics(ii)[1] for ii in range(20)])
+
+    previous = dict(providers)
+    providers['store3'] = MemoryStore()
+    store = ShardedStore(providers, replicas=1, fallback=False)
+    result = store.rebalance(previous)
+    assert result['failed'] == []
+    assert result['moved'] == len(list(providers['store3'].iter_euids()))
+    assert result['moved']
+    for euid in euids:
+        assert _holders(providers, euid) == store.owners(euid)
+    assert all(store.download_many(euids).values())
+
+
+def test_iterates_once(build_eics, build_chain):
+    providers = _providers(4)
+    store = ShardedStore(providers, replicas=3)
+    euids = store.upload_many([build_eics(ii)[1] for ii in range(10)])
+    eicd, frames = build_chain(2)
+    store.upload_frames(frames)
+
+    listed = list(store.iter_euids())
+    assert len(listed) == len(set(listed))
+    assert set(listed) == set(euids) | set(store.list_frames(
+        eicd.dynamic_ref))
+    assert list(store.iter_references()) == [eicd.dynamic_ref]
+
+
+def test_coded_round_trip(build_eics):
+    providers = _providers(4)
+    store = ShardedStore(providers, replicas=2)
+    __, bites = build_eics(20)
+    euid = erasure.distribute_coded(bites, [store], 2, 4)
+    for index in range(4):
+        address = erasure.shard_address(euid, index)
+        assert _holders(providers, address) == sorted(store.owners(address))
+    assert erasure.poll_euid_coded(euid, [store], 4) == bites
+    addresses = [erasure.shard_address(euid, index) for index in range(4)]
+    assert all(store.download_many(addresses).values())
@@ -0,0 +1,87 @@
+import os
+import threading
+
+import pytest
+
+from eic import core
+from eic.stores import SQLiteStore
+
+from conftest import SYM_KEY
+
+
+@pytest.fixture
+def path(tmp_path):
+    return os.path.join(str(tmp_path), 'store.db')
+
+
+def test_survives_reopening(path, build_eics, build_chain):
+    store = SQLiteStore(path)
+    blobs = [build_eics(ii)[1] for ii in range(5)]
+    euids = store.upload_many(blobs)
+    eicd, frames = build_chain(6, buffer_req=3)
+    for frame in frames:
+        store.upload(frame)
+    store.close()
+
+    store = SQLiteStore(path)
+    assert [store.download(euid) for euid in euids] == blobs
+    assert store.list_frames(eicd.dynamic_ref) == \
+        [frame[520:584] for frame in reversed(frames[3:])]
+    assert store.head(eicd.dynamic_ref) == frames[-1][520:584]
+    # Evicted frames are gone
+    assert store.ping(frames[0][520:584]) is False
+    assert list(store.iter_references()) == [eicd.dynamic_ref]
+    assert core.EICd.fetch(eicd.dynamic_ref, SYM_KEY, [store]).content == \
+        b'frame5'
+    store.close()
+
+
+def test_list_frames_since(path, build_chain):
+    store = SQLiteStore(path)
+    eicd, frames = build_chain(5, buffer_req=4)
+    for frame in frames:
+        store.upload(frame)
+    euids = [frame[520:584] for frame in reversed(frames)]
+    assert store.list_frames_since(eicd.dynamic_ref, euids[2]) == euids[:2]
+    assert store.list_frames_since(eicd.dynamic_ref, euids[0]) == []
+    # An evicted (or unknown) head gets everything
+    assert store.list_frames_since(eicd.dynamic_ref, euids[4]) == euids[:4]
+    assert store.list_frames_since(bytes(64), euids[0]) is None
+    store.close()
+
+
+def test_batch_rolls_back(path, build_eics):
+    store = SQLiteStore(path)
+    __, bites = build_eics(1)
+    with pytest.raises(ZeroDivisionError):
+        with store.batch():
+            euid = store.upload(bites)
+            # Visible from within the batch
+            assert store.download(euid) == bites
+            1 / 0
+    assert store.download(euid) is None
+    store.close()
+
+
+def test_iter_euids_by_prefix(path, build_eics):
+    store = SQLiteStore(path)
+    euids = store.upload_many([build_eics(ii)[1] for ii in range(20)])
+    for prefix in (b'', euids[0][:1], b'\xff', euids[0][:2] + b'\xff'):
+        assert sorted(store.iter_euids(prefix)) == sorted(
+            euid for euid in euids if euid.startswith(prefix))
+    store.close()
+
+
+def test_readers_from_dead_threads_are_closed(path, build_eics):
+    store = SQLiteStore(path)
+    euid = store.upload(build_eics(1)[1])
+    for __ in range(3):
+        worker = threading.Thread(target=store.download, args=(euid,))
+        worker.start()
+        worker.join()
+    # Each new reader closes those of the threads that have died, so only
+    # the last worker's lingers.
+    assert [thread for thread, __ in store._readers 
+            if not thread.is_alive()] == [worker]
+    store.close()
+    assert not store._readers
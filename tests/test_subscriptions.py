@@ -0,0 +1,79 @@
+import asyncio
+import queue
+
+from eic import core
+from eic.stores import AsyncMemoryStore
+from eic.stores import MemoryStore
+
+
+REF_A = b'a' * 64
+REF_B = b'b' * 64
+
+
+def test_coalesces_per_reference():
+    subscription = core.Subscription()
+    subscription.publish(REF_A, b'1')
+    subscription.publish(REF_B, b'2')
+    subscription.publish(REF_A, b'3')
+    assert subscription.drain() == [(REF_A, b'3'), (REF_B, b'2')]
+    assert subscription.get(timeout=.01) is None
+
+
+def test_drops_stale_events():
+    subscription = core.Subscription()
+    subscription.publish(REF_A, b'2', seq=2)
+    subscription.publish(REF_A, b'1', seq=1)
+    assert subscription.get(timeout=.01) == (REF_A, b'2')
+    subscription.publish(REF_A, b'1', seq=1)
+    assert subscription.get(timeout=.01) is None
+
+
+def test_filters_references():
+    subscription = core.Subscription([REF_A])
+    assert subscription.wants(REF_A)
+    assert not subscription.wants(REF_B)
+
+
+def test_store_publishes_frames(build_chain):
+    store = MemoryStore()
+    eicd, frames = build_chain(3)
+    other, others = build_chain(1, tag=b'other')
+    with store.subscribe([eicd.dynamic_ref]) as subscription:
+        for frame in frames + others:
+            store.upload(frame)
+        assert subscription.drain() == \
+            [(eicd.dynamic_ref, frames[-1][520:584])]
+    # Closed subscriptions are forgotten
+    assert not store._subscriptions
+
+
+def test_callbacks(build_chain):
+    store = MemoryStore()
+    events = queue.Queue()
+    eicd, frames = build_chain(1)
+    subscription = store.subscribe(
+        callback=lambda *event: events.put(event))
+    store.upload(frames[0])
+    assert events.get(timeout=5) == (eicd.dynamic_ref, frames[0][520:584])
+    subscription.close()
+    assert subscription.get() is None
+
+
+def test_async_iteration(build_chain):
+    store = AsyncMemoryStore()
+    eicd, frames = build_chain(2)
+
+    async def run():
+        subscription = store.subscribe()
+        await store.upload(frames[0])
+        events = []
+        async for event in subscription:
+            events.append(event)
+            if len(events) == 1:
+                await store.upload(frames[1])
+            else:
+                subscription.close()
+        return events
+
+    assert asyncio.run(run()) == [(eicd.dynamic_ref, frame[520:584]) 
+                                  for frame in frames]
@@ -0,0 +1,128 @@
+import copy
+import os
+
+import pytest
+
+from eic import core
+from eic import erasure
+from eic.core import StorageProvider
+from eic.stores import FileStore
+from eic.stores import MemoryStore
+from eic.stores import SQLiteStore
+from eic.stores import sync
+
+from conftest import SYM_KEY
+
+
+@pytest.fixture(params=['memory', 'sqlite', 'file'])
+def other_store(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryStore()
+    elif request.param == 'sqlite':
+        return SQLiteStore(str(tmp_path / 'eic.db'))
+    return FileStore(str(tmp_path))
+
+
+def _commit(eicd, content):
+    eicd.content = content
+    eicd.commit(SYM_KEY, core._AUTHOR_BOOTSTRAP_PRIVKEY)
+    return eicd.history[eicd._index]['built']
+
+
+def test_converges(build_eics, build_chain, other_store):
+    store_a = MemoryStore()
+    store_b = other_store
+    blobs = [build_eics(ii, size=10)[1] for ii in range(60)]
+    store_a.upload_many(blobs[:40])
+    store_b.upload_many(blobs[20:])
+
+    # One chain each side doesn't know, and one that's ahead on each side
+    only_a, frames = build_chain(3, tag=b'only a')
+    store_a.upload_frames(frames)
+    only_b, frames = build_chain(2, tag=b'only b')
+    store_b.upload_frames(frames)
+    ahead_a, frames = build_chain(4, tag=b'ahead a')
+    store_a.upload_frames(frames)
+    store_b.upload_frames(frames[:2])
+    ahead_b, frames = build_chain(3, tag=b'ahead b')
+    store_a.upload_frames(frames[:1])
+    store_b.upload_frames(frames)
+
+    # No threshold, so that differing buckets get walked all the way down
+    result = sync(store_a, store_b, threshold=0)
+    assert result['conflicts'] == []
+    assert result['failed'] == []
+    assert result['a_to_b'] == 20 + 3 + 2
+    assert result['b_to_a'] == 20 + 2 + 2
+
+    assert set(store_a.iter_euids()) == set(store_b.iter_euids())
+    assert store_a.list_heads() == store_b.list_heads()
+    for eicd in (only_a, only_b, ahead_a, ahead_b):
+        assert store_b.list_frames(eicd.dynamic_ref) == \
+            store_a.list_frames(eicd.dynamic_ref)
+
+    assert sync(store_a, store_b, threshold=0) == {
+        'a_to_b': 0, 'b_to_a': 0, 'conflicts': [], 'failed': []}
+
+
+def test_copies_shards(build_eics):
+    store_a = MemoryStore()
+    store_b = MemoryStore()
+    __, bites = build_eics(3)
+    shards = erasure.encode(bites, bites[520:584], 2, 4)
+    store_a.upload_many(shards[:3])
+    store_b.upload_many(shards[2:])
+
+    result = sync(store_a, store_b)
+    assert (result['a_to_b'], result['b_to_a']) == (2, 1)
+    assert set(store_a.iter_euids()) == set(store_b.iter_euids())
+    assert len(set(store_b.iter_euids())) == 4
+
+
+def test_reports_forks(build_chain):
+    store_a = MemoryStore()
+    store_b = MemoryStore()
+    eicd, frames = build_chain(2)
+    store_a.upload_frames(frames)
+    store_b.upload_frames(frames)
+    fork = copy.deepcopy(eicd)
+    store_a.upload(_commit(eicd, b'left'))
+    store_b.upload(_commit(fork, b'right'))
+
+    result = sync(store_a, store_b)
+    assert result['conflicts'] == [eicd.dynamic_ref]
+    assert (result['a_to_b'], result['b_to_a']) == (0, 0)
+    # Neither side gets overwritten
+    assert store_a.head(eicd.dynamic_ref) != store_b.head(eicd.dynamic_ref)
+
+
+def test_reports_evicted_heads(build_chain):
+    store_a = MemoryStore()
+    store_b = MemoryStore()
+    eicd, frames = build_chain(6, buffer_req=3)
+    store_a.upload_frames(frames)
+    store_b.upload_frames(frames[:2])
+
+    result = sync(store_a, store_b)
+    assert result['conflicts'] == [eicd.dynamic_ref]
+    assert store_b.head(eicd.dynamic_ref) == frames[1][520:584]
+
+
+def _with_xor_zero():
+    keys = [b'\x07' + os.urandom(63) for __ in range(3)]
+    return keys + [bytes(a ^ b ^ c for a, b, c in zip(*keys))]
+
+
+def test_summaries_tell_apart_sets_with_equal_xors():
+    # Same bucket, same count and the same XOR, but different sets
+    first = _with_xor_zero()
+    second = _with_xor_zero()
+    assert len(set(first + second)) == 8
+    summaries = [StorageProvider._summary(((key, key) for key in keys), b'') 
+                 for keys in (first, second)]
+    assert summaries[0][7][0] == summaries[1][7][0] == 4
+    assert summaries[0][7] != summaries[1][7]
+    # Order doesn't matter, and empty buckets agree
+    assert StorageProvider._summary(((key, key) for key in reversed(first)),
+                                    b'') == summaries[0]
+    assert summaries[0][8] == summaries[1][8] == (0, bytes(64))
@@ -0,0 +1,107 @@
+import os
+
+import pytest
+
+from eic import core
+from eic.stores import MemoryStore
+
+
+AUTHOR = b'a' * 64
+EUID = b'e' * 64
+
+
+class FakeKey():
+    ''' Just enough of a public key to be fingerprinted.
+    '''
+    def __init__(self, der):
+        self.der = der
+
+    def public_bytes(self, encoding, format):
+        return self.der
+
+
+@pytest.fixture
+def path(tmp_path):
+    return os.path.join(str(tmp_path), 'ledger')
+
+
+@pytest.fixture
+def key():
+    return core.VerificationLedger.generate_key()
+
+
+@pytest.fixture
+def ledger(path, key):
+    ledger = core.VerificationLedger(path, key)
+    yield ledger
+    ledger.close()
+
+
+def test_survives_reopening(ledger, path, key):
+    ledger.record(EUID, AUTHOR, FakeKey(b'1'), b'signed', b'signature')
+    assert ledger.check(EUID, AUTHOR, b'signed', b'signature')
+    assert not ledger.check(EUID, AUTHOR, b'signed', b'forged')
+    ledger.close()
+
+    reopened = core.VerificationLedger(path, key)
+    assert reopened.check(EUID, AUTHOR, b'signed', b'signature')
+    assert not reopened.check(EUID, b'b' * 64, b'signed', b'signature')
+    reopened.close()
+
+
+def test_ignores_records_under_another_key(ledger, path):
+    ledger.record(EUID, AUTHOR, FakeKey(b'1'), b'signed', b'signature')
+    ledger.close()
+    other = core.VerificationLedger(path, 
+                                    core.VerificationLedger.generate_key())
+    assert not other.check(EUID, AUTHOR, b'signed', b'signature')
+    other.close()
+
+
+def test_new_author_key_revokes(ledger, path, key):
+    ledger.record(EUID, AUTHOR, FakeKey(b'1'), b'signed', b'signature')
+    ledger.observe_key(AUTHOR, FakeKey(b'2'))
+    assert not ledger.check(EUID, AUTHOR, b'signed', b'signature')
+    ledger.close()
+
+    reopened = core.VerificationLedger(path, key)
+    assert not reopened.check(EUID, AUTHOR, b'signed', b'signature')
+    reopened.close()
+
+
+def test_ignores_tampering(ledger, path, key):
+    ledger.record(EUID, AUTHOR, FakeKey(b'1'), b'signed', b'signature')
+    ledger.close()
+    with open(path, 'rb') as infile:
+        data = bytearray(infile.read())
+    # Flip a bit in the verification record's digest, and tear the end
+    data[-40] ^= 1
+    with open(path, 'wb') as outfile:
+        outfile.write(bytes(data) + b'v' + bytes(10))
+
+    reopened = core.VerificationLedger(path, key)
+    assert not reopened.check(EUID, AUTHOR, b'signed', b'signature')
+    reopened.close()
+    assert os.path.getsize(path) == len(data)
+
+
+def test_rejects_bad_key(path):
+    with pytest.raises(ValueError):
+        core.VerificationLedger(path, b'c2hvcnQ=')
+
+
+def test_skips_verified_signatures(ledger, build_chain, monkeypatch):
+    __, frames = build_chain(3)
+    monkeypatch.setattr(core.AUTHOR_KEY_CACHE, 'ledger', ledger)
+    store = MemoryStore()
+    for frame in frames:
+        store.upload(frame)
+
+    def verify_signature(bites, pubkey, signature):
+        raise RuntimeError('Should have been in the ledger.')
+    monkeypatch.setattr(core.EICBase, 'verify_signature', 
+                        staticmethod(verify_signature))
+    store = MemoryStore()
+    for frame in frames:
+        store.upload(frame)
+    assert len(store.list_frames(frames[0][584:648])) == 3
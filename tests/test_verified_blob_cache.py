@@ -0,0 +1,71 @@
+import gc
+
+import pytest
+
+from eic import core
+
+
+def test_hits_only_for_the_same_buffer(build_eics):
+    cache = core.VerifiedBlobCache()
+    __, bites = build_eics(1)
+    unloaded = cache.verify(core.EICs, bites)
+    assert cache.verify(core.EICs, bites) == unloaded
+    # An equal copy is a different buffer, so it's verified from scratch
+    assert cache.verify(core.EICs, bytes(bytearray(bites))) == unloaded
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (1, 2)
+
+
+def test_checks_euid_on_hits(build_eics):
+    cache = core.VerifiedBlobCache()
+    __, bites = build_eics(1)
+    cache.verify(core.EICs, bites)
+    with pytest.raises(RuntimeError):
+        cache.verify(core.EICs, bites, euid=bytes(64))
+
+
+def test_never_records_mutable_buffers(build_eics):
+    cache = core.VerifiedBlobCache()
+    __, bites = build_eics(1)
+    cache.verify(core.EICs, bytearray(bites))
+    assert cache.stats()['size'] == 0
+
+
+def test_corrupt_buffers_fail(build_eics):
+    cache = core.VerifiedBlobCache()
+    __, bites = build_eics(1)
+    corrupt = bytearray(bites)
+    corrupt[-1] ^= 1
+    with pytest.raises(RuntimeError):
+        cache.verify(core.EICs, bytes(corrupt))
+
+
+def test_only_weakly_holds_views(build_eics):
+    cache = core.VerifiedBlobCache()
+    __, bites = build_eics(1)
+    view = memoryview(bites).toreadonly()
+    cache.verify(core.EICs, view)
+    assert cache.stats()['bytes'] == 0
+    assert cache.verify(core.EICs, view)['euid'] == bites[520:584]
+    assert cache.stats()['hits'] == 1
+    entry = cache._entries[bites[520:584]]
+    del view
+    gc.collect()
+    assert cache._held(entry) is None
+
+
+def test_bounded(build_eics):
+    blobs = [build_eics(ii)[1] for ii in range(4)]
+    cache = core.VerifiedBlobCache(maxsize=3, maxbytes=len(blobs[2]) + 
+                                   len(blobs[3]))
+    for bites in blobs:
+        cache.verify(core.EICs, bites)
+    stats = cache.stats()
+    assert stats['size'] == 2
+    assert stats['bytes'] <= stats['maxbytes']
+    cache.invalidate(blobs[3][520:584])
+    assert cache.stats()['bytes'] == len(blobs[2])
+    cache.invalidate()
+    assert cache.stats()['size'] == cache.stats()['bytes'] == 0
+    with pytest.raises(ValueError):
+        core.VerifiedBlobCache(maxsize=0)
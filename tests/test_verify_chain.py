@@ -0,0 +1,96 @@
+from collections import deque
+
+import pytest
+
+from eic import core
+from eic.stores import MemoryStore
+
+from conftest import SYM_KEY
+
+
+class CountingStore(MemoryStore):
+    def __init__(self):
+        super().__init__()
+        self.downloads = 0
+
+    def download(self, euid):
+        self.downloads += 1
+        return super().download(euid)
+
+    def download_many(self, euids):
+        self.downloads += 1
+        return super().download_many(euids)
+
+
+class LyingStore(MemoryStore):
+    ''' Lists frames in the wrong order.
+    '''
+    def list_frames(self, dynamic_ref):
+        frames = super().list_frames(dynamic_ref)
+        return frames[1:2] + frames[0:1] + frames[2:]
+
+
+def _stored(store, build_chain, count=5, tag=b'frame'):
+    eicd, frames = build_chain(count, buffer_req=count, tag=tag)
+    for frame in frames:
+        store.upload(frame)
+    return eicd, [frame[520:584] for frame in reversed(frames)]
+
+
+def test_header_only(build_chain):
+    store = CountingStore()
+    eicd, euids = _stored(store, build_chain)
+    headers = core.EICd.verify_chain(eicd.dynamic_ref, [store])
+    assert [partial['euid'] for partial in headers] == euids
+    assert all(partial['header_hash'] == eicd.dynamic_ref 
+               for partial in headers)
+    assert not any('content' in partial for partial in headers)
+    assert store.downloads == 0
+    assert core.EICd.peek_header(euids[0], [store])['previous_hash'] == \
+        euids[1]
+
+
+def test_decrypts_requested_frames(build_chain):
+    store = MemoryStore()
+    eicd, euids = _stored(store, build_chain)
+    headers = core.EICd.verify_chain(eicd.dynamic_ref, [store], SYM_KEY, 
+                                     frames=[euids[0]])
+    assert headers[0]['content']
+    assert 'content' not in headers[1]
+    with pytest.raises(ValueError):
+        core.EICd.verify_chain(eicd.dynamic_ref, [store], frames=[euids[0]])
+    with pytest.raises(ValueError):
+        core.EICd.verify_chain(eicd.dynamic_ref, [store], SYM_KEY, 
+                               frames=[bytes(64)])
+
+
+def test_broken_chain(build_chain):
+    store = LyingStore()
+    eicd, __ = _stored(store, build_chain)
+    with pytest.raises(RuntimeError, match='Broken'):
+        core.EICd.verify_chain(eicd.dynamic_ref, [store])
+
+
+def test_wrong_reference(build_chain):
+    store = MemoryStore()
+    eicd, euids = _stored(store, build_chain)
+    other, others = _stored(store, build_chain, tag=b'other')
+    assert other.dynamic_ref != eicd.dynamic_ref
+    # Swap in a frame from another reference
+    store._dynamic_bookie[eicd.dynamic_ref] = deque(others[:1])
+    with pytest.raises(RuntimeError, match='belong'):
+        core.EICd.verify_chain(eicd.dynamic_ref, [store])
+
+
+def test_check_hashes(build_chain):
+    store = MemoryStore()
+    eicd, euids = _stored(store, build_chain)
+    assert len(core.EICd.verify_chain(eicd.dynamic_ref, [store], 
+                                      check_hashes=True)) == 5
+    corrupt = bytearray(store.store[euids[2]])
+    corrupt[-1] ^= 1
+    store.store[euids[2]] = bytes(corrupt)
+    # The header is untouched, so only checking the hashes catches it
+    core.EICd.verify_chain(eicd.dynamic_ref, [store])
+    with pytest.raises(RuntimeError):
+        core.EICd.verify_chain(eicd.dynamic_ref, [store], check_hashes=True)
@@ -0,0 +1,46 @@
+from eic import core
+from eic.stores import MemoryStore
+
+from conftest import SYM_KEY
+
+
+def _fetched(build_eics, count):
+    store = MemoryStore()
+    euids = [store.upload(build_eics(ii)[1]) for ii in range(count)]
+    return [core.EICs.fetch(euid, SYM_KEY, [store]) for euid in euids]
+
+
+def test_verifies_in_order(build_eics):
+    objects = _fetched(build_eics, 5)
+    assert core.EICBase.verify_many(objects, [], workers=2) == [True] * 5
+
+
+def test_reports_failures_without_stopping(build_eics, monkeypatch):
+    objects = _fetched(build_eics, 4)
+    bad = objects[1]._signed_bytes()
+
+    def verify_signature(bites, pubkey, signature):
+        if bites == bad:
+            raise RuntimeError('Bad signature.')
+        return True
+    monkeypatch.setattr(core.EICBase, 'verify_signature', 
+                        staticmethod(verify_signature))
+
+    results = core.EICBase.verify_many(objects + [object()], [])
+    assert results[0] is True
+    assert isinstance(results[1], RuntimeError)
+    assert results[2:4] == [True, True]
+    # Things that aren't EIC objects at all fail on their own
+    assert isinstance(results[4], AttributeError)
+
+
+def test_resolves_each_author_once(build_eics):
+    objects = _fetched(build_eics, 3)
+    core.AUTHOR_KEY_CACHE.invalidate()
+    misses = core.AUTHOR_KEY_CACHE.stats()['misses']
+    core.EICBase.verify_many(objects, [])
+    assert core.AUTHOR_KEY_CACHE.stats()['misses'] == misses + 1
+
+
+def test_empty():
+    assert core.EICBase.verify_many([], []) == []
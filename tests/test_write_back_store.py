@@ -0,0 +1,153 @@
+import os
+
+import pytest
+
+from eic import core
+from eic.stores import MemoryStore
+from eic.stores import WriteBackStore
+
+from conftest import SYM_KEY
+
+
+class FlakyStore(MemoryStore):
+    ''' Rejects every batch while down.
+    '''
+    down = False
+
+    def upload_many(self, blobs):
+        if self.down:
+            raise IOError('Down.')
+        return super().upload_many(blobs)
+
+
+@pytest.fixture
+def upstream():
+    return FlakyStore()
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return os.path.join(str(tmp_path), 'journal')
+
+
+def _commit(eicd, contents):
+    built = []
+    for content in contents:
+        eicd.content = content
+        eicd.commit(SYM_KEY, core._AUTHOR_BOOTSTRAP_PRIVKEY)
+        built.append(eicd.history[eicd._index]['built'])
+    return built
+
+
+def test_flushes_in_order(upstream, build_eics, build_chain):
+    store = WriteBackStore([upstream], batch_size=2)
+    euids = [store.upload(build_eics(ii)[1]) for ii in range(3)]
+    eicd, frames = build_chain(5, buffer_req=3)
+    for frame in frames:
+        store.upload(frame)
+    assert store.flush(5)
+    assert store.queue_depth == 0
+    assert store.stats()['flushed'] == 8
+    assert all(upstream.ping(euid) == b's' for euid in euids)
+    assert upstream.list_frames(eicd.dynamic_ref) == \
+        [frame[520:584] for frame in reversed(frames[2:])]
+    # Nothing is kept locally once it's upstream
+    assert not store.local.store
+    assert store.local._frames(eicd.dynamic_ref) is None
+    assert store.download(euids[0]) == upstream.download(euids[0])
+    store.close()
+
+
+def test_continues_chains_after_flushing(upstream, build_chain):
+    store = WriteBackStore([upstream])
+    eicd, frames = build_chain(2, buffer_req=3)
+    for frame in frames:
+        store.upload(frame)
+    assert store.flush(5)
+    # Re-uploading a flushed frame is harmless
+    store.upload(frames[1])
+    for frame in _commit(eicd, [b'more', b'again']):
+        store.upload(frame)
+    assert store.flush(5)
+    assert core.EICd.fetch(eicd.dynamic_ref, SYM_KEY, 
+                           [upstream]).content == b'again'
+    assert len(upstream.list_frames(eicd.dynamic_ref)) == 3
+    store.close()
+
+
+def test_picks_up_existing_chains(upstream, build_chain):
+    eicd, frames = build_chain(2)
+    for frame in frames:
+        upstream.upload(frame)
+    store = WriteBackStore([upstream])
+    frame, = _commit(eicd, [b'more'])
+    store.upload(frame)
+    assert store.list_frames(eicd.dynamic_ref)[1:] == \
+        upstream.list_frames(eicd.dynamic_ref)
+    assert store.flush(5)
+    assert upstream.head(eicd.dynamic_ref) == frame[520:584]
+    store.close()
+
+
+def test_holds_uploads_while_upstream_is_down(upstream, build_eics):
+    upstream.down = True
+    store = WriteBackStore([upstream], max_backoff=.05)
+    __, bites = build_eics(1)
+    euid = store.upload(bites)
+    assert not store.flush(.2)
+    stats = store.stats()
+    assert stats['queue_depth'] == 1
+    assert stats['failures']
+    assert isinstance(stats['last_error'], IOError)
+    assert store.flush_lag > 0
+    # Still readable in the meantime
+    assert store.download(euid) == bites
+    assert store.ping(euid) == b's'
+
+    upstream.down = False
+    assert store.flush(5)
+    assert upstream.download(euid) == bites
+    store.close()
+
+
+def test_replays_journal(upstream, journal, build_eics, build_chain):
+    upstream.down = True
+    store = WriteBackStore([upstream], journal=journal, max_backoff=.05)
+    euid = store.upload(build_eics(1)[1])
+    eicd, frames = build_chain(5, buffer_req=3)
+    for frame in frames:
+        store.upload(frame)
+    store.close(flush=False)
+
+    upstream.down = False
+    store = WriteBackStore([upstream], journal=journal)
+    assert store.flush(5)
+    assert upstream.ping(euid) == b's'
+    assert upstream.list_frames(eicd.dynamic_ref) == \
+        [frame[520:584] for frame in reversed(frames[2:])]
+    store.close()
+    # Everything's out, so the journal starts over
+    assert os.path.getsize(journal) == 0
+
+
+def test_skips_flushed_journal_entries(upstream, journal, build_eics):
+    store = WriteBackStore([upstream], journal=journal)
+    store.upload(build_eics(1)[1])
+    assert store.flush(5)
+    upstream.down = True
+    store.upload(build_eics(2)[1])
+    store.close(flush=False)
+    # And a torn write on the end
+    with open(journal, 'ab') as outfile:
+        outfile.write(b'u' + bytes(8))
+
+    store = WriteBackStore([upstream], journal=journal)
+    assert store.queue_depth == 1
+    store.close(flush=False)
+
+
+def test_rejects_uploads_once_closed(upstream, build_eics):
+    store = WriteBackStore([upstream])
+    store.close()
+    with pytest.raises(RuntimeError):
+        store.upload(build_eics(1)[1])